@@ -1,16 +1,44 @@
 
+import logging
+
 from fastapi import FastAPI , Depends
 
+from app.middlewares.compression_middleware import CompressionMiddleware
+from app.middlewares.timing_middleware import ServerTimingMiddleware
 from app.network.oauth import oauth2_scheme
-from app.routers import auth, client, product, order
+from app.routers import admin, analytics, auth, client, product, order
+from core.security import hashing_pool
+from utils.cache import compressed_cache
+from utils.config import Config
+
+logging.basicConfig(level=Config.log_level, format="%(message)s")
 
 app = FastAPI()
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=Config.compression_minimum_size,
+    gzip_level=Config.compression_gzip_level,
+    brotli_quality=Config.compression_brotli_quality,
+    encodings=Config.compression_encodings,
+    content_types=Config.compression_content_types,
+    cache=compressed_cache,
+)
+# adicionado por último = mais externo: o tempo total inclui a compressão
+if Config.server_timing:
+    app.add_middleware(ServerTimingMiddleware)
+
+@app.on_event("shutdown")
+def shutdown_hashing_pool():
+    hashing_pool.shutdown()
+
 app.include_router(auth.router)
 
 app.include_router(client.router, dependencies=[Depends(oauth2_scheme)])
 app.include_router(product.router, dependencies=[Depends(oauth2_scheme)])
 app.include_router(order.router, dependencies=[Depends(oauth2_scheme)])
+app.include_router(analytics.router, dependencies=[Depends(oauth2_scheme)])
+app.include_router(admin.router)
 
 
 @app.get("/ping")
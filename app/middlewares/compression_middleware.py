@@ -0,0 +1,191 @@
+import zlib
+from typing import Iterable, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.cache import TTLCache
+
+try:
+    import brotli
+except ImportError:  # sem o pacote Brotli a API só oferece gzip
+    brotli = None
+
+# status sem corpo (ou com corpo que não é a representação) nunca são comprimidos
+UNCOMPRESSED_STATUS = {204, 206, 304}
+
+
+class GzipEncoder:
+    def __init__(self, level: int):
+        # wbits=31: cabeçalho gzip com mtime zerado, então o mesmo corpo gera sempre os mesmos bytes
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def available_encodings() -> tuple:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str, encodings: Sequence[str]) -> Optional[str]:
+    """Escolhe, entre `encodings` (em ordem de preferência), a de maior q no Accept-Encoding; q=0 recusa."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """Comprime as respostas com gzip ou brotli conforme o Accept-Encoding.
+
+    Só entram respostas com content-type em `content_types` e corpo de pelo menos `minimum_size` bytes;
+    respostas em streaming (exportação) são comprimidas por bloco. Corpos com ETag forte são comprimidos
+    uma vez e reaproveitados do `cache`, com chave (caminho, query string, ETag, codificação).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        encodings: Iterable[str] = ("br", "gzip"),
+        content_types: Iterable[str] = ("application/json",),
+        cache: Optional[TTLCache] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+        self.encodings = tuple(encoding for encoding in encodings if encoding in available_encodings())
+        self.content_types = frozenset(content_type.strip().lower() for content_type in content_types)
+        self.cache = cache
+
+    def encoder(self, encoding: str):
+        if encoding == "br":
+            return BrotliEncoder(self.levels["br"])
+        return GzipEncoder(self.levels["gzip"])
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        encoder = self.encoder(encoding)
+        return encoder.compress(body) + encoder.finish()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(self, encoding, (scope["path"], scope.get("query_string", b"")), send)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, request_key: tuple, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.request_key = request_key
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.encoder = None
+        self.passthrough = False
+
+    def eligible(self, headers: MutableHeaders, status: int) -> bool:
+        if status in UNCOMPRESSED_STATUS or "content-encoding" in headers:
+            return False
+        media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return media_type in self.middleware.content_types
+
+    def compressed_body(self, body: bytes, etag: Optional[str]) -> bytes:
+        cache = self.middleware.cache
+        # o ETag forte identifica exatamente estes bytes; um ETag fraco não garante isso
+        if cache is None or not etag or etag.startswith("W/"):
+            return self.middleware.compress(self.encoding, body)
+
+        key = (*self.request_key, etag, self.encoding)
+        payload = cache.get(key)
+        if payload is None:
+            payload = self.middleware.compress(self.encoding, body)
+            cache.set(key, payload)
+        return payload
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            if not self.eligible(headers, start["status"]) or (not more_body and len(body) < self.middleware.minimum_size):
+                self.passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+
+            etag = headers.get("etag")
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if etag and not etag.startswith("W/"):
+                # o corpo comprimido é outra representação: o ETag vira fraco, e o If-None-Match
+                # (comparação fraca) continua batendo com o ETag da resposta original
+                headers["ETag"] = f"W/{etag}"
+
+            if not more_body:
+                payload = self.compressed_body(body, etag)
+                headers["Content-Length"] = str(len(payload))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": payload})
+                return
+
+            del headers["Content-Length"]
+            self.encoder = self.middleware.encoder(self.encoding)
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": self.encoder.compress(body), "more_body": True})
+            return
+
+        data = self.encoder.compress(body) if body else b""
+        if not more_body:
+            data += self.encoder.finish()
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
@@ -0,0 +1,51 @@
+import json
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.request_metrics import collect_metrics
+
+logger = logging.getLogger("app.requests")
+
+
+class ServerTimingMiddleware:
+    """Mede cada requisição e devolve o resultado no cabeçalho `Server-Timing` e numa linha de log JSON.
+
+    O cabeçalho sai com o que aconteceu até o início da resposta; a linha de log, escrita no fim, também
+    inclui o que roda durante o streaming (exportação) e traz as consultas agrupadas por método de repositório.
+    """
+
+    def __init__(self, app: ASGIApp, log: bool = True):
+        self.app = app
+        self.log = log
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", metrics.server_timing(time.perf_counter() - start))
+            await send(message)
+
+        with collect_metrics() as metrics:
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                if self.log and logger.isEnabledFor(logging.INFO):
+                    logger.info(json.dumps({
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status,
+                        "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                        **metrics.as_dict(),
+                    }))
@@ -0,0 +1,13 @@
+from datetime import date
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class SalesRow(BaseModel):
+    day: Optional[date] = Field(None, example="2025-01-31", description="Preenchido em group_by=day")
+    id: Optional[int] = Field(None, example=3, description="Cliente, categoria ou seção nos demais agrupamentos")
+    name: Optional[str] = Field(None, example="Bebidas")
+    quantity: int = Field(..., example=120)
+    revenue: float = Field(..., example=2399.5)
+    lines: int = Field(..., example=87)
@@ -34,8 +34,23 @@ class OrderRead(BaseModel):
     status: str = Field(..., example="pending")
     created_at: datetime = Field(..., example="2024-01-01T12:00:00Z")
     updated_at: datetime = Field(..., example="2024-01-01T13:00:00Z")
+    total_amount: float = Field(..., example=139.96)
+    item_count: int = Field(..., example=4)
 
     client: ClientRead
     products: List[OrderProductRead]
 
     model_config = ConfigDict(from_attributes=True)
+
+class OrderBulkCreate(BaseModel):
+    orders: Annotated[List[OrderCreate], Field(min_length=1, max_length=5000)]
+
+class OrderBulkItemResult(BaseModel):
+    index: int = Field(..., example=0)
+    id: Optional[int] = Field(None, example=1)
+    error: Optional[str] = Field(None, example="Cliente 123 não encontrado")
+
+class OrderBulkResult(BaseModel):
+    created: int = Field(..., example=1)
+    failed: int = Field(..., example=1)
+    results: List[OrderBulkItemResult]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 from app.network.schemas.product_category import ProductCategoryRead
@@ -41,3 +41,13 @@ class ProductRead(BaseModel):
 
 class ProductUpdate(ProductCreate):
     pass
+
+class ProductImportError(BaseModel):
+    line: int = Field(..., example=12)
+    error: str = Field(..., example="Categoria ou Seção não encontrados")
+
+class ProductImportResult(BaseModel):
+    inserted: int = Field(..., example=950)
+    updated: int = Field(..., example=40)
+    failed: int = Field(..., example=10)
+    errors: List[ProductImportError]
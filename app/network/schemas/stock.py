@@ -0,0 +1,25 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class StockRead(BaseModel):
+    product_id: int = Field(..., example=10)
+    on_hand: int = Field(..., example=42)
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class StockMovementCreate(BaseModel):
+    kind: Literal["restock", "adjustment"] = Field(..., example="restock")
+    quantity: int = Field(..., example=50, description="Entrada positiva; ajustes podem ser negativos")
+    note: Optional[str] = Field(None, max_length=200, example="Nota fiscal 1234")
+
+    @model_validator(mode="after")
+    def validate_quantity(self):
+        if self.quantity == 0:
+            raise ValueError("quantity não pode ser zero")
+        if self.kind == "restock" and self.quantity < 0:
+            raise ValueError("reposição deve ter quantity positiva")
+        return self
+
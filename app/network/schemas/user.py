@@ -16,6 +16,16 @@ class Token(BaseModel):
     token_type: str = Field("bearer", example="bearer")
 
 
+class TokenClaims(BaseModel):
+    user_id: int
+    is_admin: bool = False
+    version: int = 0
+
+
+class UserAdminUpdate(BaseModel):
+    is_admin: bool = Field(..., example=False)
+
+
 class LoginSchema(BaseModel):
     email: EmailStr
     password: str
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.network.schemas.user import UserAdminUpdate, UserRead
+from core.dependecies import admin_required, get_repository
+from core.security import hashing_pool
+from repositories.user_repository import UserRepository, AsyncUserRepository
+from utils.cache import compressed_cache, product_cache
+from utils.database import pool_status, pool_metrics, async_pool_metrics, run_db
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(admin_required)])
+
+@router.get("/db/pool")
+async def get_pool_metrics():
+    return pool_status()
+
+@router.post("/db/pool/reset", status_code=204)
+async def reset_pool_metrics():
+    pool_metrics.reset()
+    async_pool_metrics.reset()
+
+@router.get("/cache/products")
+async def get_product_cache_stats():
+    return product_cache.stats()
+
+@router.delete("/cache/products", status_code=204)
+async def clear_product_cache():
+    product_cache.clear()
+
+@router.get("/cache/compression")
+async def get_compression_cache_stats():
+    return compressed_cache.stats()
+
+@router.get("/auth/hashing")
+async def get_hashing_pool_stats():
+    return hashing_pool.stats()
+
+@router.patch("/users/{id}", response_model=UserRead)
+async def update_user_admin(
+    id: int,
+    data: UserAdminUpdate,
+    repo = Depends(get_repository(UserRepository, AsyncUserRepository))
+):
+    user = await run_db(repo.set_admin, id, data.is_admin)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
@@ -0,0 +1,25 @@
+from datetime import date
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.network.schemas.analytics import SalesRow
+from core.dependecies import get_repository
+from repositories.analytics_repository import AnalyticsRepository, AsyncAnalyticsRepository
+from utils.database import run_db
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+get_analytics_repository = get_repository(AnalyticsRepository, AsyncAnalyticsRepository)
+
+@router.get("/sales", response_model=List[SalesRow])
+async def sales(
+    group_by: Literal["day", "category", "section", "client"] = "day",
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    repo = Depends(get_analytics_repository)
+):
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="'from' deve ser anterior a 'to'")
+    # só leitura: o que ainda está em sales_events entra no rollup na próxima rodada de scripts.rollup_sales
+    return await run_db(repo.sales, group_by, date_from, date_to)
@@ -1,38 +1,55 @@
 from fastapi import APIRouter, Depends, HTTPException 
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.network.schemas.user import  UserCreate, UserRead, Token
 from models.models import User
-from repositories.user_repository import UserRepository
-from core.security import hash_password, verify_password, create_access_token
-from utils.database import get_db
+from repositories.user_repository import UserRepository, AsyncUserRepository
+from core.dependecies import get_repository
+from core.security import hash_password_async, verify_and_update_password_async, create_access_token
+from utils.database import run_db
+from utils.hashing_pool import HashingPoolOverloaded
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+get_user_repository = get_repository(UserRepository, AsyncUserRepository)
+
+HASHING_RETRY_AFTER = "1"
+
+async def _hashing(call):
+    try:
+        return await call
+    except HashingPoolOverloaded:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many concurrent authentication requests",
+            headers={"Retry-After": HASHING_RETRY_AFTER},
+        )
+
 @router.post("/register", response_model=UserRead)
-def register(user_in: UserCreate, session: AsyncSession = Depends(get_db)):
-    repo = UserRepository(session)
-    existing =  repo.get_by_email(user_in.email)
+async def register(user_in: UserCreate, repo = Depends(get_user_repository)):
+    existing = await run_db(repo.get_by_email, user_in.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
     user = User(
         email=user_in.email,
-        hashed_password=hash_password(user_in.password),
+        hashed_password=await _hashing(hash_password_async(user_in.password)),
     )
-    repo.create(user)
+    await run_db(repo.create, user)
     return user
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_db)):
-    repo = UserRepository(session)
-    user = repo.get_by_email(form_data.username)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), repo = Depends(get_user_repository)):
+    user = await run_db(repo.get_by_email, form_data.username)
 
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
-    if not verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = await _hashing(verify_and_update_password_async(form_data.password, user.hashed_password))
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    token = create_access_token({"sub": str(user.id), "is_admin": user.is_admin})
+    if new_hash:
+        # hash com esquema/custo antigo: regrava com a configuração atual aproveitando a senha em mãos
+        await run_db(repo.update, user.id, {"hashed_password": new_hash})
+    token = create_access_token({"sub": str(user.id), "is_admin": user.is_admin, "ver": user.token_version or 0})
     return {"access_token": token, "token_type": "bearer"}
 
 
@@ -1,71 +1,113 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
 
 from app.middlewares.is_admin_middleware import user_access_admin_middleware
 from app.network.schemas.client import ClientRead, ClientCreate
-from utils.database import get_db
-from repositories.client_repository import ClientRepository
+from core.dependecies import get_repository
+from utils.database import run_db
+from utils.etag import ETAG_HEADER, collection_etag, etag_matches, make_etag, not_modified
+from utils.pagination import NEXT_CURSOR_HEADER, next_cursor
+from utils.fieldsets import resolve_fieldset
+from utils.serialization import JSONBytesResponse, dump_one, list_response
+from repositories.client_repository import LIST_ORDER, ClientRepository, AsyncClientRepository
 from models.models import Client
 
 router = APIRouter(prefix="/clients", tags=["client"])
 
-@router.get("/", response_model=List[ClientRead])
-def list_clients(
+get_client_repository = get_repository(ClientRepository, AsyncClientRepository)
+
+# ClientRead não tem relacionamentos, então só `fields` se aplica
+FIELDS_QUERY = Query(None, description="Campos do cliente, separados por vírgula (ex.: id,name)")
+
+@router.get("/", response_model=List[ClientRead], response_class=JSONBytesResponse)
+async def list_clients(
+    request: Request,
     name: Optional[str] = Query(None),
     email: Optional[str] = Query(None),
     skip: int = 0,
     limit: int = 10,
-    session: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    search: Optional[str] = Query(None, min_length=2, description="Busca por similaridade em nome e email, ordenada por relevância"),
+    fields: Optional[str] = FIELDS_QUERY,
+    if_none_match: Optional[str] = Header(None),
+    repo = Depends(get_client_repository)
 ):
-    repo = ClientRepository(session)
-    clients = repo.list(name=name, email=email, skip=skip, limit=limit)
-    return clients
+    try:
+        fieldset = resolve_fieldset(ClientRead, fields, None)
+        if search:
+            clients = await run_db(repo.search, search, skip=skip, limit=limit)
+        else:
+            clients = await run_db(repo.list, name=name, email=email, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    etag = collection_etag(request.url.query, ((client.id, client.updated_at) for client in clients))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    headers = {ETAG_HEADER: etag}
+    # a busca é ordenada por relevância, então não tem cursor
+    cursor_value = None if search else next_cursor(clients, LIST_ORDER, limit)
+    if cursor_value:
+        headers[NEXT_CURSOR_HEADER] = cursor_value
+    return list_response(fieldset.model, clients, headers)
 
 @router.post("/", response_model=ClientRead, status_code=201)
-def create_client(
+async def create_client(
     client_data: ClientCreate,
-    session: Session = Depends(get_db)
+    repo = Depends(get_client_repository)
 ):
-    repo = ClientRepository(session)
-
-    if repo.get_by_email(client_data.email):
+    if await run_db(repo.get_by_email, client_data.email):
         raise HTTPException(status_code=400, detail="Email já cadastrado")
-    if repo.get_by_cpf(client_data.cpf):
+    if await run_db(repo.get_by_cpf, client_data.cpf):
         raise HTTPException(status_code=400, detail="CPF já cadastrado")
 
     client_obj = Client(**client_data.dict())
-    new_client = repo.create(client_obj)
+    new_client = await run_db(repo.create, client_obj)
     return new_client
 
-@router.get("/{id}", response_model=ClientRead)
-def get_client(id: int, session: Session = Depends(get_db)):
-    repo = ClientRepository(session)
-    client = repo.get(id)
+@router.get("/{id}", response_model=ClientRead, response_class=JSONBytesResponse)
+async def get_client(
+    id: int,
+    fields: Optional[str] = FIELDS_QUERY,
+    if_none_match: Optional[str] = Header(None),
+    repo = Depends(get_client_repository)
+):
+    try:
+        fieldset = resolve_fieldset(ClientRead, fields, None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    version = await run_db(repo.get_version, id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Cliente não encontrado")
+    etag = make_etag(*version, fields)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    client = await run_db(repo.get, id)
     if not client:
         raise HTTPException(status_code=404, detail="Cliente não encontrado")
-    return client
+    return JSONBytesResponse(dump_one(fieldset.model, client), headers={ETAG_HEADER: etag})
 
 @router.put("/{id}", response_model=ClientRead)
-def update_client(
+async def update_client(
     id: int,
     client_data: ClientCreate,
-    session: Session = Depends(get_db)
+    repo = Depends(get_client_repository)
 ):
-    repo = ClientRepository(session)
-    existing = repo.get(id)
+    existing = await run_db(repo.get, id)
     if not existing:
         raise HTTPException(status_code=404, detail="Cliente não encontrado")
 
-    updated = repo.update(id, client_data)
+    updated = await run_db(repo.update, id, client_data.model_dump())
     return updated
 
 @router.delete("/{id}", status_code=204, dependencies=[Depends(user_access_admin_middleware)])
-def delete_client(id: int, session: Session = Depends(get_db)):
-    repo = ClientRepository(session)
-    existing = repo.get(id)
+async def delete_client(id: int, repo = Depends(get_client_repository)):
+    existing = await run_db(repo.get, id)
     if not existing:
         raise HTTPException(status_code=404, detail="Cliente não encontrado")
 
-    repo.delete(id)
+    await run_db(repo.delete, id)
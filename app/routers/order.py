@@ -1,63 +1,164 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
-from app.network.schemas.order import OrderCreate, OrderRead, OrderUpdate
-from repositories.order_repository import OrderRepository
-from utils.database import get_db 
+from app.network.schemas.order import OrderCreate, OrderRead, OrderUpdate, OrderBulkCreate, OrderBulkResult
+from core.dependecies import get_repository
+from repositories.loading import LoadProfile
+from repositories.order_repository import OrderRepository, AsyncOrderRepository, sort_order
+from utils.database import SessionLocal, run_db
+from utils.etag import ETAG_HEADER, collection_etag, etag_matches, make_etag, not_modified
+from utils.order_export import to_csv, to_ndjson
+from utils.pagination import NEXT_CURSOR_HEADER, next_cursor
+from utils.fieldsets import resolve_fieldset
+from utils.serialization import JSONBytesResponse, dump_one, list_response
 
 router = APIRouter(prefix="/orders", tags=["order"])
 
-@router.get("/", response_model=List[OrderRead])
-def list_orders(
+get_order_repository = get_repository(OrderRepository, AsyncOrderRepository)
+
+# OrderRead expõe o cliente e os itens com produto, categoria e seção
+READ_PROFILE = LoadProfile.WITH_LINES
+
+FIELDS_QUERY = Query(None, description="Campos do pedido, separados por vírgula (ex.: id,status,total_amount)")
+EXPAND_QUERY = Query(None, description="Relacionamentos incluídos (ex.: client,products.product); vazio não inclui nenhum")
+
+
+def _order_version(order, expand: frozenset) -> tuple:
+    # só entra no ETag o que está no corpo: cliente e produtos apenas quando expandidos
+    version = (order.id, order.updated_at)
+    if "client" in expand:
+        version += (order.client.updated_at,)
+    if "products.product" in expand:
+        version += tuple(line.product.updated_at for line in order.products)
+    if "products.product.category" in expand:
+        version += tuple(line.product.category.updated_at for line in order.products)
+    if "products.product.section" in expand:
+        version += tuple(line.product.section.updated_at for line in order.products)
+    return version
+
+
+@router.get("/", response_model=List[OrderRead], response_class=JSONBytesResponse)
+async def list_orders(
+    request: Request,
     category_name: Optional[str] = None,
     section_name: Optional[str] = None,
     price_min: Optional[float] = None,
     price_max: Optional[float] = None,
     available: Optional[bool] = None,
+    total_min: Optional[float] = None,
+    total_max: Optional[float] = None,
+    sort: Literal["created_at", "-created_at", "total_amount", "-total_amount"] = "created_at",
     skip: int = 0,
     limit: int = 10,
-    session: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    expand: Optional[str] = EXPAND_QUERY,
+    if_none_match: Optional[str] = Header(None),
+    repo = Depends(get_order_repository)
 ):
-    repo = OrderRepository(session)
-    products = repo.list(category_name, section_name, price_min, price_max, available, skip, limit)
-    return products
+    try:
+        fieldset = resolve_fieldset(OrderRead, fields, expand)
+        products = await run_db(
+            repo.list, category_name, section_name, price_min, price_max, available, skip, limit, cursor,
+            READ_PROFILE if fieldset.is_default else fieldset.expand, total_min, total_max, sort,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    etag = collection_etag(request.url.query, (_order_version(order, fieldset.expand) for order in products))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    headers = {ETAG_HEADER: etag}
+    order_by, descending = sort_order(sort)
+    cursor_value = next_cursor(products, order_by, limit, descending)
+    if cursor_value:
+        headers[NEXT_CURSOR_HEADER] = cursor_value
+    return list_response(fieldset.model, products, headers)
 
 @router.post("/", response_model=OrderRead, status_code=201)
-def create_order(
+async def create_order(
     product_data: OrderCreate,
-    session: Session = Depends(get_db)
+    repo = Depends(get_order_repository)
 ):
-    repo = OrderRepository(session)
     try:
-        new_product = repo.create(product_data)
+        new_product = await run_db(repo.create, product_data)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     return new_product
 
-@router.get("/{id}", response_model=OrderRead)
-def get_order(id: int, session: Session = Depends(get_db)):
-    repo = OrderRepository(session)
-    product = repo.get(id)
+@router.post("/bulk", response_model=OrderBulkResult)
+async def create_orders_bulk(
+    bulk_data: OrderBulkCreate,
+    repo = Depends(get_order_repository)
+):
+    results = await run_db(repo.create_bulk, bulk_data.orders)
+    created = sum(1 for result in results if result.get("id") is not None)
+    return {"created": created, "failed": len(results) - created, "results": results}
+
+@router.get("/export")
+async def export_orders(
+    format: Literal["csv", "ndjson"] = "csv",
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+):
+    # a sessão das dependências é fechada antes do corpo ser enviado, então o gerador abre a sua
+    def rows():
+        with SessionLocal() as session:
+            yield from OrderRepository(session).export_rows(date_from, date_to)
+
+    if format == "ndjson":
+        return StreamingResponse(to_ndjson(rows()), media_type="application/x-ndjson")
+    return StreamingResponse(
+        to_csv(rows()),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="orders.csv"'},
+    )
+
+@router.get("/{id}", response_model=OrderRead, response_class=JSONBytesResponse)
+async def get_order(
+    id: int,
+    fields: Optional[str] = FIELDS_QUERY,
+    expand: Optional[str] = EXPAND_QUERY,
+    if_none_match: Optional[str] = Header(None),
+    repo = Depends(get_order_repository)
+):
+    try:
+        fieldset = resolve_fieldset(OrderRead, fields, expand)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    version = await run_db(repo.get_version, id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Produto não encontrado")
+    etag = make_etag(*version, fields, expand)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    # a versão é lida antes do pedido: o corpo é igual ou mais novo que o ETag, nunca mais velho
+    product = await run_db(repo.get, id, READ_PROFILE if fieldset.is_default else fieldset.expand)
     if not product:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
-    return product
+    return JSONBytesResponse(dump_one(fieldset.model, product), headers={ETAG_HEADER: etag})
 
 @router.put("/{id}", response_model=OrderRead)
-def update_order(
+async def update_order(
     id: int,
     product_data: OrderUpdate,
-    session: Session = Depends(get_db)
+    repo = Depends(get_order_repository)
 ):
-    repo = OrderRepository(session)
-    updated_product = repo.update_order(id, product_data)
+    try:
+        updated_product = await run_db(repo.update_order, id, product_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated_product:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
     return updated_product
 
 @router.delete("/{id}", status_code=204)
-def delete_order(id: int, session: Session = Depends(get_db)):
-    repo = OrderRepository(session)
-    repo.delete(id)
+async def delete_order(id: int, repo = Depends(get_order_repository)):
+    await run_db(repo.delete, id)
 
@@ -1,17 +1,49 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, UploadFile, File
 from sqlalchemy.orm import Session
 
 
-from app.network.schemas.product import ProductCreate, ProductRead, ProductUpdate
-from utils.database import get_db 
-from repositories.product_repository import ProductRepository
+from app.middlewares.is_admin_middleware import user_access_admin_middleware
+from app.network.schemas.product import ProductCreate, ProductRead, ProductUpdate, ProductImportResult
+from app.network.schemas.stock import StockMovementCreate, StockRead
+from core.dependecies import get_repository
+from utils.cache import product_cache
+from utils.database import get_db, run_db
+from utils.etag import ETAG_HEADER, collection_etag, etag_matches, make_etag, not_modified
+from utils.product_import import import_products_csv
+from utils.pagination import NEXT_CURSOR_HEADER, next_cursor
+from utils.fieldsets import resolve_fieldset
+from utils.serialization import JSONBytesResponse, dump_one, list_response
+from repositories.loading import LoadProfile
+from repositories.inventory_repository import InventoryRepository, AsyncInventoryRepository
+from repositories.product_repository import LIST_ORDER, ProductRepository, AsyncProductRepository
 
 router = APIRouter(prefix="/products", tags=["product"])
 
-@router.get("/", response_model=List[ProductRead])
-def list_products(
+get_product_repository = get_repository(ProductRepository, AsyncProductRepository)
+get_inventory_repository = get_repository(InventoryRepository, AsyncInventoryRepository)
+
+# ProductRead expõe categoria e seção, mas não os outros produtos delas
+READ_PROFILE = LoadProfile.DETAIL
+
+FIELDS_QUERY = Query(None, description="Campos do produto, separados por vírgula (ex.: id,name,selling_price)")
+EXPAND_QUERY = Query(None, description="Relacionamentos incluídos (category, section); vazio não inclui nenhum")
+
+
+def _product_version(product, expand: frozenset) -> tuple:
+    # categoria e seção só entram no ETag quando vêm no corpo (e só então estão carregadas)
+    version = (product.id, product.updated_at)
+    if "category" in expand:
+        version += (product.category.updated_at,)
+    if "section" in expand:
+        version += (product.section.updated_at,)
+    return version
+
+
+@router.get("/", response_model=List[ProductRead], response_class=JSONBytesResponse)
+async def list_products(
+    request: Request,
     category_name: Optional[str] = None,
     section_name: Optional[str] = None,
     price_min: Optional[float] = None,
@@ -19,49 +51,145 @@ def list_products(
     available: Optional[bool] = None,
     skip: int = 0,
     limit: int = 10,
-    session: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    expand: Optional[str] = EXPAND_QUERY,
+    if_none_match: Optional[str] = Header(None),
+    repo = Depends(get_product_repository)
 ):
-    repo = ProductRepository(session)
-    products = repo.list(category_name, section_name, price_min, price_max, available, skip, limit)
-    return products
+    try:
+        fieldset = resolve_fieldset(ProductRead, fields, expand)
+        profile = READ_PROFILE if fieldset.is_default else fieldset.expand
+        products = await run_db(repo.list, category_name, section_name, price_min, price_max, available, skip, limit, cursor, profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    etag = collection_etag(request.url.query, (_product_version(product, fieldset.expand) for product in products))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    headers = {ETAG_HEADER: etag}
+    cursor_value = next_cursor(products, LIST_ORDER, limit)
+    if cursor_value:
+        headers[NEXT_CURSOR_HEADER] = cursor_value
+    return list_response(fieldset.model, products, headers)
 
 @router.post("/", response_model=ProductRead, status_code=201)
-def create_product(
+async def create_product(
     product_data: ProductCreate,
-    session: Session = Depends(get_db)
+    repo = Depends(get_product_repository)
 ):
-    repo = ProductRepository(session)
     try:
-        new_product = repo.create(product_data)
+        new_product = await run_db(repo.create, product_data)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
     return new_product
 
-@router.get("/{id}", response_model=ProductRead)
-def get_product(id: int, session: Session = Depends(get_db)):
-    repo = ProductRepository(session)
-    product = repo.get(id)
+@router.post("/import", response_model=ProductImportResult)
+async def import_products(
+    file: UploadFile = File(..., description="CSV com as colunas name, category, section, selling_price, initial_stock e opcionais"),
+    session: Session = Depends(get_db)
+):
+    # o COPY depende do psycopg2, então a importação sempre usa a sessão síncrona (no thread pool)
+    try:
+        return await run_db(import_products_csv, file.file, ProductRepository(session))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/search", response_model=List[ProductRead], response_class=JSONBytesResponse)
+async def search_products(
+    request: Request,
+    q: str = Query(..., min_length=2, description="Termos buscados no nome e na descrição do produto"),
+    skip: int = 0,
+    limit: int = 10,
+    fields: Optional[str] = FIELDS_QUERY,
+    expand: Optional[str] = EXPAND_QUERY,
+    if_none_match: Optional[str] = Header(None),
+    repo = Depends(get_product_repository)
+):
+    try:
+        fieldset = resolve_fieldset(ProductRead, fields, expand)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    products = await run_db(repo.search, q, skip=skip, limit=limit, profile=READ_PROFILE if fieldset.is_default else fieldset.expand)
+    etag = collection_etag(request.url.query, (_product_version(product, fieldset.expand) for product in products))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return list_response(fieldset.model, products, {ETAG_HEADER: etag})
+
+@router.get("/{id}", response_model=ProductRead, response_class=JSONBytesResponse)
+async def get_product(
+    id: int,
+    fields: Optional[str] = FIELDS_QUERY,
+    expand: Optional[str] = EXPAND_QUERY,
+    if_none_match: Optional[str] = Header(None),
+    repo = Depends(get_product_repository)
+):
+    try:
+        fieldset = resolve_fieldset(ProductRead, fields, expand)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # só a representação completa vai para o cache, junto com o seu ETag: um If-None-Match que bate não toca no banco
+    if fieldset.is_default:
+        cached = product_cache.get(id)
+        if cached is not None:
+            etag, payload = cached
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+            return JSONBytesResponse(payload, headers={ETAG_HEADER: etag})
+
+    token = product_cache.token()
+    version = await run_db(repo.get_version, id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Produto não encontrado")
+    etag = make_etag(*version, fields, expand)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    product = await run_db(repo.get, id, READ_PROFILE if fieldset.is_default else fieldset.expand)
     if not product:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
-    return product
 
+    payload = dump_one(fieldset.model, product)
+    if fieldset.is_default:
+        product_cache.set(id, (etag, payload), token)
+    return JSONBytesResponse(payload, headers={ETAG_HEADER: etag})
+
+@router.get("/{id}/stock", response_model=StockRead)
+async def get_product_stock(id: int, repo = Depends(get_inventory_repository)):
+    stock = await run_db(repo.get_stock, id)
+    if not stock:
+        raise HTTPException(status_code=404, detail="Produto não encontrado")
+    return stock
+
+@router.post("/{id}/stock/movements", response_model=StockRead, status_code=201, dependencies=[Depends(user_access_admin_middleware)])
+async def create_stock_movement(
+    id: int,
+    movement: StockMovementCreate,
+    repo = Depends(get_inventory_repository)
+):
+    if not await run_db(repo.get_stock, id):
+        raise HTTPException(status_code=404, detail="Produto não encontrado")
+    try:
+        return await run_db(repo.record, id, movement.kind, movement.quantity, movement.note)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.put("/{id}", response_model=ProductRead)
-def update_product(
+async def update_product(
     id: int,
     product_data: ProductUpdate,
-    session: Session = Depends(get_db)
+    repo = Depends(get_product_repository)
 ):
-    repo = ProductRepository(session)
-    updated_product = repo.update(id, product_data.model_dump())
+    updated_product = await run_db(repo.update, id, product_data.model_dump())
     if not updated_product:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
     return updated_product
 
 @router.delete("/{id}", status_code=204)
-def delete_product(id: int, session: Session = Depends(get_db)):
-    repo = ProductRepository(session)
-    repo.delete(id)
-
+async def delete_product(id: int, repo = Depends(get_product_repository)):
+    await run_db(repo.delete, id)
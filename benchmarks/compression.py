@@ -0,0 +1,60 @@
+"""Mede custo de CPU e bytes economizados por nível de compressão numa página de pedidos.
+
+Uso:
+    python -m benchmarks.compression [--orders 100] [--lines 10] [--rounds 20]
+
+O corpo é o mesmo que `GET /orders` devolve (via `benchmarks.list_serialization.sample_orders`) e cada
+nível passa pelo mesmo encoder do `CompressionMiddleware`. Brotli só entra se o pacote estiver instalado.
+Imprime JSON.
+"""
+import argparse
+import json
+import time
+
+from app.middlewares.compression_middleware import CompressionMiddleware, available_encodings
+from app.network.schemas.order import OrderRead
+from benchmarks.list_serialization import sample_orders
+from utils.serialization import dump_list
+
+LEVELS = {"gzip": [1, 3, 6, 9], "br": [1, 4, 6, 9, 11]}
+
+
+def measure(encoding: str, level: int, body: bytes, rounds: int) -> dict:
+    middleware = CompressionMiddleware(
+        app=None, encodings=(encoding,), gzip_level=level, brotli_quality=level,
+    )
+    payload = middleware.compress(encoding, body)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        middleware.compress(encoding, body)
+    elapsed = (time.perf_counter() - started) / rounds
+    saved = len(body) - len(payload)
+    return {
+        "encoding": encoding,
+        "level": level,
+        "bytes": len(payload),
+        "ratio": round(len(payload) / len(body), 4),
+        "ms_per_response": round(elapsed * 1000, 3),
+        "kb_saved_per_cpu_ms": round(saved / 1024 / (elapsed * 1000), 1),
+    }
+
+
+def main(orders: int, lines: int, rounds: int) -> dict:
+    body = dump_list(OrderRead, sample_orders(orders, lines))
+    return {
+        "uncompressed_bytes": len(body),
+        "results": [
+            measure(encoding, level, body, rounds)
+            for encoding in available_encodings()
+            for level in LEVELS[encoding]
+        ],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=100)
+    parser.add_argument("--lines", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(main(args.orders, args.lines, args.rounds), indent=2))
@@ -0,0 +1,90 @@
+"""Compara o caminho padrão do FastAPI com `utils.serialization` ao serializar uma página de pedidos.
+
+Uso:
+    python -m benchmarks.list_serialization [--orders 100] [--lines 10] [--rounds 200]
+
+Os pedidos são objetos em memória com os mesmos atributos que o ORM carrega para `OrderRead`
+(cliente e itens com produto, categoria e seção), então só a serialização é medida. Imprime JSON.
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.network.schemas.order import OrderRead
+from utils.serialization import JSONBytesResponse, dump_list
+
+
+def sample_orders(orders: int, lines: int) -> list:
+    created_at = datetime(2025, 1, 1, 12, 0)
+    category = SimpleNamespace(id=1, name="Bebidas")
+    section = SimpleNamespace(id=2, name="Mercearia")
+    page = []
+    for order_id in range(1, orders + 1):
+        client = SimpleNamespace(id=order_id, name=f"Cliente {order_id}", email=f"cliente{order_id}@example.com", cpf=f"{order_id:011d}")
+        products = []
+        for line in range(lines):
+            product_id = order_id * lines + line
+            product = SimpleNamespace(
+                id=product_id, name=f"Produto {product_id}", category_id=category.id, section_id=section.id,
+                selling_price=19.9 + line, initial_stock=100, cost=9.5, availability=True,
+                description="Descrição do produto para o benchmark", bar_code=f"{product_id:013d}",
+                expiration_date=created_at + timedelta(days=365), images=None, category=category, section=section,
+            )
+            products.append(SimpleNamespace(
+                id=product_id, order_id=order_id, product_id=product_id, quantity=line + 1,
+                unit_price=product.selling_price, product=product,
+            ))
+        page.append(SimpleNamespace(
+            id=order_id, client_id=client.id, status="pending", created_at=created_at, updated_at=created_at,
+            total_amount=sum(item.quantity * item.unit_price for item in products),
+            item_count=sum(item.quantity for item in products), client=client, products=products,
+        ))
+    return page
+
+
+# o mesmo campo que o FastAPI monta para `response_model=List[OrderRead]`
+RESPONSE_FIELD = create_model_field(name="Response_list_orders", type_=List[OrderRead], mode="serialization")
+LOOP = asyncio.new_event_loop()
+
+
+def default_path(page: list) -> bytes:
+    content = LOOP.run_until_complete(serialize_response(field=RESPONSE_FIELD, response_content=page, is_coroutine=True))
+    return JSONResponse(content).body
+
+
+def fast_path(page: list) -> bytes:
+    return JSONBytesResponse(dump_list(OrderRead, page)).body
+
+
+def measure(name: str, render, page: list, rounds: int) -> dict:
+    render(page)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        body = render(page)
+    elapsed = time.perf_counter() - started
+    return {"path": name, "rounds": rounds, "bytes": len(body), "ms_per_page": round(elapsed / rounds * 1000, 3)}
+
+
+def main(orders: int, lines: int, rounds: int) -> list[dict]:
+    page = sample_orders(orders, lines)
+    assert json.loads(default_path(page)) == json.loads(fast_path(page))
+    results = [measure("default", default_path, page, rounds), measure("fast", fast_path, page, rounds)]
+    results[1]["speedup"] = round(results[0]["ms_per_page"] / results[1]["ms_per_page"], 2)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=100)
+    parser.add_argument("--lines", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(main(args.orders, args.lines, args.rounds), indent=2))
@@ -0,0 +1,70 @@
+"""Mede logins/s (verify_and_update) para cada configuração de custo do hashing de senha.
+
+Uso:
+    python -m benchmarks.password_hashing [--logins 200] [--workers 2]
+
+Cada configuração roda no mesmo `HashingPool` usado pela API, com `--workers` processos,
+então o número reportado é o teto de logins/s da máquina para aquele custo. Imprime JSON.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from functools import partial
+
+from core.security import build_password_context
+from utils.hashing_pool import HashingPool
+
+COST_SETTINGS = [
+    {"scheme": "bcrypt", "bcrypt_rounds": 10},
+    {"scheme": "bcrypt", "bcrypt_rounds": 12},
+    {"scheme": "bcrypt", "bcrypt_rounds": 14},
+    {"scheme": "argon2", "argon2_time_cost": 2, "argon2_memory_cost": 19456, "argon2_parallelism": 1},
+    {"scheme": "argon2", "argon2_time_cost": 3, "argon2_memory_cost": 65536, "argon2_parallelism": 1},
+]
+
+PASSWORD = "benchmark-password"
+
+
+def verify(setting: dict, hashed: str) -> bool:
+    # recria o contexto no processo filho: CryptContext não é enviado entre processos
+    valid, _ = build_password_context(**setting).verify_and_update(PASSWORD, hashed)
+    return valid
+
+
+async def measure(setting: dict, logins: int, workers: int) -> dict:
+    hashed = build_password_context(**setting).hash(PASSWORD)
+    pool = HashingPool(workers=workers, max_queue=logins)
+    try:
+        # aquece os processos do pool antes de medir
+        await asyncio.gather(*(pool.run(partial(verify, setting), hashed) for _ in range(workers)))
+        pool.reset()
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(pool.run(partial(verify, setting), hashed) for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+    finally:
+        pool.shutdown()
+
+    assert all(results)
+    return {
+        **setting,
+        "logins": logins,
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "logins_per_second": round(logins / elapsed, 1),
+        "ms_per_login": round(elapsed / logins * workers * 1000, 1),
+    }
+
+
+async def main(logins: int, workers: int) -> list[dict]:
+    return [await measure(setting, logins, workers) for setting in COST_SETTINGS]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main(args.logins, args.workers)), indent=2))
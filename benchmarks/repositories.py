@@ -0,0 +1,275 @@
+"""Mede cada método de ClientRepository, ProductRepository e OrderRepository na base populada.
+
+Uso:
+    python -m benchmarks.seed --clients 1000000 --products 5000000 --order-lines 50000000
+    python -m benchmarks.repositories [--rounds 20] [--only OrderRepository] [--output resultado.json]
+                                      [--baseline resultado-anterior.json]
+
+Cada rodada usa uma sessão nova (sem identity map aquecido) e mede só a chamada ao método. O resultado
+traz min/mediana/p95 em ms e as consultas e linhas por chamada (mesmos hooks do Server-Timing), junto
+com o commit e os volumes da base; com `--baseline` cada caso ganha a variação da mediana.
+
+Os métodos de escrita rodam em ciclo sobre registros criados pelo próprio benchmark (create →
+update → delete), então a base volta ao volume original. `get_all` fica de fora: lê a tabela inteira.
+Imprime JSON.
+"""
+import argparse
+import itertools
+import json
+import statistics
+import subprocess
+import time
+from datetime import datetime, timedelta
+from typing import Callable, NamedTuple, Optional
+
+from sqlalchemy import func, select, text
+
+from app.network.schemas.order import OrderCreate, OrderProductCreate, OrderUpdate
+from app.network.schemas.product import ProductCreate
+from models.models import Client, Order, Product, ProductCategory, ProductSection
+from repositories.client_repository import LIST_ORDER as CLIENT_LIST_ORDER, ClientRepository
+from repositories.loading import LoadProfile
+from repositories.order_repository import LIST_ORDER as ORDER_LIST_ORDER, OrderRepository
+from repositories.product_repository import LIST_ORDER as PRODUCT_LIST_ORDER, ProductRepository
+from utils.database import SessionLocal, engine
+from utils.pagination import encode_cursor
+from utils.request_metrics import collect_metrics
+
+SKIPPED = {"get_all": "lê a tabela inteira"}
+
+
+class Case(NamedTuple):
+    name: str
+    repository: type
+    call: Callable
+
+
+def measure(case: Case, rounds: int) -> dict:
+    durations = []
+    with collect_metrics() as metrics:
+        for _ in range(rounds):
+            with SessionLocal() as session:
+                repo = case.repository(session)
+                started = time.perf_counter()
+                case.call(repo)
+                durations.append(time.perf_counter() - started)
+    durations.sort()
+    return {
+        "case": case.name,
+        "rounds": rounds,
+        "min_ms": round(durations[0] * 1000, 3),
+        "median_ms": round(statistics.median(durations) * 1000, 3),
+        "p95_ms": round(durations[min(len(durations) - 1, int(len(durations) * 0.95))] * 1000, 3),
+        "queries_per_call": round(metrics.queries / rounds, 2),
+        "rows_per_call": round(metrics.rows / rounds, 2),
+    }
+
+
+def dataset() -> dict:
+    """Volumes (maior id, para não fazer count(*) em dezenas de milhões de linhas) e valores usados nos casos."""
+    with SessionLocal() as session:
+        clients = session.scalar(select(func.max(Client.id)))
+        products = session.scalar(select(func.max(Product.id)))
+        orders = session.scalar(select(func.max(Order.id)))
+        if not clients or not products or not orders:
+            raise SystemExit("Base vazia: rode `python -m benchmarks.seed` antes.")
+        client = session.scalar(select(Client).where(Client.id >= clients // 2).order_by(Client.id).limit(1))
+        product = session.scalar(select(Product).where(Product.id >= products // 2).order_by(Product.id).limit(1))
+        order = session.scalar(select(Order).where(Order.id >= orders // 2).order_by(Order.id).limit(1))
+        return {
+            "volumes": {"clients": clients, "products": products, "orders": orders},
+            "client": {"id": client.id, "name": client.name, "email": client.email, "cpf": client.cpf},
+            "product": {"id": product.id, "name": product.name, "category_id": product.category_id, "section_id": product.section_id},
+            "category": session.get(ProductCategory, product.category_id).name,
+            "section": session.get(ProductSection, product.section_id).name,
+            "order": {"id": order.id, "created_at": order.created_at},
+            "client_cursor": encode_cursor(CLIENT_LIST_ORDER, [client.name, client.id]),
+            "product_cursor": encode_cursor(PRODUCT_LIST_ORDER, [product.name, product.id]),
+            "order_cursor": encode_cursor(ORDER_LIST_ORDER, [order.created_at, order.id]),
+        }
+
+
+def cases(data: dict) -> tuple:
+    volumes, client, product, order = data["volumes"], data["client"], data["product"], data["order"]
+    sequence = itertools.count()
+    created = {"clients": [], "products": [], "orders": []}
+
+    def order_lines(count: int = 5) -> list:
+        # produtos diferentes a cada pedido: nenhum saldo se esgota ao longo das rodadas
+        start = volumes["products"] // 3 + next(sequence) * count
+        return [
+            OrderProductCreate(product_id=(start + line) % volumes["products"] + 1, quantity=1, unit_price=9.9)
+            for line in range(count)
+        ]
+
+    def pick(kind: str) -> int:
+        if not created[kind]:
+            raise SystemExit(f"Nenhum registro de {kind} criado: rode o caso create junto (ex.: --only ClientRepository).")
+        return created[kind][next(sequence) % len(created[kind])]
+
+    def new_product(name: str) -> ProductCreate:
+        return ProductCreate(
+            name=name, category_id=product["category_id"], section_id=product["section_id"],
+            selling_price=12.5, initial_stock=10, bar_code=f"bench-{next(sequence)}",
+        )
+
+    def create_client(repo):
+        number = next(sequence)
+        created["clients"].append(repo.create(Client(
+            name=f"Cliente Benchmark {number}", email=f"bench-{number}@example.com", cpf=f"bench{number:09d}",
+        )).id)
+
+    def update_client(repo):
+        repo.update(pick("clients"), {"name": f"Cliente Renomeado {next(sequence)}"})
+
+    def create_product(repo):
+        created["products"].append(repo.create(new_product("Produto Benchmark")).id)
+
+    def update_product(repo):
+        repo.update(pick("products"), new_product("Produto Renomeado").model_dump())
+
+    def create_order(repo):
+        created["orders"].append(repo.create(OrderCreate(client_id=client["id"], products=order_lines())).id)
+
+    def update_order(repo):
+        repo.update_order(pick("orders"), OrderUpdate(client_id=client["id"], status="paid", products=order_lines(3)))
+
+    def create_bulk(repo):
+        results = repo.create_bulk([
+            OrderCreate(client_id=client["id"], products=order_lines()) for _ in range(100)
+        ])
+        created["orders"].extend(result["id"] for result in results if result.get("id"))
+
+    def delete(kind: str):
+        def call(repo):
+            if created[kind]:
+                repo.delete(created[kind].pop())
+        return call
+
+    def upsert_copy(repo):
+        # 1000 produtos novos por rodada, apagados no fim (bar_code "bench-...")
+        repo.upsert_copy([new_product(f"Produto Importado {i}") for i in range(1000)])
+
+    def export_day(repo):
+        start = order["created_at"]
+        return sum(1 for _ in repo.export_rows(start, start + timedelta(days=1)))
+
+    search_word = product["name"].split()[0]
+    return [
+        Case("ClientRepository.list", ClientRepository, lambda repo: repo.list(limit=50)),
+        Case("ClientRepository.list(name)", ClientRepository, lambda repo: repo.list(name=client["name"].split()[0], limit=50)),
+        Case("ClientRepository.list(email)", ClientRepository, lambda repo: repo.list(email=client["email"].split("@")[0], limit=50)),
+        Case("ClientRepository.list(deep offset)", ClientRepository, lambda repo: repo.list(skip=volumes["clients"] // 2, limit=50)),
+        Case("ClientRepository.list(cursor)", ClientRepository, lambda repo: repo.list(cursor=data["client_cursor"], limit=50)),
+        Case("ClientRepository.search", ClientRepository, lambda repo: repo.search(client["name"], limit=50)),
+        Case("ClientRepository.get", ClientRepository, lambda repo: repo.get(client["id"])),
+        Case("ClientRepository.get_version", ClientRepository, lambda repo: repo.get_version(client["id"])),
+        Case("ClientRepository.get_by_email", ClientRepository, lambda repo: repo.get_by_email(client["email"])),
+        Case("ClientRepository.get_by_cpf", ClientRepository, lambda repo: repo.get_by_cpf(client["cpf"])),
+        Case("ClientRepository.create", ClientRepository, create_client),
+        Case("ClientRepository.update", ClientRepository, update_client),
+        Case("ClientRepository.delete", ClientRepository, delete("clients")),
+        Case("ProductRepository.list", ProductRepository, lambda repo: repo.list(limit=50)),
+        Case("ProductRepository.list(minimal)", ProductRepository, lambda repo: repo.list(limit=50, profile=LoadProfile.MINIMAL)),
+        Case("ProductRepository.list(category)", ProductRepository, lambda repo: repo.list(category_name=data["category"], limit=50)),
+        Case("ProductRepository.list(section)", ProductRepository, lambda repo: repo.list(section_name=data["section"], limit=50)),
+        Case("ProductRepository.list(price)", ProductRepository, lambda repo: repo.list(price_min=10, price_max=20, available=True, limit=50)),
+        Case("ProductRepository.list(deep offset)", ProductRepository, lambda repo: repo.list(skip=volumes["products"] // 2, limit=50)),
+        Case("ProductRepository.list(cursor)", ProductRepository, lambda repo: repo.list(cursor=data["product_cursor"], limit=50)),
+        Case("ProductRepository.search", ProductRepository, lambda repo: repo.search(search_word, limit=50)),
+        Case("ProductRepository.get", ProductRepository, lambda repo: repo.get(product["id"])),
+        Case("ProductRepository.get_version", ProductRepository, lambda repo: repo.get_version(product["id"])),
+        Case("ProductRepository.resolve_category_section_ids", ProductRepository,
+             lambda repo: repo.resolve_category_section_ids({data["category"]}, {data["section"]})),
+        Case("ProductRepository.create", ProductRepository, create_product),
+        Case("ProductRepository.update", ProductRepository, update_product),
+        Case("ProductRepository.delete", ProductRepository, delete("products")),
+        Case("ProductRepository.upsert_copy(1000)", ProductRepository, upsert_copy),
+        Case("OrderRepository.list", OrderRepository, lambda repo: repo.list(limit=50)),
+        Case("OrderRepository.list(minimal)", OrderRepository, lambda repo: repo.list(limit=50, profile=LoadProfile.MINIMAL)),
+        Case("OrderRepository.list(filters)", OrderRepository,
+             lambda repo: repo.list(category_name=data["category"], price_min=10, price_max=20, available=True, limit=50)),
+        Case("OrderRepository.list(total)", OrderRepository, lambda repo: repo.list(total_min=100, total_max=200, sort="-total_amount", limit=50)),
+        Case("OrderRepository.list(deep offset)", OrderRepository, lambda repo: repo.list(skip=volumes["orders"] // 2, limit=50)),
+        Case("OrderRepository.list(cursor)", OrderRepository, lambda repo: repo.list(cursor=data["order_cursor"], limit=50)),
+        Case("OrderRepository.get", OrderRepository, lambda repo: repo.get(order["id"])),
+        Case("OrderRepository.get_version", OrderRepository, lambda repo: repo.get_version(order["id"])),
+        Case("OrderRepository.export_rows(1 dia)", OrderRepository, export_day),
+        Case("OrderRepository.create", OrderRepository, create_order),
+        Case("OrderRepository.update_order", OrderRepository, update_order),
+        Case("OrderRepository.create_bulk(100)", OrderRepository, create_bulk),
+        Case("OrderRepository.delete", OrderRepository, delete("orders")),
+    ], created
+
+
+def cleanup(created: dict) -> None:
+    """Apaga o que sobrou dos ciclos de escrita (delete roda uma vez por rodada, create_bulk cria 100)."""
+    with SessionLocal() as session:
+        orders = OrderRepository(session)
+        for id in created["orders"]:
+            orders.delete(id)
+        for id in created["clients"]:
+            ClientRepository(session).delete(id)
+        for id in created["products"]:
+            ProductRepository(session).delete(id)
+        session.execute(text("DELETE FROM products WHERE bar_code LIKE 'bench-%'"))
+        session.commit()
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list, baseline: dict) -> None:
+    previous = {result["case"]: result for result in baseline.get("results", [])}
+    for result in results:
+        before = previous.get(result["case"])
+        if before and before["median_ms"]:
+            result["baseline_median_ms"] = before["median_ms"]
+            result["median_change"] = round(result["median_ms"] / before["median_ms"] - 1, 4)
+
+
+def main(rounds: int, only: Optional[str], baseline: Optional[dict]) -> dict:
+    data = dataset()
+    selected, created = cases(data)
+    if only:
+        selected = [case for case in selected if case.name.startswith(only)]
+
+    try:
+        results = [measure(case, rounds) for case in selected]
+    finally:
+        cleanup(created)
+    if baseline:
+        compare(results, baseline)
+
+    return {
+        "commit": current_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "database": engine.url.render_as_string(hide_password=True),
+        "volumes": data["volumes"],
+        "skipped": SKIPPED,
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--only", help="prefixo do nome dos casos (ex.: OrderRepository.list)")
+    parser.add_argument("--output", help="arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparar as medianas")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    report = json.dumps(main(args.rounds, args.only, baseline), indent=2, default=str)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report + "\n")
+    else:
+        print(report)
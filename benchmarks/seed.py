@@ -0,0 +1,214 @@
+"""Popula o Postgres configurado no `.env` com dados sintéticos nos volumes pedidos, via COPY.
+
+Uso:
+    python -m benchmarks.seed [--clients 10000] [--products 50000] [--order-lines 500000]
+                              [--lines-per-order 5] [--categories 50] [--sections 20] [--days 365] [--truncate]
+
+Ex.: `--clients 1000000 --products 5000000 --order-lines 50000000` para os volumes de produção.
+O schema precisa existir (`alembic upgrade head`). Tabelas com dados só são apagadas com `--truncate`.
+
+As linhas saem de geradores em Python lidos pelo COPY em blocos, sem montar o arquivo em memória.
+Todo valor é função do id (sem aleatoriedade), então a mesma linha de comando gera sempre a mesma
+base e os resultados de `benchmarks.repositories` são comparáveis entre commits. Saldo e livro de
+estoque nascem do `initial_stock`; os pedidos gerados não reservam estoque nem geram eventos de venda.
+Imprime JSON com linhas e tempo de carga por tabela.
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from sqlalchemy import text
+
+from utils.database import engine
+
+SEEDED_TABLES = (
+    "clients", "product_categories", "product_sections", "products", "product_stock",
+    "inventory_movements", "orders", "order_products", "sales_events", "daily_sales_rollup",
+)
+
+FIRST_NAMES = ("Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela", "João",
+               "Larissa", "Marcos", "Natália", "Otávio", "Patrícia", "Rafael", "Sofia", "Thiago", "Vanessa", "William")
+LAST_NAMES = ("Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+              "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa")
+PRODUCT_NAMES = ("Arroz", "Feijão", "Café", "Leite", "Açúcar", "Farinha", "Macarrão", "Óleo", "Biscoito", "Suco",
+                 "Queijo", "Iogurte", "Manteiga", "Sabonete", "Detergente", "Chocolate", "Cerveja", "Água", "Pão", "Molho")
+PRODUCT_KINDS = ("Integral", "Tradicional", "Orgânico", "Light", "Premium", "Zero", "Especial", "Caseiro", "Natural", "Extra")
+STATUSES = ("pending", "paid", "shipped", "delivered", "cancelled")
+FIRST_DAY = datetime(2024, 1, 1)
+
+
+class RowStream:
+    """Arquivo somente leitura sobre um gerador de linhas: o COPY lê em blocos e o gerador anda junto."""
+
+    def __init__(self, lines: Iterator[str]):
+        self._lines = lines
+        self._pending = ""
+        self.rows = 0
+
+    def read(self, size: int = -1) -> str:
+        chunks, length = [self._pending], len(self._pending)
+        for line in self._lines:
+            chunks.append(line)
+            length += len(line)
+            self.rows += 1
+            if 0 <= size <= length:
+                break
+        data = "".join(chunks)
+        if size < 0:
+            self._pending = ""
+            return data
+        self._pending = data[size:]
+        return data[:size]
+
+
+def selling_price(product_id: int) -> float:
+    return 1 + (product_id * 37 % 9900) / 100
+
+
+def order_client(order_id: int, clients: int) -> int:
+    return order_id * 2654435761 % clients + 1
+
+
+def line_product(order_id: int, line: int, products: int) -> int:
+    return (order_id * 7919 + line * 104729) % products + 1
+
+
+def line_quantity(order_id: int, line: int) -> int:
+    return 1 + (order_id + line) % 5
+
+
+def client_rows(count: int) -> Iterator[str]:
+    for id in range(1, count + 1):
+        name = f"{FIRST_NAMES[id % 20]} {LAST_NAMES[id // 20 % 20]} {LAST_NAMES[id // 400 % 20]}"
+        yield f"{id}\t{name}\tcliente{id}@example.com\t{id:011d}\n"
+
+
+def named_rows(prefix: str, count: int) -> Iterator[str]:
+    for id in range(1, count + 1):
+        yield f"{id}\t{prefix} {id}\n"
+
+
+def product_rows(count: int, categories: int, sections: int) -> Iterator[str]:
+    for id in range(1, count + 1):
+        name = f"{PRODUCT_NAMES[id % 20]} {PRODUCT_KINDS[id // 20 % 10]} {id}"
+        price = selling_price(id)
+        available = "f" if id % 50 == 0 else "t"
+        yield (
+            f"{id}\t{name}\t{id % categories + 1}\t{id % sections + 1}\t{price * 0.6:.2f}\t{price:.2f}\t{available}\t"
+            f"{PRODUCT_NAMES[id % 20]} {PRODUCT_KINDS[id % 10].lower()} do fornecedor {id % 97}\t{id:013d}\t{100 + id % 400}\n"
+        )
+
+
+def order_rows(orders: int, lines: int, clients: int, products: int, days: int) -> Iterator[str]:
+    step = days * 86400 / max(orders, 1)
+    for id in range(1, orders + 1):
+        created_at = FIRST_DAY + timedelta(seconds=int(id * step))
+        total = sum(
+            line_quantity(id, line) * selling_price(line_product(id, line, products))
+            for line in range(lines)
+        )
+        yield (
+            f"{id}\t{order_client(id, clients)}\t{STATUSES[id % 5]}\t{created_at.isoformat()}\t"
+            f"{created_at.isoformat()}\t{total:.2f}\t{lines}\n"
+        )
+
+
+def order_line_rows(orders: int, lines: int, products: int) -> Iterator[str]:
+    id = 0
+    for order_id in range(1, orders + 1):
+        for line in range(lines):
+            id += 1
+            product_id = line_product(order_id, line, products)
+            yield f"{id}\t{order_id}\t{product_id}\t{line_quantity(order_id, line)}\t{selling_price(product_id):.2f}\n"
+
+
+def copy(cursor, table: str, columns: str, lines: Iterator[str]) -> dict:
+    stream = RowStream(lines)
+    started = time.perf_counter()
+    cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN", stream)
+    elapsed = time.perf_counter() - started
+    return {"table": table, "rows": stream.rows, "seconds": round(elapsed, 3), "rows_per_second": round(stream.rows / max(elapsed, 1e-6))}
+
+
+def execute(cursor, table: str, statement: str) -> dict:
+    started = time.perf_counter()
+    cursor.execute(statement)
+    return {"table": table, "rows": cursor.rowcount, "seconds": round(time.perf_counter() - started, 3)}
+
+
+def main(clients: int, products: int, order_lines: int, lines_per_order: int, categories: int, sections: int,
+         days: int, truncate: bool) -> dict:
+    orders = order_lines // lines_per_order
+    with engine.connect() as connection:
+        populated = [
+            table for table in SEEDED_TABLES
+            if connection.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table})")).scalar()
+        ]
+    if populated and not truncate:
+        raise SystemExit(f"Tabelas com dados: {', '.join(populated)}. Use --truncate para apagá-las.")
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        if populated:
+            cursor.execute(f"TRUNCATE {', '.join(SEEDED_TABLES)} RESTART IDENTITY CASCADE")
+        steps = [
+            copy(cursor, "clients", "id, name, email, cpf", client_rows(clients)),
+            copy(cursor, "product_categories", "id, name", named_rows("Categoria", categories)),
+            copy(cursor, "product_sections", "id, name", named_rows("Seção", sections)),
+            copy(
+                cursor, "products",
+                "id, name, category_id, section_id, cost, selling_price, availability, description, bar_code, initial_stock",
+                product_rows(products, categories, sections),
+            ),
+            execute(cursor, "product_stock", "INSERT INTO product_stock (product_id, on_hand) SELECT id, initial_stock FROM products"),
+            execute(
+                cursor, "inventory_movements",
+                "INSERT INTO inventory_movements (product_id, kind, quantity, note) "
+                "SELECT id, 'restock', initial_stock, 'estoque inicial' FROM products WHERE initial_stock <> 0",
+            ),
+            copy(
+                cursor, "orders", "id, client_id, status, created_at, updated_at, total_amount, item_count",
+                order_rows(orders, lines_per_order, clients, products, days),
+            ),
+            copy(
+                cursor, "order_products", "id, order_id, product_id, quantity, unit_price",
+                order_line_rows(orders, lines_per_order, products),
+            ),
+        ]
+        # os ids vieram explícitos no COPY: as sequences continuam do maior id carregado
+        for table in ("clients", "product_categories", "product_sections", "products", "orders", "order_products"):
+            cursor.execute(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), GREATEST((SELECT max(id) FROM {table}), 1))")
+        connection.commit()
+    finally:
+        connection.close()
+
+    # estatísticas atualizadas para o planner antes de medir qualquer consulta (VACUUM não roda em transação)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        started = time.perf_counter()
+        connection.execute(text(f"VACUUM ANALYZE {', '.join(SEEDED_TABLES)}"))
+        steps.append({"table": "*", "seconds": round(time.perf_counter() - started, 3), "step": "vacuum analyze"})
+
+    return {
+        "volumes": {"clients": clients, "products": products, "orders": orders, "order_lines": orders * lines_per_order},
+        "steps": steps,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=10000)
+    parser.add_argument("--products", type=int, default=50000)
+    parser.add_argument("--order-lines", type=int, default=500000)
+    parser.add_argument("--lines-per-order", type=int, default=5)
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--sections", type=int, default=20)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--truncate", action="store_true")
+    args = parser.parse_args()
+    print(json.dumps(main(
+        args.clients, args.products, args.order_lines, args.lines_per_order,
+        args.categories, args.sections, args.days, args.truncate,
+    ), indent=2))
@@ -1,28 +1,80 @@
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from starlette.concurrency import run_in_threadpool
+import jwt
 
+from app.network.schemas.user import TokenClaims
 from core.security import SECRET_KEY, ALGORITHM
 from models.models import User
-from repositories.user_repository import UserRepository
-from utils.database import get_session
+from repositories.user_repository import UserRepository, AsyncUserRepository
+from utils.cache import user_cache
+from utils.config import Config
+from utils.database import get_session, SessionLocal, AsyncSessionLocal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-async def get_current_user(token: str = Depends(oauth2_scheme), session = Depends(get_session)) -> User:
+USER_COLUMNS = [column.key for column in User.__table__.columns]
+
+def get_repository(sync_repository, async_repository):
+    """Dependência que entrega o repositório síncrono ou assíncrono conforme `Config.db_async`."""
+    repository_class = async_repository if Config.db_async else sync_repository
+
+    def dependency(session = Depends(get_session)):
+        return repository_class(session)
+
+    return dependency
+
+def _snapshot(user: User) -> dict:
+    return {column: getattr(user, column) for column in USER_COLUMNS}
+
+async def _load_user_snapshot(user_id: int):
+    """Lê a linha do usuário só quando ela não está no cache (uma consulta por usuário a cada TTL)."""
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    token = user_cache.token()
+    if Config.db_async:
+        async with AsyncSessionLocal() as session:
+            user = await AsyncUserRepository(session).get(user_id)
+            snapshot = _snapshot(user) if user else None
+    else:
+        def load():
+            with SessionLocal() as session:
+                user = UserRepository(session).get(user_id)
+                return _snapshot(user) if user else None
+        snapshot = await run_in_threadpool(load)
+
+    if snapshot is not None:
+        user_cache.set(user_id, snapshot, token)
+    return snapshot
+
+async def get_current_claims(token: str = Depends(oauth2_scheme)) -> TokenClaims:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = int(payload.get("sub"))
-    except (JWTError, ValueError):
+        claims = TokenClaims(
+            user_id=int(payload.get("sub")),
+            is_admin=bool(payload.get("is_admin", False)),
+            version=int(payload.get("ver", 0)),
+        )
+    except (jwt.PyJWTError, TypeError, ValueError):
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    repo = UserRepository(session)
-    user = await repo.get(user_id)
-    if not user:
+    snapshot = await _load_user_snapshot(claims.user_id)
+    if not snapshot:
+        raise HTTPException(status_code=401, detail="User not found")
+    if claims.version != snapshot["token_version"]:
+        raise HTTPException(status_code=401, detail="Token revoked")
+    return claims
+
+async def get_current_user(claims: TokenClaims = Depends(get_current_claims)) -> User:
+    snapshot = await _load_user_snapshot(claims.user_id)
+    if not snapshot:
         raise HTTPException(status_code=401, detail="User not found")
-    return user
+    # instância nova a cada requisição: o snapshot do cache nunca é alterado pelas rotas
+    return User(**snapshot)
 
-async def admin_required(current_user: User = Depends(get_current_user)) -> User:
-    if not current_user.is_admin:
+async def admin_required(claims: TokenClaims = Depends(get_current_claims)) -> TokenClaims:
+    if not claims.is_admin:
         raise HTTPException(status_code=403, detail="Admin privileges required")
-    return current_user
+    return claims
@@ -1,12 +1,41 @@
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 import jwt
 
+from utils.hashing_pool import HashingPool
+from utils.config import Config
+
 SECRET_KEY = "SECRET KEY HERE"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def build_password_context(
+    scheme: str = Config.password_scheme,
+    bcrypt_rounds: int = Config.bcrypt_rounds,
+    argon2_time_cost: int = Config.argon2_time_cost,
+    argon2_memory_cost: int = Config.argon2_memory_cost,
+    argon2_parallelism: int = Config.argon2_parallelism,
+) -> CryptContext:
+    # o esquema configurado vira o padrão; o outro fica "deprecated" e é refeito no próximo login,
+    # assim como hashes com custo abaixo do configurado (min_rounds / parâmetros do argon2)
+    return CryptContext(
+        schemes=["argon2", "bcrypt"],
+        default=scheme,
+        deprecated="auto",
+        bcrypt__default_rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        argon2__time_cost=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+pwd_context = build_password_context()
+
+# bcrypt/argon2 levam ~100-300 ms de CPU: rodam em processos separados para não travar o event loop
+hashing_pool = HashingPool(workers=Config.hash_workers, max_queue=Config.hash_max_queue)
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -14,9 +43,20 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password:str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """Retorna (senha confere, novo hash se o atual usa esquema/custo antigo)."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+async def hash_password_async(password: str) -> str:
+    return await hashing_pool.run(hash_password, password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    return await hashing_pool.run(verify_and_update_password, plain_password, hashed_password)
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+
@@ -0,0 +1,35 @@
+"""Add keyset pagination indexes
+
+Revision ID: 5f3c2a9d81be
+Revises: 23814a0f0485
+Create Date: 2026-10-18 09:12:40.118273
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f3c2a9d81be'
+down_revision: Union[str, None] = '23814a0f0485'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # índices (chave de ordenação, id) usados pela paginação por cursor das listagens
+    with op.get_context().autocommit_block():
+        op.create_index('ix_clients_name_id', 'clients', ['name', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_products_name_id', 'products', ['name', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_orders_created_at_id', 'orders', ['created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_orders_created_at_id', table_name='orders', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_products_name_id', table_name='products', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_clients_name_id', table_name='clients', postgresql_concurrently=True, if_exists=True)
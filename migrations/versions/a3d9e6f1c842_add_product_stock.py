@@ -0,0 +1,43 @@
+"""Add product stock
+
+Revision ID: a3d9e6f1c842
+Revises: f1a7c3e95b20
+Create Date: 2026-10-18 14:05:12.338104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d9e6f1c842'
+down_revision: Union[str, None] = 'f1a7c3e95b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'product_stock',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('on_hand', sa.Integer(), nullable=False),
+        sa.CheckConstraint('on_hand >= 0', name='check_on_hand_non_negative'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('product_id'),
+    )
+    # saldo atual = estoque inicial menos o que já foi vendido (pedidos antigos nunca baixaram estoque)
+    op.execute("""
+        INSERT INTO product_stock (product_id, on_hand)
+        SELECT p.id, GREATEST(p.initial_stock - COALESCE(SUM(op.quantity), 0), 0)
+        FROM products p
+        LEFT JOIN order_products op ON op.product_id = p.id
+        GROUP BY p.id, p.initial_stock
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('product_stock')
@@ -0,0 +1,30 @@
+"""Add product categories and sections updated_at
+
+Revision ID: a6d3f9c2b481
+Revises: e4c9a2f7b136
+Create Date: 2026-10-18 20:12:44.508316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d3f9c2b481'
+down_revision: Union[str, None] = 'e4c9a2f7b136'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('product_categories', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True))
+    op.add_column('product_sections', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('product_sections', 'updated_at')
+    op.drop_column('product_categories', 'updated_at')
@@ -0,0 +1,47 @@
+"""Add trigram search indexes
+
+Revision ID: b7e41d0c2f93
+Revises: 5f3c2a9d81be
+Create Date: 2026-10-18 10:02:17.604512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e41d0c2f93'
+down_revision: Union[str, None] = '5f3c2a9d81be'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = [
+    ('ix_clients_name_trgm', 'clients', 'name'),
+    ('ix_clients_email_trgm', 'clients', 'email'),
+    ('ix_product_categories_name_trgm', 'product_categories', 'name'),
+    ('ix_product_sections_name_trgm', 'product_sections', 'name'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # GIN com gin_trgm_ops atende ILIKE '%x%' e os operadores de similaridade (%, <%)
+    with op.get_context().autocommit_block():
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(
+                name, table, [column], unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(TRIGRAM_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
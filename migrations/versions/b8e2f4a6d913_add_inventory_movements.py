@@ -0,0 +1,68 @@
+"""Add inventory movements
+
+Revision ID: b8e2f4a6d913
+Revises: a3d9e6f1c842
+Create Date: 2026-10-18 15:12:40.517926
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e2f4a6d913'
+down_revision: Union[str, None] = 'a3d9e6f1c842'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'inventory_movements',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=True),
+        sa.Column('note', sa.String(length=200), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.CheckConstraint('quantity <> 0', name='check_movement_quantity_not_zero'),
+        sa.CheckConstraint("kind IN ('sale', 'return', 'restock', 'adjustment')", name='check_movement_kind'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    # histórico: estoque inicial, uma venda por item de pedido e um ajuste para o que o saldo
+    # atual não explica (ex.: vendas acima do estoque inicial, truncadas em zero)
+    op.execute("""
+        INSERT INTO inventory_movements (product_id, kind, quantity, note, created_at)
+        SELECT id, 'restock', initial_stock, 'estoque inicial', now()
+        FROM products WHERE initial_stock <> 0
+    """)
+    op.execute("""
+        INSERT INTO inventory_movements (product_id, kind, quantity, order_id, created_at)
+        SELECT op.product_id, 'sale', -SUM(op.quantity), op.order_id, MIN(o.created_at)
+        FROM order_products op JOIN orders o ON o.id = op.order_id
+        GROUP BY op.order_id, op.product_id
+    """)
+    op.execute("""
+        INSERT INTO inventory_movements (product_id, kind, quantity, note, created_at)
+        SELECT s.product_id, 'adjustment', s.on_hand - COALESCE(SUM(m.quantity), 0), 'migração do saldo', now()
+        FROM product_stock s LEFT JOIN inventory_movements m ON m.product_id = s.product_id
+        GROUP BY s.product_id, s.on_hand
+        HAVING s.on_hand <> COALESCE(SUM(m.quantity), 0)
+    """)
+
+    op.create_index(
+        'ix_inventory_movements_product_id', 'inventory_movements', ['product_id'],
+        unique=False, postgresql_include=['quantity'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_inventory_movements_product_id', table_name='inventory_movements')
+    op.drop_table('inventory_movements')
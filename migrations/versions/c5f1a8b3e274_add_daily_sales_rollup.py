@@ -0,0 +1,74 @@
+"""Add daily sales rollup
+
+Revision ID: c5f1a8b3e274
+Revises: b8e2f4a6d913
+Create Date: 2026-10-18 16:02:18.240731
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5f1a8b3e274'
+down_revision: Union[str, None] = 'b8e2f4a6d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'sales_events',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('client_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('section_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.Column('lines', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'daily_sales_rollup',
+        sa.Column('dimension', sa.String(length=10), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('key_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.BigInteger(), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.Column('lines', sa.Integer(), nullable=False),
+        sa.CheckConstraint("dimension IN ('total', 'client', 'category', 'section')", name='check_rollup_dimension'),
+        sa.PrimaryKeyConstraint('dimension', 'day', 'key_id'),
+    )
+    # carga inicial com todo o histórico de pedidos: um GROUPING SETS gera as quatro dimensões
+    op.execute("""
+        INSERT INTO daily_sales_rollup (dimension, day, key_id, quantity, revenue, lines)
+        SELECT
+            CASE
+                WHEN GROUPING(o.client_id) = 0 THEN 'client'
+                WHEN GROUPING(p.category_id) = 0 THEN 'category'
+                WHEN GROUPING(p.section_id) = 0 THEN 'section'
+                ELSE 'total'
+            END,
+            CAST(o.created_at AS date),
+            COALESCE(o.client_id, p.category_id, p.section_id, 0),
+            SUM(op.quantity), SUM(op.quantity * op.unit_price), COUNT(*)
+        FROM order_products op
+        JOIN orders o ON o.id = op.order_id
+        JOIN products p ON p.id = op.product_id
+        GROUP BY GROUPING SETS (
+            (CAST(o.created_at AS date)),
+            (CAST(o.created_at AS date), o.client_id),
+            (CAST(o.created_at AS date), p.category_id),
+            (CAST(o.created_at AS date), p.section_id)
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_sales_rollup')
+    op.drop_table('sales_events')
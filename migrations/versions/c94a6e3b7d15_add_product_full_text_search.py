@@ -0,0 +1,79 @@
+"""Add product full text search
+
+Revision ID: c94a6e3b7d15
+Revises: b7e41d0c2f93
+Create Date: 2026-10-18 10:48:55.290734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c94a6e3b7d15'
+down_revision: Union[str, None] = 'b7e41d0c2f93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_BATCH_SIZE = 5000
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('portuguese', coalesce({row}name, '')), 'A') || "
+    "setweight(to_tsvector('portuguese', coalesce({row}description, '')), 'B')"
+)
+
+BACKFILL_SQL = sa.text(f"""
+    UPDATE products SET search_vector = {SEARCH_VECTOR_SQL.format(row='')}
+    WHERE id BETWEEN :first_id AND :last_id AND search_vector IS NULL
+""")
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Coluna comum mantida por trigger, e não gerada (STORED): a coluna gerada reescreveria products
+    inteira sob ACCESS EXCLUSIVE. Aqui o ADD COLUMN só altera o catálogo, o trigger cobre as escritas
+    a partir da criação e as linhas existentes são preenchidas em lotes, sem bloquear leituras e escritas.
+    """
+    op.add_column('products', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION products_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR_SQL.format(row='NEW.')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER products_search_vector_update
+        BEFORE INSERT OR UPDATE OF name, description ON products
+        FOR EACH ROW EXECUTE FUNCTION products_search_vector_update()
+    """)
+
+    # o trigger já está commitado antes do preenchimento: linhas escritas durante os lotes não ficam sem vetor
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        first_id, last_id = bind.execute(sa.text("SELECT min(id), max(id) FROM products")).one()
+        if first_id is not None:
+            for start in range(first_id, last_id + 1, BACKFILL_BATCH_SIZE):
+                bind.execute(BACKFILL_SQL, {"first_id": start, "last_id": start + BACKFILL_BATCH_SIZE - 1})
+
+        op.create_index(
+            'ix_products_search_vector', 'products', ['search_vector'], unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_products_search_vector', table_name='products', postgresql_concurrently=True, if_exists=True)
+    op.execute("DROP TRIGGER IF EXISTS products_search_vector_update ON products")
+    op.execute("DROP FUNCTION IF EXISTS products_search_vector_update()")
+    op.drop_column('products', 'search_vector')
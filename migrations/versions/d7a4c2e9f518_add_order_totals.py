@@ -0,0 +1,60 @@
+"""Add order totals
+
+Revision ID: d7a4c2e9f518
+Revises: c5f1a8b3e274
+Create Date: 2026-10-18 16:48:31.902664
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a4c2e9f518'
+down_revision: Union[str, None] = 'c5f1a8b3e274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+BACKFILL_SQL = sa.text("""
+    UPDATE orders o
+    SET total_amount = t.total_amount, item_count = t.item_count
+    FROM (
+        SELECT order_id, SUM(quantity * unit_price) AS total_amount, SUM(quantity) AS item_count
+        FROM order_products
+        WHERE order_id BETWEEN :first_id AND :last_id
+        GROUP BY order_id
+    ) t
+    WHERE o.id = t.order_id
+""")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # com server_default o ADD COLUMN não reescreve a tabela (Postgres 11+)
+    op.add_column('orders', sa.Column('total_amount', sa.Float(), server_default='0', nullable=False))
+    op.add_column('orders', sa.Column('item_count', sa.Integer(), server_default='0', nullable=False))
+
+    # cada lote commita sozinho: locks curtos e nenhuma transação longa segurando a tabela inteira
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        first_id, last_id = bind.execute(sa.text("SELECT min(id), max(id) FROM orders")).one()
+        if first_id is not None:
+            for start in range(first_id, last_id + 1, BACKFILL_BATCH_SIZE):
+                bind.execute(BACKFILL_SQL, {"first_id": start, "last_id": start + BACKFILL_BATCH_SIZE - 1})
+
+        op.create_index(
+            'ix_orders_total_amount_id', 'orders', ['total_amount', 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_orders_total_amount_id', table_name='orders', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('orders', 'item_count')
+    op.drop_column('orders', 'total_amount')
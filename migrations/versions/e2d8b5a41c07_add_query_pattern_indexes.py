@@ -0,0 +1,45 @@
+"""Add query pattern indexes
+
+Revision ID: e2d8b5a41c07
+Revises: c94a6e3b7d15
+Create Date: 2026-10-18 11:35:08.447190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2d8b5a41c07'
+down_revision: Union[str, None] = 'c94a6e3b7d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (client_id, created_at) também atende filtros só por client_id, e (order_id, product_id) só por order_id;
+# orders.created_at sozinho já é coberto por ix_orders_created_at_id
+INDEXES = [
+    ('ix_orders_client_id_created_at', 'orders', ['client_id', 'created_at']),
+    ('ix_orders_status_created_at', 'orders', ['status', 'created_at']),
+    ('ix_order_products_order_id_product_id', 'order_products', ['order_id', 'product_id']),
+    ('ix_order_products_product_id', 'order_products', ['product_id']),
+    ('ix_products_category_id', 'products', ['category_id']),
+    ('ix_products_section_id', 'products', ['section_id']),
+    ('ix_products_selling_price', 'products', ['selling_price']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY não bloqueia escritas, mas não pode rodar dentro de transação
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,31 @@
+"""Add products and clients updated_at
+
+Revision ID: e4c9a2f7b136
+Revises: d7a4c2e9f518
+Create Date: 2026-10-18 17:41:08.215730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c9a2f7b136'
+down_revision: Union[str, None] = 'd7a4c2e9f518'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # now() é STABLE: o default vale para as linhas existentes sem reescrever a tabela (Postgres 11+)
+    op.add_column('products', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True))
+    op.add_column('clients', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('clients', 'updated_at')
+    op.drop_column('products', 'updated_at')
@@ -0,0 +1,28 @@
+"""Add user token version
+
+Revision ID: f1a7c3e95b20
+Revises: e2d8b5a41c07
+Create Date: 2026-10-18 13:20:44.905112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a7c3e95b20'
+down_revision: Union[str, None] = 'e2d8b5a41c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
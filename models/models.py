@@ -1,5 +1,6 @@
-from sqlalchemy.orm import declarative_base, relationship
-from sqlalchemy import ForeignKey, Column, DateTime, String, Integer, func, Boolean, Float, CheckConstraint
+from sqlalchemy.orm import declarative_base, relationship, deferred
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy import ForeignKey, Column, Date, DateTime, String, Integer, BigInteger, func, Boolean, Float, CheckConstraint, Index, DDL, event
 
 Base = declarative_base()
 metadata = Base.metadata
@@ -11,8 +12,17 @@ class Client(Base):
     name = Column(String(60), nullable=False)
     email = Column(String(60), nullable=False, unique=True)
     cpf = Column(String(14), nullable=False, unique=True)
+    # versão da linha para o ETag; eager_defaults traz o valor novo no RETURNING do UPDATE
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     orders = relationship("Order", back_populates="client")
 
+    __table_args__ = (
+        Index('ix_clients_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_clients_email_trgm', 'email', postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}),
+        Index('ix_clients_name_id', 'name', 'id'),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self):
         return f"<Client(id={self.id}, name='{self.name}', email='{self.email}', cpf='{self.cpf}')>"
 
@@ -21,15 +31,29 @@ class ProductCategory(Base):
 
     id = Column(Integer, primary_key=True,  autoincrement=True)
     name = Column(String(60), nullable=False, unique=True)
+    # o nome aparece no ProductRead e no OrderRead: entra no ETag deles
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     products = relationship("Product", back_populates="category")
 
+    __table_args__ = (
+        Index('ix_product_categories_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
 class ProductSection(Base):
     __tablename__ = "product_sections"
 
     id = Column(Integer, primary_key=True,  autoincrement=True)
     name = Column(String(60), nullable=False, unique=True)
+    # versão para os ETags de produto e pedido, como na categoria
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     products = relationship("Product", back_populates="section")
 
+    __table_args__ = (
+        Index('ix_product_sections_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
 class Product(Base):
     __tablename__ = "products"
 
@@ -51,8 +75,74 @@ class Product(Base):
 
     images = Column(String, nullable=True)
 
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    # mantido pelo trigger products_search_vector_update; deferred para não trafegar o vetor em toda leitura de produto
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+
     category = relationship("ProductCategory", back_populates="products")
     section = relationship("ProductSection", back_populates="products")
+    stock_level = relationship("ProductStock", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
+    movements = relationship("InventoryMovement", cascade="all, delete-orphan", passive_deletes=True, lazy="noload")
+
+    __table_args__ = (
+        Index('ix_products_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_products_name_id', 'name', 'id'),
+        Index('ix_products_category_id', 'category_id'),
+        Index('ix_products_section_id', 'section_id'),
+        Index('ix_products_selling_price', 'selling_price'),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
+# trigger e não coluna gerada: adicionar uma coluna STORED reescreveria products inteira sob ACCESS EXCLUSIVE
+# (a migração c94a6e3b7d15 cria o mesmo trigger e preenche as linhas existentes em lotes)
+PRODUCT_SEARCH_VECTOR_FUNCTION = DDL("""
+    CREATE OR REPLACE FUNCTION products_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('portuguese', coalesce(NEW.name, '')), 'A') ||
+            setweight(to_tsvector('portuguese', coalesce(NEW.description, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+""")
+PRODUCT_SEARCH_VECTOR_TRIGGER = DDL("""
+    CREATE TRIGGER products_search_vector_update
+    BEFORE INSERT OR UPDATE OF name, description ON products
+    FOR EACH ROW EXECUTE FUNCTION products_search_vector_update()
+""")
+event.listen(Product.__table__, "after_create", PRODUCT_SEARCH_VECTOR_FUNCTION)
+event.listen(Product.__table__, "after_create", PRODUCT_SEARCH_VECTOR_TRIGGER)
+
+class ProductStock(Base):
+    __tablename__ = "product_stock"
+
+    # saldo em tabela estreita: cada reserva reescreve só esta linha, e não a de products com o search_vector
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    on_hand = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        CheckConstraint('on_hand >= 0', name='check_on_hand_non_negative'),
+    )
+
+class InventoryMovement(Base):
+    __tablename__ = "inventory_movements"
+
+    # livro só de inserção: o on_hand de product_stock é sempre a soma de quantity por produto
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(20), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    # sem FK: o movimento continua no livro depois que o pedido é excluído
+    order_id = Column(Integer, nullable=True)
+    note = Column(String(200), nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        CheckConstraint('quantity <> 0', name='check_movement_quantity_not_zero'),
+        CheckConstraint("kind IN ('sale', 'return', 'restock', 'adjustment')", name='check_movement_kind'),
+        Index('ix_inventory_movements_product_id', 'product_id', postgresql_include=['quantity']),
+    )
 
 class Order(Base):
     __tablename__ = "orders"
@@ -62,6 +152,9 @@ class Order(Base):
     status = Column(String(50), nullable=False, default="pending")
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # desnormalizados: gravados pelo repositório junto com os itens, evitam somar order_products na leitura
+    total_amount = Column(Float, nullable=False, default=0, server_default="0")
+    item_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     client = relationship("Client", back_populates="orders")
     products = relationship(
@@ -71,6 +164,14 @@ class Order(Base):
         passive_deletes=True,
     )
 
+    __table_args__ = (
+        Index('ix_orders_created_at_id', 'created_at', 'id'),
+        Index('ix_orders_client_id_created_at', 'client_id', 'created_at'),
+        Index('ix_orders_status_created_at', 'status', 'created_at'),
+        Index('ix_orders_total_amount_id', 'total_amount', 'id'),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
 class OrderProduct(Base):
     __tablename__ = "order_products"
 
@@ -82,14 +183,47 @@ class OrderProduct(Base):
 
     __table_args__ = (
         CheckConstraint('quantity > 0', name='check_quantity_positive'),
+        Index('ix_order_products_order_id_product_id', 'order_id', 'product_id'),
+        Index('ix_order_products_product_id', 'product_id'),
     )
 
     order = relationship("Order", back_populates="products")
     product = relationship("Product")
 
+class SalesEvent(Base):
+    __tablename__ = "sales_events"
+
+    # fila de variações de venda gravada junto com o pedido (positiva ao criar, negativa ao remover itens);
+    # o job de rollup consome e apaga as linhas, somando-as em daily_sales_rollup
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    day = Column(Date, nullable=False)
+    client_id = Column(Integer, nullable=False)
+    category_id = Column(Integer, nullable=False)
+    section_id = Column(Integer, nullable=False)
+    quantity = Column(Integer, nullable=False)
+    revenue = Column(Float, nullable=False)
+    lines = Column(Integer, nullable=False)
+
+class DailySalesRollup(Base):
+    __tablename__ = "daily_sales_rollup"
+
+    # uma linha por dia e valor da dimensão ('total' usa key_id 0); a PK atende o filtro por dimensão e período
+    dimension = Column(String(10), primary_key=True)
+    day = Column(Date, primary_key=True)
+    key_id = Column(Integer, primary_key=True)
+    quantity = Column(BigInteger, nullable=False)
+    revenue = Column(Float, nullable=False)
+    lines = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        CheckConstraint("dimension IN ('total', 'client', 'category', 'section')", name='check_rollup_dimension'),
+    )
+
 class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     is_admin = Column(Boolean, default=False)
+    # incrementado quando as permissões mudam: tokens emitidos com versão anterior deixam de valer
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
@@ -0,0 +1,172 @@
+from datetime import date
+from typing import Iterable, Optional, List
+
+from sqlalchemy import Date, cast, func, insert, literal, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import Client, DailySalesRollup, Order, OrderProduct, Product, ProductCategory, ProductSection, SalesEvent
+
+GROUP_BY_DIMENSIONS = {"day": "total", "client": "client", "category": "category", "section": "section"}
+
+GROUP_BY_NAMES = {"client": Client, "category": ProductCategory, "section": ProductSection}
+
+ROLLUP_BATCH_SIZE = 10000
+
+# chave do pg_try_advisory_xact_lock: só uma transação consome a fila de cada vez
+ROLLUP_LOCK_KEY = 7_301_017
+
+
+def sales_events_statement(order_ids: Iterable[int], sign: int):
+    """Grava na fila a venda dos itens atuais dos pedidos (sign=1) ou o estorno deles (sign=-1).
+
+    Um INSERT ... SELECT agrupado por dia, cliente, categoria e seção: uma linha por grupo, não por item.
+    """
+    day = cast(Order.created_at, Date)
+    rows = (
+        select(
+            day,
+            Order.client_id,
+            Product.category_id,
+            Product.section_id,
+            literal(sign) * func.sum(OrderProduct.quantity),
+            literal(sign) * func.sum(OrderProduct.quantity * OrderProduct.unit_price),
+            literal(sign) * func.count(),
+        )
+        .select_from(OrderProduct)
+        .join(Order, Order.id == OrderProduct.order_id)
+        .join(Product, Product.id == OrderProduct.product_id)
+        .where(OrderProduct.order_id.in_(list(order_ids)))
+        .group_by(day, Order.client_id, Product.category_id, Product.section_id)
+    )
+    return insert(SalesEvent).from_select(
+        ["day", "client_id", "category_id", "section_id", "quantity", "revenue", "lines"], rows
+    )
+
+
+_TRY_LOCK_SQL = text("SELECT pg_try_advisory_xact_lock(:key)")
+
+# DELETE ... RETURNING consome a fila: uma linha de um pedido que ainda não commitou não é vista agora
+# e entra na próxima rodada (um watermark por id pularia ids commitados fora de ordem)
+_FOLD_EVENTS_SQL = text("""
+    WITH drained AS (
+        DELETE FROM sales_events
+        WHERE id IN (SELECT id FROM sales_events ORDER BY id LIMIT :batch_size FOR UPDATE SKIP LOCKED)
+        RETURNING day, client_id, category_id, section_id, quantity, revenue, lines
+    ), expanded AS (
+        SELECT 'total' AS dimension, day, 0 AS key_id, quantity, revenue, lines FROM drained
+        UNION ALL SELECT 'client', day, client_id, quantity, revenue, lines FROM drained
+        UNION ALL SELECT 'category', day, category_id, quantity, revenue, lines FROM drained
+        UNION ALL SELECT 'section', day, section_id, quantity, revenue, lines FROM drained
+    ), folded AS (
+        INSERT INTO daily_sales_rollup AS rollup (dimension, day, key_id, quantity, revenue, lines)
+        SELECT dimension, day, key_id, SUM(quantity), SUM(revenue), SUM(lines)
+        FROM expanded
+        GROUP BY dimension, day, key_id
+        ORDER BY dimension, day, key_id
+        ON CONFLICT (dimension, day, key_id) DO UPDATE SET
+            quantity = rollup.quantity + EXCLUDED.quantity,
+            revenue = rollup.revenue + EXCLUDED.revenue,
+            lines = rollup.lines + EXCLUDED.lines
+    )
+    SELECT count(*) FROM drained
+""")
+
+REBUILD_ROLLUP_SQL = text("""
+    INSERT INTO daily_sales_rollup (dimension, day, key_id, quantity, revenue, lines)
+    SELECT
+        CASE
+            WHEN GROUPING(o.client_id) = 0 THEN 'client'
+            WHEN GROUPING(p.category_id) = 0 THEN 'category'
+            WHEN GROUPING(p.section_id) = 0 THEN 'section'
+            ELSE 'total'
+        END,
+        CAST(o.created_at AS date),
+        COALESCE(o.client_id, p.category_id, p.section_id, 0),
+        SUM(op.quantity), SUM(op.quantity * op.unit_price), COUNT(*)
+    FROM order_products op
+    JOIN orders o ON o.id = op.order_id
+    JOIN products p ON p.id = op.product_id
+    GROUP BY GROUPING SETS (
+        (CAST(o.created_at AS date)),
+        (CAST(o.created_at AS date), o.client_id),
+        (CAST(o.created_at AS date), p.category_id),
+        (CAST(o.created_at AS date), p.section_id)
+    )
+""")
+
+
+def _sales_statement(group_by: str, date_from: Optional[date], date_to: Optional[date]):
+    rollup = DailySalesRollup
+    totals = (
+        func.sum(rollup.quantity).label("quantity"),
+        func.sum(rollup.revenue).label("revenue"),
+        func.sum(rollup.lines).label("lines"),
+    )
+
+    if group_by == "day":
+        query = select(rollup.day, *totals).group_by(rollup.day).order_by(rollup.day)
+    else:
+        named = GROUP_BY_NAMES[group_by]
+        query = (
+            select(rollup.key_id.label("id"), named.name, *totals)
+            .outerjoin(named, named.id == rollup.key_id)
+            .group_by(rollup.key_id, named.name)
+            .order_by(func.sum(rollup.revenue).desc(), rollup.key_id)
+        )
+
+    query = query.where(rollup.dimension == GROUP_BY_DIMENSIONS[group_by])
+    if date_from is not None:
+        query = query.where(rollup.day >= date_from)
+    if date_to is not None:
+        query = query.where(rollup.day <= date_to)
+    # grupos cujos pedidos foram todos removidos ficam zerados no rollup
+    return query.having(func.sum(rollup.lines) != 0)
+
+
+class AnalyticsRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def catch_up(self, batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+        """Soma no rollup até `batch_size` variações pendentes; retorna 0 se outra transação já está consumindo."""
+        if not self.session.execute(_TRY_LOCK_SQL, {"key": ROLLUP_LOCK_KEY}).scalar():
+            self.session.rollback()
+            return 0
+        folded = self.session.execute(_FOLD_EVENTS_SQL, {"batch_size": batch_size}).scalar()
+        self.session.commit()
+        return folded
+
+    def rebuild(self) -> None:
+        """Recalcula o rollup inteiro a partir dos pedidos, descartando a fila pendente.
+
+        REPEATABLE READ: a fila apagada e os pedidos somados vêm do mesmo snapshot; pedidos
+        commitados depois dele deixam suas variações na fila para a próxima rodada.
+        """
+        self.session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        self.session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ROLLUP_LOCK_KEY})
+        self.session.execute(text("DELETE FROM sales_events"))
+        self.session.execute(text("DELETE FROM daily_sales_rollup"))
+        self.session.execute(REBUILD_ROLLUP_SQL)
+        self.session.commit()
+
+    def sales(self, group_by: str, date_from: Optional[date] = None, date_to: Optional[date] = None) -> List[dict]:
+        result = self.session.execute(_sales_statement(group_by, date_from, date_to))
+        return [dict(row) for row in result.mappings()]
+
+
+class AsyncAnalyticsRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def catch_up(self, batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+        if not (await self.session.execute(_TRY_LOCK_SQL, {"key": ROLLUP_LOCK_KEY})).scalar():
+            await self.session.rollback()
+            return 0
+        folded = (await self.session.execute(_FOLD_EVENTS_SQL, {"batch_size": batch_size})).scalar()
+        await self.session.commit()
+        return folded
+
+    async def sales(self, group_by: str, date_from: Optional[date] = None, date_to: Optional[date] = None) -> List[dict]:
+        result = await self.session.execute(_sales_statement(group_by, date_from, date_to))
+        return [dict(row) for row in result.mappings()]
@@ -1,5 +1,7 @@
 from typing import TypeVar, Generic, Type, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 ModelType = TypeVar("ModelType")
 
@@ -39,3 +41,42 @@ class BaseRepository(Generic[ModelType]):
 
         self.session.delete(db_obj)
         self.session.commit()
+
+
+class AsyncBaseRepository(Generic[ModelType]):
+    def __init__(self, model: Type[ModelType], session: AsyncSession):
+        self.model = model
+        self.session = session
+
+    async def get(self, id: int) -> Optional[ModelType]:
+        return await self.session.get(self.model, id)
+
+    async def get_all(self) -> list[ModelType]:
+        result = await self.session.scalars(select(self.model))
+        return list(result.all())
+
+    async def create(self, obj_in: ModelType) -> ModelType:
+        self.session.add(obj_in)
+        await self.session.commit()
+        await self.session.refresh(obj_in)
+        return obj_in
+
+    async def update(self, id: int, obj_in: dict) -> Optional[ModelType]:
+        db_obj = await self.session.get(self.model, id)
+        if not db_obj:
+            return None
+
+        for key, value in obj_in.items():
+            setattr(db_obj, key, value)
+
+        await self.session.commit()
+        await self.session.refresh(db_obj)
+        return db_obj
+
+    async def delete(self, id: int) -> None:
+        db_obj = await self.session.get(self.model, id)
+        if not db_obj:
+            return
+
+        await self.session.delete(db_obj)
+        await self.session.commit()
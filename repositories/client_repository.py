@@ -1,8 +1,40 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, select, func, literal
 from typing import Optional, List
 from models.models import Client
-from repositories.base import BaseRepository
+from repositories.base import BaseRepository, AsyncBaseRepository
+from utils.pagination import paginate
+
+# chave de ordenação da listagem, usada tanto pelo offset quanto pelo cursor
+LIST_ORDER = (Client.name, Client.id)
+
+
+def _list_statement(name: Optional[str], email: Optional[str], skip: int, limit: int, cursor: Optional[str] = None):
+    query = select(Client)
+
+    if name:
+        query = query.filter(Client.name.ilike(f"%{name}%"))
+    if email:
+        query = query.filter(Client.email.ilike(f"%{email}%"))
+
+    return paginate(query, LIST_ORDER, skip, limit, cursor)
+
+
+def _search_statement(term: str, skip: int, limit: int):
+    # `<%` (word similarity do pg_trgm) tolera erros de digitação e usa os índices GIN de trigramas
+    rank = func.greatest(func.word_similarity(term, Client.name), func.word_similarity(term, Client.email))
+    return (
+        select(Client)
+        .where(or_(literal(term).op("<%")(Client.name), literal(term).op("<%")(Client.email)))
+        .order_by(rank.desc(), Client.id)
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+def _version_statement(id: int):
+    return select(Client.id, Client.updated_at).where(Client.id == id)
 
 
 class ClientRepository(BaseRepository[Client]):
@@ -16,16 +48,16 @@ class ClientRepository(BaseRepository[Client]):
         name: Optional[str] = None,
         email: Optional[str] = None,
         skip: int = 0,
-        limit: int = 10
+        limit: int = 10,
+        cursor: Optional[str] = None
     ) -> List[Client]:
-        query = self.session.query(self.model)
+        return self.session.scalars(_list_statement(name, email, skip, limit, cursor)).all()
 
-        if name:
-            query = query.filter(self.model.name.ilike(f"%{name}%"))
-        if email:
-            query = query.filter(self.model.email.ilike(f"%{email}%"))
+    def search(self, term: str, skip: int = 0, limit: int = 10) -> List[Client]:
+        return self.session.scalars(_search_statement(term, skip, limit)).all()
 
-        return query.offset(skip).limit(limit).all()
+    def get_version(self, id: int) -> Optional[tuple]:
+        return self.session.execute(_version_statement(id)).first()
 
     def get_by_email(self, email: str) -> Optional[Client]:
         return (
@@ -41,3 +73,32 @@ class ClientRepository(BaseRepository[Client]):
             .first()
         )
 
+
+class AsyncClientRepository(AsyncBaseRepository[Client]):
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(Client, session)
+
+    async def list(
+        self,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 10,
+        cursor: Optional[str] = None
+    ) -> List[Client]:
+        result = await self.session.scalars(_list_statement(name, email, skip, limit, cursor))
+        return list(result.all())
+
+    async def search(self, term: str, skip: int = 0, limit: int = 10) -> List[Client]:
+        result = await self.session.scalars(_search_statement(term, skip, limit))
+        return list(result.all())
+
+    async def get_version(self, id: int) -> Optional[tuple]:
+        return (await self.session.execute(_version_statement(id))).first()
+
+    async def get_by_email(self, email: str) -> Optional[Client]:
+        return await self.session.scalar(select(Client).where(Client.email == email))
+
+    async def get_by_cpf(self, cpf: str) -> Optional[Client]:
+        return await self.session.scalar(select(Client).where(Client.cpf == cpf))
@@ -0,0 +1,68 @@
+from typing import Optional
+
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import InventoryMovement, ProductStock
+from repositories.base import BaseRepository, AsyncBaseRepository
+from repositories.stock import (
+    InsufficientStock,
+    adjust_stock_statement,
+    check_adjusted,
+    lock_range_statement,
+    movement,
+    product_id_bounds_statement,
+    reconcile_range_statement,
+    stock_statement,
+)
+
+
+class InventoryRepository(BaseRepository[InventoryMovement]):
+    def __init__(self, session: Session):
+        super().__init__(InventoryMovement, session)
+
+    def get_stock(self, product_id: int) -> Optional[ProductStock]:
+        # leitura por chave primária do contador: não depende do tamanho do histórico
+        return self.session.scalar(stock_statement(product_id).execution_options(populate_existing=True))
+
+    def record(self, product_id: int, kind: str, quantity: int, note: Optional[str] = None) -> Optional[ProductStock]:
+        entries = [movement(product_id, quantity, kind, note=note)]
+        try:
+            check_adjusted(entries, self.session.scalars(adjust_stock_statement(entries)).all())
+        except InsufficientStock:
+            self.session.rollback()
+            raise
+        self.session.commit()
+        return self.get_stock(product_id)
+
+    def product_id_bounds(self) -> tuple[Optional[int], Optional[int]]:
+        return tuple(self.session.execute(product_id_bounds_statement()).one())
+
+    def reconcile_range(self, first_id: int, last_id: int) -> list:
+        """Reconstrói os saldos da faixa a partir do livro; retorna [(product_id, on_hand)] corrigidos.
+
+        Os saldos da faixa são travados antes da soma: nenhum pedido grava movimento desses produtos
+        entre a leitura do livro e a correção do contador.
+        """
+        self.session.execute(lock_range_statement(first_id, last_id)).all()
+        fixed = [tuple(row) for row in self.session.execute(reconcile_range_statement(first_id, last_id))]
+        self.session.commit()
+        return fixed
+
+
+class AsyncInventoryRepository(AsyncBaseRepository[InventoryMovement]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(InventoryMovement, session)
+
+    async def get_stock(self, product_id: int) -> Optional[ProductStock]:
+        return await self.session.scalar(stock_statement(product_id).execution_options(populate_existing=True))
+
+    async def record(self, product_id: int, kind: str, quantity: int, note: Optional[str] = None) -> Optional[ProductStock]:
+        entries = [movement(product_id, quantity, kind, note=note)]
+        try:
+            check_adjusted(entries, (await self.session.scalars(adjust_stock_statement(entries))).all())
+        except InsufficientStock:
+            await self.session.rollback()
+            raise
+        await self.session.commit()
+        return await self.get_stock(product_id)
@@ -0,0 +1,38 @@
+from enum import Enum
+from typing import FrozenSet, Union
+
+
+class LoadProfile(str, Enum):
+    """Quais relacionamentos um repositório carrega junto com a entidade.
+
+    - MINIMAL: só as colunas da própria tabela
+    - DETAIL: relacionamentos many-to-one exibidos no schema de leitura (categoria/seção, cliente)
+    - WITH_LINES: DETAIL + itens do pedido com seus produtos
+    """
+    MINIMAL = "minimal"
+    DETAIL = "detail"
+    WITH_LINES = "with_lines"
+
+
+# um perfil fixo ou o conjunto de caminhos pedido em `?expand=` (ex.: {"client", "products", "products.product"})
+Loading = Union[LoadProfile, FrozenSet[str]]
+
+
+def profile_options(profiles: dict, profile: LoadProfile) -> tuple:
+    try:
+        return profiles[profile]
+    except KeyError:
+        raise ValueError(f"Perfil de carregamento não suportado: {profile.value}")
+
+
+def expansion_options(expansions: dict, paths: FrozenSet[str]) -> tuple:
+    unknown = sorted(path for path in paths if path not in expansions)
+    if unknown:
+        raise ValueError(f"Expansão não suportada: {', '.join(unknown)}")
+    return tuple(option for path in sorted(paths) for option in expansions[path])
+
+
+def load_options(profiles: dict, expansions: dict, loading: Loading) -> tuple:
+    if isinstance(loading, LoadProfile):
+        return profile_options(profiles, loading)
+    return expansion_options(expansions, loading)
@@ -1,11 +1,250 @@
+from sqlalchemy import func, insert
 from sqlalchemy.future import select
-from sqlalchemy.orm import joinedload, Session
+from sqlalchemy.orm import joinedload, selectinload, Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from typing import Optional, List
+from datetime import datetime
+from typing import Iterator, Optional, List
 
-from models.models import Order, Product, ProductCategory, ProductSection, OrderProduct
+from models.models import Client, Order, Product, ProductCategory, ProductSection, OrderProduct
 from app.network.schemas.order import OrderCreate, OrderUpdate
-from repositories.base import BaseRepository
+from repositories.analytics_repository import sales_events_statement
+from repositories.base import BaseRepository, AsyncBaseRepository
+from repositories.loading import LoadProfile, Loading, load_options
+from repositories.stock import InsufficientStock, adjust_stock_statement, check_adjusted, order_movements
+from utils.pagination import paginate
+
+# chave de ordenação da listagem, usada tanto pelo offset quanto pelo cursor
+LIST_ORDER = (Order.created_at, Order.id)
+
+# ordenações aceitas pela listagem; o prefixo "-" inverte a chave inteira
+SORT_ORDERS = {
+    "created_at": LIST_ORDER,
+    "total_amount": (Order.total_amount, Order.id),
+}
+
+
+def sort_order(sort: str) -> tuple:
+    """Resolve o parâmetro `sort` em (chave de ordenação, descendente)."""
+    descending = sort.startswith("-")
+    key = sort.lstrip("-")
+    if key not in SORT_ORDERS:
+        raise ValueError(f"Ordenação inválida: {sort}")
+    return SORT_ORDERS[key], descending
+
+
+# itens e produtos em consultas separadas (selectin), cliente/categoria/seção no mesmo SELECT (many-to-one):
+# a página é hidratada com um número fixo de consultas, independente da quantidade de itens
+LOAD_PROFILES = {
+    LoadProfile.MINIMAL: (),
+    LoadProfile.DETAIL: (joinedload(Order.client),),
+    LoadProfile.WITH_LINES: (
+        joinedload(Order.client),
+        selectinload(Order.products)
+        .selectinload(OrderProduct.product)
+        .options(joinedload(Product.category), joinedload(Product.section)),
+    ),
+}
+
+# relacionamentos que `?expand=` pode pedir; um caminho aninhado refaz o carregamento dos pais, que o SQLAlchemy unifica
+EXPANSIONS = {
+    "client": (joinedload(Order.client),),
+    "products": (selectinload(Order.products),),
+    "products.product": (selectinload(Order.products).selectinload(OrderProduct.product),),
+    "products.product.category": (
+        selectinload(Order.products).selectinload(OrderProduct.product).joinedload(Product.category),
+    ),
+    "products.product.section": (
+        selectinload(Order.products).selectinload(OrderProduct.product).joinedload(Product.section),
+    ),
+}
+
+
+def _list_statement(
+    category_name: Optional[str],
+    section_name: Optional[str],
+    price_min: Optional[float],
+    price_max: Optional[float],
+    available: Optional[bool],
+    skip: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    profile: Loading = LoadProfile.WITH_LINES,
+    total_min: Optional[float] = None,
+    total_max: Optional[float] = None,
+    sort: str = "created_at",
+):
+    # os filtros de produto viram um EXISTS sobre os itens: sem join não há linhas duplicadas,
+    # e o LIMIT/OFFSET se aplica a pedidos e não a itens
+    line_filters = []
+
+    if category_name:
+        line_filters.append(Product.category_id.in_(select(ProductCategory.id).where(ProductCategory.name == category_name)))
+
+    if section_name:
+        line_filters.append(Product.section_id.in_(select(ProductSection.id).where(ProductSection.name == section_name)))
+
+    if price_min is not None:
+        line_filters.append(Product.selling_price >= price_min)
+
+    if price_max is not None:
+        line_filters.append(Product.selling_price <= price_max)
+
+    if available is not None:
+        line_filters.append(Product.availability == available)
+
+    query = select(Order)
+    # total desnormalizado: "pedidos acima de X" é um range no índice, sem agregar os itens
+    if total_min is not None:
+        query = query.where(Order.total_amount >= total_min)
+    if total_max is not None:
+        query = query.where(Order.total_amount <= total_max)
+    if line_filters:
+        matching_lines = (
+            select(OrderProduct.id)
+            .join(OrderProduct.product)
+            .where(OrderProduct.order_id == Order.id, *line_filters)
+        )
+        query = query.where(matching_lines.exists())
+
+    order_by, descending = sort_order(sort)
+    return paginate(query, order_by, skip, limit, cursor, descending).options(*load_options(LOAD_PROFILES, EXPANSIONS, profile))
+
+
+def _get_statement(id: int, profile: Loading = LoadProfile.WITH_LINES):
+    return select(Order).options(*load_options(LOAD_PROFILES, EXPANSIONS, profile)).where(Order.id == id)
+
+
+def _version_statement(id: int):
+    """Versões de tudo que o OrderRead expõe: o pedido, o cliente e a mais recente entre produtos, categorias e seções dos itens.
+
+    Chaves primárias e o índice (order_id, product_id) dos itens; nenhum relacionamento é carregado.
+    """
+    product_version = (
+        select(func.max(func.greatest(Product.updated_at, ProductCategory.updated_at, ProductSection.updated_at)))
+        .join(OrderProduct, OrderProduct.product_id == Product.id)
+        .join(ProductCategory, ProductCategory.id == Product.category_id)
+        .join(ProductSection, ProductSection.id == Product.section_id)
+        .where(OrderProduct.order_id == Order.id)
+        .scalar_subquery()
+    )
+    return (
+        select(Order.id, Order.updated_at, Client.updated_at, product_version)
+        .join(Client, Client.id == Order.client_id)
+        .where(Order.id == id)
+    )
+
+
+def _order_totals(lines) -> dict:
+    return {
+        "total_amount": sum(line.quantity * line.unit_price for line in lines),
+        "item_count": sum(line.quantity for line in lines),
+    }
+
+
+def _new_order(obj_in: OrderCreate) -> Order:
+    new_order = Order(
+        client_id=obj_in.client_id,
+        status=obj_in.status or "pending",
+        **_order_totals(obj_in.products),
+    )
+
+    new_order.products = [
+        OrderProduct(
+            product_id=product.product_id,
+            quantity=product.quantity,
+            unit_price=product.unit_price
+        )
+        for product in obj_in.products
+    ]
+    return new_order
+
+
+def _bulk_lookup_statements(items: List[OrderCreate]):
+    client_ids = {item.client_id for item in items}
+    product_ids = {line.product_id for item in items for line in item.products}
+    return (
+        select(Client.id).where(Client.id.in_(client_ids)),
+        select(Product.id).where(Product.id.in_(product_ids)),
+    )
+
+
+def _validate_bulk(items: List[OrderCreate], client_ids: set, product_ids: set, results: list) -> list:
+    # pré-validação das FKs: os itens inválidos são reportados e não entram no INSERT em lote
+    valid = []
+    for index, item in enumerate(items):
+        if item.client_id not in client_ids:
+            results[index] = {"index": index, "error": f"Cliente {item.client_id} não encontrado"}
+            continue
+        missing = sorted({line.product_id for line in item.products} - product_ids)
+        if missing:
+            results[index] = {"index": index, "error": f"Produtos não encontrados: {missing}"}
+            continue
+        valid.append((index, item))
+    return valid
+
+
+def _bulk_order_rows(valid: list) -> list:
+    return [
+        {"client_id": item.client_id, "status": item.status or "pending", **_order_totals(item.products)}
+        for _, item in valid
+    ]
+
+
+def _bulk_movements(valid: list, order_ids: list) -> list:
+    return [
+        entry
+        for (_, item), order_id in zip(valid, order_ids)
+        for entry in order_movements(order_id, reserved=item.products)
+    ]
+
+
+def _bulk_line_rows(valid: list, order_ids: list) -> list:
+    return [
+        {"order_id": order_id, "product_id": line.product_id, "quantity": line.quantity, "unit_price": line.unit_price}
+        for (_, item), order_id in zip(valid, order_ids)
+        for line in item.products
+    ]
+
+
+# colunas achatadas da exportação: uma linha por item, com os dados do pedido e do cliente repetidos
+EXPORT_COLUMNS = (
+    Order.id.label("order_id"),
+    Order.status.label("order_status"),
+    Order.created_at.label("order_created_at"),
+    Order.updated_at.label("order_updated_at"),
+    Client.id.label("client_id"),
+    Client.name.label("client_name"),
+    Client.email.label("client_email"),
+    Client.cpf.label("client_cpf"),
+    OrderProduct.id.label("line_id"),
+    Product.id.label("product_id"),
+    Product.name.label("product_name"),
+    Product.bar_code.label("product_bar_code"),
+    OrderProduct.quantity.label("quantity"),
+    OrderProduct.unit_price.label("unit_price"),
+)
+
+EXPORT_BATCH_SIZE = 2000
+
+
+def _export_statement(date_from: Optional[datetime], date_to: Optional[datetime]):
+    query = (
+        select(*EXPORT_COLUMNS)
+        .select_from(Order)
+        .join(Client, Client.id == Order.client_id)
+        .outerjoin(OrderProduct, OrderProduct.order_id == Order.id)
+        .outerjoin(Product, Product.id == OrderProduct.product_id)
+    )
+    if date_from is not None:
+        query = query.where(Order.created_at >= date_from)
+    if date_to is not None:
+        query = query.where(Order.created_at < date_to)
+    return query.order_by(Order.created_at, Order.id, OrderProduct.id)
+
+
+# INSERT ... VALUES (...), (...) RETURNING id, na mesma ordem dos parâmetros
+_insert_orders_statement = insert(Order).returning(Order.id, sort_by_parameter_order=True)
 
 class OrderRepository(BaseRepository[Order]):
     def __init__(self, session: Session):
@@ -21,62 +260,95 @@ class OrderRepository(BaseRepository[Order]):
         available: Optional[bool] = None,
         skip: int = 0,
         limit: int = 10,
+        cursor: Optional[str] = None,
+        profile: Loading = LoadProfile.WITH_LINES,
+        total_min: Optional[float] = None,
+        total_max: Optional[float] = None,
+        sort: str = "created_at",
     ) -> List[Order]:
-        query = self.session.query(Order).join(Order.products).join(OrderProduct.product)
-
-        if category_name:
-            query = query.join(Product.category).filter(ProductCategory.name == category_name)
-
-        if section_name:
-            query = query.join(Product.section).filter(ProductSection.name == section_name)
-
-        if price_min is not None:
-            query = query.filter(Product.price >= price_min)
-
-        if price_max is not None:
-            query = query.filter(Product.price <= price_max)
-
-        if available is not None:
-            query = query.filter(Product.available == available)
-
-
-        query = query.options(
-                joinedload(Order.products).joinedload(OrderProduct.product),
-                joinedload(Order.client)  
+        stmt = _list_statement(
+            category_name, section_name, price_min, price_max, available, skip, limit, cursor, profile,
+            total_min, total_max, sort,
         )
+        return self.session.scalars(stmt).all()
 
-        return query.offset(skip).limit(limit).all()
 
+    def get(self, id: int, profile: Loading = LoadProfile.WITH_LINES) -> Optional[Order]:
+        # populate_existing recarrega os relacionamentos de objetos que já estão na sessão
+        stmt = _get_statement(id, profile).execution_options(populate_existing=True)
+        return self.session.scalars(stmt).first()
 
-    def get(self, id: int) -> Optional[Order]:
-        return self.session.query(Order).options(
-            joinedload(Order.products).joinedload(OrderProduct.product),
-            joinedload(Order.client)  
-        ).filter(Order.id == id).first()
+    def get_version(self, id: int) -> Optional[tuple]:
+        return self.session.execute(_version_statement(id)).first()
 
     def create(self, obj_in: OrderCreate) -> Order:
-        new_order = Order(
-            client_id=obj_in.client_id,
-            status=obj_in.status or "pending",
-        )
-
-        new_order.products = [
-            OrderProduct(
-                product_id=product.product_id,
-                quantity=product.quantity,
-                unit_price=product.unit_price
-            )
-            for product in obj_in.products
-        ]
+        new_order = _new_order(obj_in)
 
         self.session.add(new_order)
         try:
+            self.session.flush()
+            self.session.execute(sales_events_statement([new_order.id], 1))
+            # a reserva vem por último: o lock das linhas de estoque dura só até o commit
+            self._adjust_stock(order_movements(new_order.id, reserved=obj_in.products))
             self.session.commit()
-            self.session.refresh(new_order)
-            return new_order
         except IntegrityError as e:
             self.session.rollback()
             raise ValueError("Erro ao criar pedido: " + str(e.orig))
+        except InsufficientStock:
+            self.session.rollback()
+            raise
+        # o refresh só recarrega as colunas: a resposta leria cliente, itens e produtos um a um
+        return self.get(new_order.id)
+
+    def _adjust_stock(self, movements: list) -> None:
+        stmt = adjust_stock_statement(movements)
+        if stmt is not None:
+            check_adjusted(movements, self.session.scalars(stmt).all())
+
+    def create_bulk(self, items: List[OrderCreate]) -> list:
+        results = [None] * len(items)
+        clients_stmt, products_stmt = _bulk_lookup_statements(items)
+        client_ids = set(self.session.scalars(clients_stmt))
+        product_ids = set(self.session.scalars(products_stmt))
+        valid = _validate_bulk(items, client_ids, product_ids, results)
+
+        try:
+            self._insert_bulk(valid, results)
+            self.session.commit()
+        except (IntegrityError, InsufficientStock):
+            # algo escapou da pré-validação (ex.: produto removido no meio do lote, estoque esgotado):
+            # refaz item a item com savepoints para isolar só os que falharem
+            self.session.rollback()
+            for index, item in valid:
+                try:
+                    with self.session.begin_nested():
+                        self._insert_bulk([(index, item)], results)
+                except IntegrityError as e:
+                    results[index] = {"index": index, "error": "Erro ao criar pedido: " + str(e.orig)}
+                except InsufficientStock as e:
+                    results[index] = {"index": index, "error": str(e)}
+            self.session.commit()
+        return results
+
+    def _insert_bulk(self, valid: list, results: list) -> None:
+        if not valid:
+            return
+        order_ids = self.session.scalars(_insert_orders_statement, _bulk_order_rows(valid)).all()
+        lines = _bulk_line_rows(valid, order_ids)
+        if lines:
+            self.session.execute(insert(OrderProduct), lines)
+        self.session.execute(sales_events_statement(order_ids, 1))
+        self._adjust_stock(_bulk_movements(valid, order_ids))
+        for (index, _), order_id in zip(valid, order_ids):
+            results[index] = {"index": index, "id": order_id}
+
+    def export_rows(self, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None) -> Iterator[dict]:
+        # stream_results abre um cursor no servidor: só EXPORT_BATCH_SIZE linhas ficam em memória por vez
+        result = self.session.execute(
+            _export_statement(date_from, date_to).execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+        )
+        for row in result.mappings():
+            yield row
 
     def update_order(self, id: int, obj_in: OrderUpdate) -> Optional[Order]:
         db_obj = self.get(id)
@@ -85,6 +357,12 @@ class OrderRepository(BaseRepository[Order]):
 
         data = obj_in.model_dump(exclude_unset=True)
         products_data = data.pop("products", None)
+        movements = []
+
+        # itens ou cliente mudando: estorna a venda como está no banco e grava a nova depois do flush
+        affects_sales = products_data is not None or "client_id" in data
+        if affects_sales:
+            self.session.execute(sales_events_statement([id], -1))
 
         # Atualiza os campos simples (client_id, status etc.)
         for key, value in data.items():
@@ -92,6 +370,14 @@ class OrderRepository(BaseRepository[Order]):
                 setattr(db_obj, key, value)
 
         if products_data is not None:
+            # devolve o que os itens antigos reservaram e reserva os novos, em um único UPDATE
+            movements = order_movements(db_obj.id, released=db_obj.products, reserved=obj_in.products)
+
+            for key, value in _order_totals(obj_in.products).items():
+                setattr(db_obj, key, value)
+            # o ETag do pedido vem de updated_at: trocar itens com o mesmo total também precisa mudá-lo
+            db_obj.updated_at = func.now()
+
             # Remove os produtos antigos da ordem
             db_obj.products.clear()
 
@@ -103,8 +389,173 @@ class OrderRepository(BaseRepository[Order]):
                 prod_data["order_id"] = db_obj.id  # agora db_obj.id não é None
                 db_obj.products.append(OrderProduct(**prod_data))
 
-        # Comita e atualiza o objeto
+        try:
+            self.session.flush()
+            if affects_sales:
+                self.session.execute(sales_events_statement([id], 1))
+            self._adjust_stock(movements)
+        except InsufficientStock:
+            self.session.rollback()
+            raise
+
+        # Comita e recarrega com os itens e produtos, como o get
+        self.session.commit()
+        return self.get(id)
+
+    def delete(self, id: int) -> None:
+        db_obj = self.get(id, LoadProfile.MINIMAL)
+        if not db_obj:
+            return
+
+        movements = order_movements(db_obj.id, released=db_obj.products)
+        self.session.execute(sales_events_statement([id], -1))
+        self.session.delete(db_obj)
+        self.session.flush()
+        self._adjust_stock(movements)
         self.session.commit()
-        self.session.refresh(db_obj)
-        return db_obj
 
+
+class AsyncOrderRepository(AsyncBaseRepository[Order]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(Order, session)
+
+    async def list(
+        self,
+        category_name: Optional[str] = None,
+        section_name: Optional[str] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+        available: Optional[bool] = None,
+        skip: int = 0,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        profile: Loading = LoadProfile.WITH_LINES,
+        total_min: Optional[float] = None,
+        total_max: Optional[float] = None,
+        sort: str = "created_at",
+    ) -> List[Order]:
+        stmt = _list_statement(
+            category_name, section_name, price_min, price_max, available, skip, limit, cursor, profile,
+            total_min, total_max, sort,
+        )
+        result = await self.session.scalars(stmt)
+        return list(result.all())
+
+    async def get(self, id: int, profile: Loading = LoadProfile.WITH_LINES) -> Optional[Order]:
+        # populate_existing recarrega os relacionamentos de objetos que já estão na sessão
+        stmt = _get_statement(id, profile).execution_options(populate_existing=True)
+        return await self.session.scalar(stmt)
+
+    async def get_version(self, id: int) -> Optional[tuple]:
+        return (await self.session.execute(_version_statement(id))).first()
+
+    async def create(self, obj_in: OrderCreate) -> Order:
+        new_order = _new_order(obj_in)
+
+        self.session.add(new_order)
+        try:
+            await self.session.flush()
+            await self.session.execute(sales_events_statement([new_order.id], 1))
+            await self._adjust_stock(order_movements(new_order.id, reserved=obj_in.products))
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise ValueError("Erro ao criar pedido: " + str(e.orig))
+        except InsufficientStock:
+            await self.session.rollback()
+            raise
+        return await self.get(new_order.id)
+
+    async def _adjust_stock(self, movements: list) -> None:
+        stmt = adjust_stock_statement(movements)
+        if stmt is not None:
+            check_adjusted(movements, (await self.session.scalars(stmt)).all())
+
+    async def create_bulk(self, items: List[OrderCreate]) -> list:
+        results = [None] * len(items)
+        clients_stmt, products_stmt = _bulk_lookup_statements(items)
+        client_ids = set(await self.session.scalars(clients_stmt))
+        product_ids = set(await self.session.scalars(products_stmt))
+        valid = _validate_bulk(items, client_ids, product_ids, results)
+
+        try:
+            await self._insert_bulk(valid, results)
+            await self.session.commit()
+        except (IntegrityError, InsufficientStock):
+            await self.session.rollback()
+            for index, item in valid:
+                try:
+                    async with self.session.begin_nested():
+                        await self._insert_bulk([(index, item)], results)
+                except IntegrityError as e:
+                    results[index] = {"index": index, "error": "Erro ao criar pedido: " + str(e.orig)}
+                except InsufficientStock as e:
+                    results[index] = {"index": index, "error": str(e)}
+            await self.session.commit()
+        return results
+
+    async def _insert_bulk(self, valid: list, results: list) -> None:
+        if not valid:
+            return
+        order_ids = (await self.session.scalars(_insert_orders_statement, _bulk_order_rows(valid))).all()
+        lines = _bulk_line_rows(valid, order_ids)
+        if lines:
+            await self.session.execute(insert(OrderProduct), lines)
+        await self.session.execute(sales_events_statement(order_ids, 1))
+        await self._adjust_stock(_bulk_movements(valid, order_ids))
+        for (index, _), order_id in zip(valid, order_ids):
+            results[index] = {"index": index, "id": order_id}
+
+    async def update_order(self, id: int, obj_in: OrderUpdate) -> Optional[Order]:
+        db_obj = await self.get(id)
+        if not db_obj:
+            return None
+
+        data = obj_in.model_dump(exclude_unset=True)
+        products_data = data.pop("products", None)
+        movements = []
+
+        affects_sales = products_data is not None or "client_id" in data
+        if affects_sales:
+            await self.session.execute(sales_events_statement([id], -1))
+
+        for key, value in data.items():
+            if hasattr(db_obj, key):
+                setattr(db_obj, key, value)
+
+        if products_data is not None:
+            movements = order_movements(db_obj.id, released=db_obj.products, reserved=obj_in.products)
+            for key, value in _order_totals(obj_in.products).items():
+                setattr(db_obj, key, value)
+            db_obj.updated_at = func.now()
+            db_obj.products.clear()
+            await self.session.flush()
+
+            for prod_data in products_data:
+                prod_data["order_id"] = db_obj.id
+                db_obj.products.append(OrderProduct(**prod_data))
+
+        try:
+            await self.session.flush()
+            if affects_sales:
+                await self.session.execute(sales_events_statement([id], 1))
+            await self._adjust_stock(movements)
+        except InsufficientStock:
+            await self.session.rollback()
+            raise
+
+        await self.session.commit()
+        return await self.get(id)
+
+    async def delete(self, id: int) -> None:
+        # carrega os itens antes: em modo async não existe lazy load para o cascade
+        db_obj = await self.get(id)
+        if not db_obj:
+            return
+
+        movements = order_movements(db_obj.id, released=db_obj.products)
+        await self.session.execute(sales_events_statement([id], -1))
+        await self.session.delete(db_obj)
+        await self.session.flush()
+        await self._adjust_stock(movements)
+        await self.session.commit()
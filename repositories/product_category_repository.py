@@ -1,6 +1,15 @@
+from typing import Optional
+
 from repositories.base import BaseRepository
 from models.models import ProductCategory
+from utils.cache import product_cache
 
 class ProductCategoryRepository(BaseRepository[ProductCategory]):
     def __init__(self, session):
         super().__init__(ProductCategory, session)
+
+    def update(self, id: int, obj_in: dict) -> Optional[ProductCategory]:
+        updated = super().update(id, obj_in)
+        # o nome vai embutido no ProductRead em cache; não há como saber quais produtos apontam para cá
+        product_cache.clear()
+        return updated
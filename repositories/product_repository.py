@@ -1,9 +1,146 @@
-from sqlalchemy.orm import Session, joinedload 
+import csv
+import io
+
+from sqlalchemy import select, func, literal_column, literal, union_all, text
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from typing import Optional, List
-from models.models import Product, ProductCategory, ProductSection  # Ajuste conforme seu modelo de produto
+from models.models import InventoryMovement, Product, ProductCategory, ProductSection, ProductStock  # Ajuste conforme seu modelo de produto
 from app.network.schemas.product import ProductCreate
-from repositories.base import BaseRepository
+from repositories.base import BaseRepository, AsyncBaseRepository
+from repositories.loading import LoadProfile, Loading, load_options
+from utils.cache import product_cache
+from utils.pagination import paginate
+
+# chave de ordenação da listagem, usada tanto pelo offset quanto pelo cursor
+LIST_ORDER = (Product.name, Product.id)
+
+# categoria e seção são many-to-one: vêm no mesmo SELECT, sem carregar os outros produtos delas
+LOAD_PROFILES = {
+    LoadProfile.MINIMAL: (),
+    LoadProfile.DETAIL: (joinedload(Product.category), joinedload(Product.section)),
+}
+
+# relacionamentos que `?expand=` pode pedir, cada um com o seu carregamento
+EXPANSIONS = {
+    "category": (joinedload(Product.category),),
+    "section": (joinedload(Product.section),),
+}
+
+
+def _list_statement(
+    category_name: Optional[str],
+    section_name: Optional[str],
+    price_min: Optional[float],
+    price_max: Optional[float],
+    available: Optional[bool],
+    skip: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    profile: Loading = LoadProfile.DETAIL,
+):
+    query = select(Product).options(*load_options(LOAD_PROFILES, EXPANSIONS, profile))
+
+    # os nomes são resolvidos em subconsultas (índice de trigramas) e filtram pelas FKs de products
+    if category_name:
+        category_ids = select(ProductCategory.id).where(ProductCategory.name.ilike(f"%{category_name}%"))
+        query = query.filter(Product.category_id.in_(category_ids))
+    if section_name:
+        section_ids = select(ProductSection.id).where(ProductSection.name.ilike(f"%{section_name}%"))
+        query = query.filter(Product.section_id.in_(section_ids))
+    if price_min is not None:
+        query = query.filter(Product.selling_price >= price_min)
+    if price_max is not None:
+        query = query.filter(Product.selling_price <= price_max)
+    if available is not None:
+        query = query.filter(Product.availability == available)
+
+    return paginate(query, LIST_ORDER, skip, limit, cursor)
+
+
+def _get_statement(id: int, profile: Loading = LoadProfile.DETAIL):
+    return select(Product).options(*load_options(LOAD_PROFILES, EXPANSIONS, profile)).where(Product.id == id)
+
+
+def _version_statement(id: int):
+    # o ProductRead embute os nomes da categoria e da seção: as versões delas também entram no ETag.
+    # Só chaves primárias, sem carregar relacionamentos
+    return (
+        select(Product.id, Product.updated_at, ProductCategory.updated_at, ProductSection.updated_at)
+        .join(ProductCategory, ProductCategory.id == Product.category_id)
+        .join(ProductSection, ProductSection.id == Product.section_id)
+        .where(Product.id == id)
+    )
+
+
+def _search_statement(term: str, skip: int, limit: int, profile: Loading = LoadProfile.DETAIL):
+    # websearch_to_tsquery aceita a sintaxe livre do usuário ("leite -desnatado", "arroz integral")
+    query = func.websearch_to_tsquery(literal_column("'portuguese'::regconfig"), term)
+    rank = func.ts_rank_cd(Product.search_vector, query)
+    return (
+        select(Product)
+        .options(*load_options(LOAD_PROFILES, EXPANSIONS, profile))
+        .where(Product.search_vector.op("@@")(query))
+        .order_by(rank.desc(), Product.id)
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+# colunas carregadas pelo COPY na tabela de staging da importação em lote
+IMPORT_COLUMNS = (
+    "name", "category_id", "section_id", "cost", "selling_price", "availability",
+    "description", "bar_code", "initial_stock", "expiration_date", "images",
+)
+
+_CREATE_IMPORT_STAGING = text("""
+    CREATE TEMP TABLE IF NOT EXISTS products_import_staging (
+        name varchar(60), category_id integer, section_id integer, cost double precision,
+        selling_price double precision, availability boolean, description varchar(200),
+        bar_code varchar(100), initial_stock integer, expiration_date timestamp, images varchar
+    ) ON COMMIT DROP
+""")
+
+# produtos novos ganham o saldo inicial em product_stock e a entrada correspondente no livro;
+# nos atualizados o saldo não muda
+_UPSERT_FROM_STAGING = text(f"""
+    WITH upserted AS (
+        INSERT INTO products ({", ".join(IMPORT_COLUMNS)})
+        SELECT {", ".join(IMPORT_COLUMNS)} FROM products_import_staging
+        ON CONFLICT (bar_code) DO UPDATE SET
+            {", ".join(f"{column} = EXCLUDED.{column}" for column in IMPORT_COLUMNS if column != "bar_code")},
+            updated_at = now()
+        RETURNING id, initial_stock, (xmax = 0) AS inserted
+    ), stocked AS (
+        INSERT INTO product_stock (product_id, on_hand)
+        SELECT id, initial_stock FROM upserted WHERE inserted
+    ), recorded AS (
+        INSERT INTO inventory_movements (product_id, kind, quantity, note)
+        SELECT id, 'restock', initial_stock, 'estoque inicial' FROM upserted WHERE inserted AND initial_stock <> 0
+    )
+    SELECT id, inserted FROM upserted
+""")
+
+
+def _new_product(obj_in: ProductCreate) -> Product:
+    # o saldo nasce igual ao estoque inicial, registrado no livro como a primeira entrada (como no upsert_copy)
+    movements = [InventoryMovement(kind="restock", quantity=obj_in.initial_stock, note="estoque inicial")] if obj_in.initial_stock else []
+    return Product(
+        name=obj_in.name,
+        category_id=obj_in.category_id,
+        section_id=obj_in.section_id,
+        cost=obj_in.cost,
+        selling_price=obj_in.selling_price,
+        availability=obj_in.availability,
+        description=obj_in.description,
+        bar_code=obj_in.bar_code,
+        initial_stock=obj_in.initial_stock,
+        expiration_date=obj_in.expiration_date,
+        images=obj_in.images,
+        stock_level=ProductStock(on_hand=obj_in.initial_stock),
+        movements=movements,
+    )
 
 class ProductRepository(BaseRepository[Product]):
     
@@ -18,30 +155,21 @@ class ProductRepository(BaseRepository[Product]):
         price_max: Optional[float] = None,
         available: Optional[bool] = None,
         skip: int = 0,
-        limit: int = 10
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        profile: Loading = LoadProfile.DETAIL,
     ) -> List[Product]:
-        query = self.session.query(self.model)
-
-        if category_name:
-            query = query.join(ProductCategory).filter(ProductCategory.name.ilike(f"%{category_name}%"))
-        if section_name:
-            query = query.join(ProductSection).filter(ProductSection.name.ilike(f"%{section_name}%"))
-        if price_min is not None:
-            query = query.filter(self.model.selling_price >= price_min)
-        if price_max is not None:
-            query = query.filter(self.model.selling_price <= price_max)
-        if available is not None:
-            query = query.filter(self.model.availability == available)
+        stmt = _list_statement(category_name, section_name, price_min, price_max, available, skip, limit, cursor, profile)
+        return self.session.scalars(stmt).all()
 
-        query = query
+    def search(self, term: str, skip: int = 0, limit: int = 10, profile: Loading = LoadProfile.DETAIL) -> List[Product]:
+        return self.session.scalars(_search_statement(term, skip, limit, profile)).all()
 
-        return query.offset(skip).limit(limit).all()
+    def get(self, id: int, profile: Loading = LoadProfile.DETAIL) -> Optional[Product]:
+        return self.session.scalars(_get_statement(id, profile)).first()
 
-    def get(self, id: int) -> Optional[Product]:
-        return self.session.query(Product).options(
-                joinedload(Product.category).joinedload(ProductCategory.products),
-                joinedload(Product.section).joinedload(ProductSection.products),
-        ).filter(Product.id == id).first()
+    def get_version(self, id: int) -> Optional[tuple]:
+        return self.session.execute(_version_statement(id)).first()
 
 
     def create(self, obj_in: ProductCreate) -> Product:
@@ -51,25 +179,14 @@ class ProductRepository(BaseRepository[Product]):
         if not category or not section:
             raise ValueError("Categoria ou Seção não encontrados")
 
-        new_product = Product(
-            name=obj_in.name,
-            category_id=category.id,
-            section_id=section.id,
-            cost=obj_in.cost,
-            selling_price=obj_in.selling_price,
-            availability=obj_in.availability,
-            description=obj_in.description,
-            bar_code=obj_in.bar_code,
-            initial_stock=obj_in.initial_stock,
-            expiration_date=obj_in.expiration_date,
-            images=obj_in.images
-        )
+        new_product = _new_product(obj_in)
 
         self.session.add(new_product)
 
         try:
             self.session.commit()
             self.session.refresh(new_product)
+            product_cache.invalidate(new_product.id)
             return new_product
         except IntegrityError as e:
             self.session.rollback()
@@ -97,5 +214,137 @@ class ProductRepository(BaseRepository[Product]):
 
         self.session.commit()
         self.session.refresh(db_obj)
+        product_cache.invalidate(id)
+        return db_obj
+
+    def delete(self, id: int) -> None:
+        super().delete(id)
+        product_cache.invalidate(id)
+
+
+    def resolve_category_section_ids(self, category_names: set, section_names: set) -> tuple[dict, dict]:
+        """Resolve nomes de categorias e seções em uma única consulta."""
+        stmt = union_all(
+            select(literal("category").label("kind"), ProductCategory.name, ProductCategory.id)
+            .where(ProductCategory.name.in_(category_names)),
+            select(literal("section").label("kind"), ProductSection.name, ProductSection.id)
+            .where(ProductSection.name.in_(section_names)),
+        )
+        categories, sections = {}, {}
+        for kind, name, id in self.session.execute(stmt):
+            (categories if kind == "category" else sections)[name] = id
+        return categories, sections
+
+    def upsert_copy(self, products: List[ProductCreate]) -> tuple[int, int]:
+        """Carrega os produtos via COPY em uma tabela temporária e faz upsert por bar_code.
+
+        Retorna (inseridos, atualizados). Usa o COPY do psycopg2, por isso só existe no repositório síncrono.
+        """
+        # o ON CONFLICT não aceita o mesmo bar_code duas vezes no mesmo comando: fica a última ocorrência
+        by_bar_code = {}
+        rows = []
+        for product in products:
+            if product.bar_code:
+                by_bar_code[product.bar_code] = product
+            else:
+                rows.append(product)
+        rows.extend(by_bar_code.values())
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for product in rows:
+            writer.writerow([getattr(product, column) for column in IMPORT_COLUMNS])
+        buffer.seek(0)
+
+        connection = self.session.connection()
+        connection.execute(_CREATE_IMPORT_STAGING)
+        with connection.connection.driver_connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY products_import_staging ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        upserted = connection.execute(_UPSERT_FROM_STAGING).all()
+        self.session.commit()
+        product_cache.invalidate(*(row.id for row in upserted))
+
+        inserted = sum(1 for row in upserted if row.inserted)
+        return inserted, len(upserted) - inserted
+
+
+class AsyncProductRepository(AsyncBaseRepository[Product]):
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(Product, session)
+
+    async def list(
+        self,
+        category_name: Optional[str] = None,
+        section_name: Optional[str] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+        available: Optional[bool] = None,
+        skip: int = 0,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        profile: Loading = LoadProfile.DETAIL,
+    ) -> List[Product]:
+        stmt = _list_statement(category_name, section_name, price_min, price_max, available, skip, limit, cursor, profile)
+        result = await self.session.scalars(stmt)
+        return list(result.all())
+
+    async def search(self, term: str, skip: int = 0, limit: int = 10, profile: Loading = LoadProfile.DETAIL) -> List[Product]:
+        result = await self.session.scalars(_search_statement(term, skip, limit, profile))
+        return list(result.all())
+
+    async def get(self, id: int, profile: Loading = LoadProfile.DETAIL) -> Optional[Product]:
+        return await self.session.scalar(_get_statement(id, profile))
+
+    async def get_version(self, id: int) -> Optional[tuple]:
+        return (await self.session.execute(_version_statement(id))).first()
+
+    async def create(self, obj_in: ProductCreate) -> Product:
+        category = await self.session.get(ProductCategory, obj_in.category_id)
+        section = await self.session.get(ProductSection, obj_in.section_id)
+
+        if not category or not section:
+            raise ValueError("Categoria ou Seção não encontrados")
+
+        new_product = _new_product(obj_in)
+        self.session.add(new_product)
+
+        try:
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise ValueError(f"Erro ao criar produto: {str(e.orig)}")
+
+        await self.session.refresh(new_product, ["category", "section"])
+        product_cache.invalidate(new_product.id)
+        return new_product
+
+    async def update(self, id: int, obj_in: dict) -> Optional[Product]:
+        db_obj = await self.get(id)
+        if not db_obj:
+            return None
+
+        if "category_name" in obj_in:
+            category = await self.session.scalar(select(ProductCategory).where(ProductCategory.name == obj_in["category_name"]))
+            if category:
+                db_obj.category_id = category.id
+
+        if "section_name" in obj_in:
+            section = await self.session.scalar(select(ProductSection).where(ProductSection.name == obj_in["section_name"]))
+            if section:
+                db_obj.section_id = section.id
+
+        for key, value in obj_in.items():
+            setattr(db_obj, key, value)
+
+        await self.session.commit()
+        await self.session.refresh(db_obj, ["category", "section"])
+        product_cache.invalidate(id)
         return db_obj
 
+    async def delete(self, id: int) -> None:
+        await super().delete(id)
+        product_cache.invalidate(id)
@@ -1,6 +1,15 @@
+from typing import Optional
+
 from repositories.base import BaseRepository
 from models.models import ProductSection
+from utils.cache import product_cache
 
 class ProductSectionRepository(BaseRepository[ProductSection]):
     def __init__(self, session):
         super().__init__(ProductSection, session)
+
+    def update(self, id: int, obj_in: dict) -> Optional[ProductSection]:
+        updated = super().update(id, obj_in)
+        # o ProductRead em cache embute o nome da seção; limpa tudo, como na categoria
+        product_cache.clear()
+        return updated
@@ -0,0 +1,147 @@
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from sqlalchemy import Integer, String, cast, column, func, insert, select, update, values
+
+from models.models import InventoryMovement, ProductStock
+
+SALE = "sale"
+RETURN = "return"
+RESTOCK = "restock"
+ADJUSTMENT = "adjustment"
+
+
+class InsufficientStock(ValueError):
+    def __init__(self, product_ids: Iterable[int]):
+        self.product_ids = sorted(product_ids)
+        super().__init__(f"Estoque insuficiente para os produtos: {self.product_ids}")
+
+
+def movement(product_id: int, quantity: int, kind: str, order_id: Optional[int] = None, note: Optional[str] = None) -> dict:
+    return {"product_id": product_id, "order_id": order_id, "kind": kind, "quantity": quantity, "note": note}
+
+
+def order_movements(order_id: int, released: Iterable = (), reserved: Iterable = ()) -> list:
+    """Movimentos de um pedido, um por produto: itens devolvidos somam (return), reservados subtraem (sale)."""
+    deltas = defaultdict(int)
+    for line in released:
+        deltas[line.product_id] += line.quantity
+    for line in reserved:
+        deltas[line.product_id] -= line.quantity
+    return [
+        movement(product_id, delta, SALE if delta < 0 else RETURN, order_id)
+        for product_id, delta in sorted(deltas.items())
+        if delta
+    ]
+
+
+def _net_deltas(movements: list) -> dict:
+    deltas = defaultdict(int)
+    for item in movements:
+        deltas[item["product_id"]] += item["quantity"]
+    return {product_id: delta for product_id, delta in deltas.items() if delta}
+
+
+def adjust_stock_statement(movements: list):
+    """Um único comando que grava os movimentos no livro e aplica o saldo em product_stock.
+
+    As linhas de saldo são travadas antes em ordem de product_id (CTE com FOR NO KEY UPDATE): dois
+    pedidos com os mesmos produtos sempre disputam os locks na mesma ordem e não entram em deadlock.
+    O UPDATE só altera produtos cujo saldo não fica negativo e só esses recebem movimentos; o comando
+    retorna os product_id gravados e `check_adjusted` acusa os que ficaram de fora.
+    """
+    deltas = _net_deltas(movements)
+    if not deltas:
+        return None
+
+    product_ids = sorted(deltas)
+    requested = values(
+        column("product_id", Integer), column("delta", Integer), name="requested"
+    ).data([(product_id, deltas[product_id]) for product_id in product_ids])
+    locked = (
+        select(ProductStock.product_id)
+        .where(ProductStock.product_id.in_(product_ids))
+        .order_by(ProductStock.product_id)
+        .with_for_update(key_share=True)
+        .cte("locked")
+    )
+    adjusted = (
+        update(ProductStock)
+        .where(
+            ProductStock.product_id == requested.c.product_id,
+            ProductStock.product_id == locked.c.product_id,
+            ProductStock.on_hand + requested.c.delta >= 0,
+        )
+        .values(on_hand=ProductStock.on_hand + requested.c.delta)
+        .returning(ProductStock.product_id)
+        .cte("adjusted")
+    )
+    recorded = values(
+        column("product_id", Integer),
+        column("order_id", Integer),
+        column("kind", String),
+        column("quantity", Integer),
+        column("note", String),
+        name="recorded",
+    ).data([
+        (item["product_id"], item["order_id"], item["kind"], item["quantity"], item["note"])
+        for item in movements
+        if item["product_id"] in deltas
+    ])
+    # o cast evita que uma coluna só com NULL no VALUES vire text
+    rows = select(
+        recorded.c.product_id,
+        cast(recorded.c.order_id, Integer),
+        recorded.c.kind,
+        recorded.c.quantity,
+        cast(recorded.c.note, String),
+    ).where(recorded.c.product_id.in_(select(adjusted.c.product_id)))
+    return (
+        insert(InventoryMovement)
+        .from_select(["product_id", "order_id", "kind", "quantity", "note"], rows)
+        .returning(InventoryMovement.product_id)
+    )
+
+
+def check_adjusted(movements: list, recorded_ids: Iterable[int]) -> None:
+    missing = set(_net_deltas(movements)) - set(recorded_ids)
+    if missing:
+        raise InsufficientStock(missing)
+
+
+def stock_statement(product_id: int):
+    return select(ProductStock).where(ProductStock.product_id == product_id)
+
+
+def product_id_bounds_statement():
+    return select(func.min(ProductStock.product_id), func.max(ProductStock.product_id))
+
+
+def lock_range_statement(first_id: int, last_id: int):
+    return (
+        select(ProductStock.product_id)
+        .where(ProductStock.product_id.between(first_id, last_id))
+        .order_by(ProductStock.product_id)
+        .with_for_update(key_share=True)
+    )
+
+
+def reconcile_range_statement(first_id: int, last_id: int):
+    """Recalcula o saldo da faixa como a soma do livro e corrige só as linhas divergentes."""
+    totals = (
+        select(
+            ProductStock.product_id,
+            func.coalesce(func.sum(InventoryMovement.quantity), 0).label("total"),
+        )
+        .outerjoin(InventoryMovement, InventoryMovement.product_id == ProductStock.product_id)
+        .where(ProductStock.product_id.between(first_id, last_id))
+        .group_by(ProductStock.product_id)
+        .subquery("totals")
+    )
+    return (
+        update(ProductStock)
+        .where(ProductStock.product_id == totals.c.product_id, ProductStock.on_hand != totals.c.total)
+        .values(on_hand=totals.c.total)
+        .returning(ProductStock.product_id, totals.c.total)
+        .execution_options(synchronize_session=False)
+    )
@@ -1,7 +1,8 @@
 from typing import Optional
-from repositories.base import BaseRepository
+from repositories.base import BaseRepository, AsyncBaseRepository
 from models.models import User
 from sqlalchemy.future import select
+from utils.cache import user_cache
 
 class UserRepository(BaseRepository[User]):
     def __init__(self, session):
@@ -13,3 +14,37 @@ class UserRepository(BaseRepository[User]):
         if result:
             return result[0]
         return None
+
+    def set_admin(self, id: int, is_admin: bool) -> Optional[User]:
+        user = self.get(id)
+        if not user:
+            return None
+        if user.is_admin != is_admin:
+            user.is_admin = is_admin
+            # revoga os tokens já emitidos, que carregam o is_admin antigo
+            user.token_version = User.token_version + 1
+            self.session.commit()
+            self.session.refresh(user)
+            user_cache.invalidate(id)
+        return user
+
+
+class AsyncUserRepository(AsyncBaseRepository[User]):
+    def __init__(self, session):
+        super().__init__(User, session)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        stmt = select(User).where(User.email == email)
+        return await self.session.scalar(stmt)
+
+    async def set_admin(self, id: int, is_admin: bool) -> Optional[User]:
+        user = await self.get(id)
+        if not user:
+            return None
+        if user.is_admin != is_admin:
+            user.is_admin = is_admin
+            user.token_version = User.token_version + 1
+            await self.session.commit()
+            await self.session.refresh(user)
+            user_cache.invalidate(id)
+        return user
@@ -0,0 +1,91 @@
+"""Roda EXPLAIN nas consultas dos repositórios e verifica se cada tabela é lida por índice.
+
+Uso:
+    python -m scripts.check_query_plans
+
+Com o banco vazio o planner sempre prefere Seq Scan, então o EXPLAIN roda com
+`enable_seqscan = off`: a verificação é se existe um índice capaz de atender a consulta.
+Sai com código 1 se alguma consulta ainda fizer Seq Scan nas tabelas esperadas.
+"""
+import json
+import sys
+from datetime import datetime
+
+from sqlalchemy import select, text
+
+from models.models import Order, OrderProduct, Client, Product
+from repositories import analytics_repository, client_repository, order_repository, product_repository, stock
+from utils.database import engine
+from utils.pagination import encode_cursor
+
+
+def repository_queries():
+    """(nome, statement, tabelas que devem ser lidas por índice)"""
+    return [
+        ("ClientRepository.list(name)", client_repository._list_statement("maria", None, 0, 10), {"clients"}),
+        ("ClientRepository.list(email)", client_repository._list_statement(None, "gmail", 0, 10), {"clients"}),
+        ("ClientRepository.list(cursor)", client_repository._list_statement(None, None, 0, 10, encode_cursor(client_repository.LIST_ORDER, ["Maria", 10])), {"clients"}),
+        ("ClientRepository.search", client_repository._search_statement("maria", 0, 10), {"clients"}),
+        ("ClientRepository.get_by_email", select(Client).where(Client.email == "a@b.com"), {"clients"}),
+        ("ClientRepository.get_by_cpf", select(Client).where(Client.cpf == "00000000000"), {"clients"}),
+        ("ProductRepository.list(category)", product_repository._list_statement("bebidas", None, None, None, None, 0, 10), {"products", "product_categories"}),
+        ("ProductRepository.list(section)", product_repository._list_statement(None, "frios", None, None, None, 0, 10), {"products", "product_sections"}),
+        ("ProductRepository.list(price)", product_repository._list_statement(None, None, 10, 20, None, 0, 10), {"products"}),
+        ("ProductRepository.list(cursor)", product_repository._list_statement(None, None, None, None, None, 0, 10, encode_cursor(product_repository.LIST_ORDER, ["Arroz", 10])), {"products"}),
+        ("ProductRepository.search", product_repository._search_statement("arroz", 0, 10), {"products"}),
+        ("ProductRepository.get", select(Product).where(Product.id == 1), {"products"}),
+        ("OrderRepository.list(filters)", order_repository._list_statement("bebidas", None, 10, 20, True, 0, 10), {"orders", "order_products", "products"}),
+        ("OrderRepository.list(cursor)", order_repository._list_statement(None, None, None, None, None, 0, 10, encode_cursor(order_repository.LIST_ORDER, [datetime(2025, 1, 1), 10])), {"orders"}),
+        ("OrderRepository.get", order_repository._get_statement(1), {"orders"}),
+        ("ClientRepository.get_version", client_repository._version_statement(1), {"clients"}),
+        ("ProductRepository.get_version", product_repository._version_statement(1), {"products"}),
+        ("OrderRepository.get_version", order_repository._version_statement(1), {"orders", "clients", "order_products", "products"}),
+        ("orders by client", select(Order).where(Order.client_id == 1).order_by(Order.created_at), {"orders"}),
+        ("orders by status", select(Order).where(Order.status == "pending").order_by(Order.created_at), {"orders"}),
+        ("order lines by order (selectinload)", select(OrderProduct).where(OrderProduct.order_id.in_([1, 2, 3])), {"order_products"}),
+        ("order lines by product", select(OrderProduct).where(OrderProduct.product_id == 1), {"order_products"}),
+        ("stock reservation", stock.adjust_stock_statement(stock.order_movements(1, released=[], reserved=[OrderProduct(product_id=1, quantity=2), OrderProduct(product_id=2, quantity=1)])), {"product_stock"}),
+        ("stock lookup", stock.stock_statement(1), {"product_stock"}),
+        ("analytics sales(day)", analytics_repository._sales_statement("day", datetime(2025, 1, 1).date(), None), {"daily_sales_rollup"}),
+        ("analytics sales(category)", analytics_repository._sales_statement("category", datetime(2025, 1, 1).date(), None), {"daily_sales_rollup"}),
+        ("stock reconciliation batch", stock.reconcile_range_statement(1, 1000), {"product_stock", "inventory_movements"}),
+    ]
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(connection, statement) -> dict:
+    compiled = statement.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+    result = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]["Plan"]
+
+
+def main() -> int:
+    failures = 0
+    with engine.connect() as connection:
+        with connection.begin():
+            connection.execute(text("SET LOCAL enable_seqscan = off"))
+            for name, statement, tables in repository_queries():
+                seq_scans = sorted({
+                    node["Relation Name"]
+                    for node in plan_nodes(explain(connection, statement))
+                    if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in tables
+                })
+                if seq_scans:
+                    failures += 1
+                    print(f"[FAIL] {name}: Seq Scan em {', '.join(seq_scans)}")
+                else:
+                    print(f"[ OK ] {name}")
+
+    print(f"\n{failures} consulta(s) sem índice")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
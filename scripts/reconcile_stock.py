@@ -0,0 +1,69 @@
+"""Reconstrói os saldos de product_stock a partir do livro inventory_movements.
+
+Uso:
+    python -m scripts.reconcile_stock [--batch-size 1000] [--workers 4]
+
+A faixa de product_id é dividida em lotes processados em paralelo, cada um na sua conexão e
+transação: trava os saldos do lote, soma os movimentos e corrige só os contadores divergentes.
+Os pedidos continuam sendo atendidos; só os produtos do lote em andamento esperam o commit.
+Imprime um resumo em JSON e sai com código 1 se algum lote falhar.
+"""
+import argparse
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from repositories.inventory_repository import InventoryRepository
+from utils.database import SessionLocal
+
+
+def batches(first_id: int, last_id: int, batch_size: int):
+    for start in range(first_id, last_id + 1, batch_size):
+        yield start, min(start + batch_size - 1, last_id)
+
+
+def reconcile_batch(first_id: int, last_id: int) -> list:
+    with SessionLocal() as session:
+        return InventoryRepository(session).reconcile_range(first_id, last_id)
+
+
+def reconcile(batch_size: int, workers: int) -> dict:
+    with SessionLocal() as session:
+        first_id, last_id = InventoryRepository(session).product_id_bounds()
+
+    summary = {"batches": 0, "fixed": [], "failed": []}
+    if first_id is None:
+        return summary
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(reconcile_batch, start, end): (start, end)
+            for start, end in batches(first_id, last_id, batch_size)
+        }
+        for future in as_completed(futures):
+            start, end = futures[future]
+            summary["batches"] += 1
+            try:
+                summary["fixed"].extend(
+                    {"product_id": product_id, "on_hand": on_hand} for product_id, on_hand in future.result()
+                )
+            except Exception as e:
+                summary["failed"].append({"first_id": start, "last_id": end, "error": str(e)})
+
+    summary["fixed"].sort(key=lambda item: item["product_id"])
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    summary = reconcile(args.batch_size, args.workers)
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""Soma no daily_sales_rollup as variações de venda pendentes em sales_events.
+
+Uso:
+    python -m scripts.rollup_sales [--batch-size 10000] [--rebuild]
+
+Sem argumentos, consome a fila em lotes até esvaziá-la (pode rodar em cron a cada minuto; duas
+execuções simultâneas não somam o mesmo evento). `--rebuild` recalcula o rollup inteiro a partir
+dos pedidos, útil depois de mudar a categoria/seção de produtos já vendidos.
+"""
+import argparse
+import json
+import sys
+
+from repositories.analytics_repository import AnalyticsRepository, ROLLUP_BATCH_SIZE
+from utils.database import SessionLocal
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=ROLLUP_BATCH_SIZE)
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        repo = AnalyticsRepository(session)
+        if args.rebuild:
+            repo.rebuild()
+            print(json.dumps({"rebuilt": True}))
+            return 0
+
+        folded = 0
+        while True:
+            batch = repo.catch_up(args.batch_size)
+            folded += batch
+            if batch < args.batch_size:
+                break
+
+    print(json.dumps({"folded": folded}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+from dotenv import load_dotenv
+load_dotenv(".env.test", override=True)
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture(scope="function")
+def db():
+    # importados aqui: utils.database conecta ao banco ao ser importado, e tests/services roda sem ele
+    from models.models import Base
+    from utils.database import engine
+
+    Base.metadata.drop_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    Base.metadata.create_all(bind=engine)
+
+    session = sessionmaker(bind=engine, autoflush=False, autocommit=False)()
+    try:
+        yield session
+    finally:
+        session.close()
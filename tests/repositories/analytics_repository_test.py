@@ -0,0 +1,81 @@
+import pytest
+
+from models.models import Client, ProductCategory, ProductSection
+from repositories.analytics_repository import AnalyticsRepository
+from repositories.order_repository import OrderRepository
+from repositories.product_repository import ProductRepository
+from app.network.schemas.order import OrderCreate, OrderProductCreate, OrderUpdate
+from app.network.schemas.product import ProductCreate
+
+
+@pytest.fixture
+def analytics_repo(db):
+    return AnalyticsRepository(session=db)
+
+
+@pytest.fixture
+def catalog(db):
+    clients = [Client(name=f"Cliente {i}", email=f"analytics{i}@example.com", cpf=f"{i}" * 11) for i in (1, 2)]
+    categories = [ProductCategory(name="Bebidas"), ProductCategory(name="Limpeza")]
+    section = ProductSection(name="Corredor Analytics")
+    db.add_all([*clients, *categories, section])
+    db.commit()
+    product_repo = ProductRepository(db)
+    products = [
+        product_repo.create(ProductCreate(name=f"Produto {category.name}", category_id=category.id, section_id=section.id, selling_price=10.0, initial_stock=100))
+        for category in categories
+    ]
+    return clients, categories, products
+
+
+def _order(client, *lines):
+    return OrderCreate(
+        client_id=client.id,
+        products=[OrderProductCreate(product_id=product.id, quantity=quantity, unit_price=price) for product, quantity, price in lines],
+    )
+
+
+def test_rollup_groups_by_day_category_and_client(db, analytics_repo, catalog):
+    (first, second), (drinks, cleaning), (drink, detergent) = catalog
+    orders = OrderRepository(session=db)
+    orders.create(_order(first, (drink, 2, 10.0), (detergent, 1, 5.0)))
+    orders.create(_order(second, (drink, 3, 10.0)))
+
+    assert analytics_repo.catch_up() == 3
+
+    [day] = analytics_repo.sales("day")
+    assert (day["quantity"], day["revenue"], day["lines"]) == (6, 55.0, 3)
+
+    by_category = {row["name"]: row["revenue"] for row in analytics_repo.sales("category")}
+    assert by_category == {"Bebidas": 50.0, "Limpeza": 5.0}
+
+    by_client = {row["id"]: row["quantity"] for row in analytics_repo.sales("client")}
+    assert by_client == {first.id: 3, second.id: 3}
+
+
+def test_rollup_follows_updates_and_deletes(db, analytics_repo, catalog):
+    (first, _), _, (drink, detergent) = catalog
+    orders = OrderRepository(session=db)
+    created = orders.create(_order(first, (drink, 2, 10.0)))
+    analytics_repo.catch_up()
+
+    orders.update_order(created.id, OrderUpdate(client_id=first.id, status="pending", products=_order(first, (detergent, 4, 5.0)).products))
+    analytics_repo.catch_up()
+    assert {row["name"]: row["quantity"] for row in analytics_repo.sales("category")} == {"Limpeza": 4}
+
+    orders.delete(created.id)
+    analytics_repo.catch_up()
+    assert analytics_repo.sales("day") == []
+
+
+def test_rebuild_matches_incremental_rollup(db, analytics_repo, catalog):
+    (first, second), _, (drink, detergent) = catalog
+    orders = OrderRepository(session=db)
+    orders.create(_order(first, (drink, 1, 10.0), (detergent, 2, 5.0)))
+    orders.create(_order(second, (detergent, 1, 5.0)))
+    analytics_repo.catch_up()
+    incremental = analytics_repo.sales("section")
+
+    analytics_repo.rebuild()
+
+    assert analytics_repo.sales("section") == incremental
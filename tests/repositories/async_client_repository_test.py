@@ -0,0 +1,44 @@
+from dotenv import load_dotenv
+load_dotenv(".env.test", override=True)
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from models.models import Client
+from repositories.client_repository import AsyncClientRepository
+from utils.config import Config
+
+@pytest_asyncio.fixture
+async def async_client_repo(db):
+    # engine próprio e sem pool: o `async_engine` da aplicação guardaria conexões asyncpg
+    # presas ao event loop do teste anterior
+    engine = create_async_engine(Config.async_url, poolclass=NullPool)
+    try:
+        async with async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)() as session:
+            yield AsyncClientRepository(session=session)
+    finally:
+        await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_async_client_create_and_get(async_client_repo):
+    created = await async_client_repo.create(Client(name="Async Client", email="async@client.com", cpf="123.456.789-01"))
+    assert created.id is not None
+
+    found = await async_client_repo.get(created.id)
+    assert found.email == "async@client.com"
+
+@pytest.mark.asyncio
+async def test_async_client_list_filters_by_name(async_client_repo):
+    await async_client_repo.create(Client(name="Maria Async", email="maria@async.com", cpf="111.222.333-44"))
+    await async_client_repo.create(Client(name="Joao Async", email="joao@async.com", cpf="555.666.777-88"))
+
+    clients = await async_client_repo.list(name="maria")
+    assert [c.email for c in clients] == ["maria@async.com"]
+
+@pytest.mark.asyncio
+async def test_async_client_get_by_cpf_and_delete(async_client_repo):
+    created = await async_client_repo.create(Client(name="Cpf Async", email="cpf@async.com", cpf="999.888.777-66"))
+    assert (await async_client_repo.get_by_cpf("999.888.777-66")).id == created.id
+
+    await async_client_repo.delete(created.id)
+    assert await async_client_repo.get(created.id) is None
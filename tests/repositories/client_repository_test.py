@@ -71,3 +71,12 @@ def test_client_delete(client_repo):
     client_repo.delete(created.id)
     deleted = client_repo.get(created.id)
     assert deleted is None
+
+def test_client_search_tolerates_typos_and_ranks(client_repo):
+    client_repo.create(Client(name="Mariana Souza", email="mariana@test.com", cpf="888.888.888-88"))
+    client_repo.create(Client(name="Mario Lima", email="mario@test.com", cpf="999.999.999-99"))
+    client_repo.create(Client(name="Pedro Alves", email="pedro@test.com", cpf="101.101.101-10"))
+
+    found = client_repo.search("Mariana Sousa")
+    assert found[0].email == "mariana@test.com"
+    assert all(c.email != "pedro@test.com" for c in found)
@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import func, select, update
+
+from models.models import Client, InventoryMovement, ProductCategory, ProductSection, ProductStock
+from repositories.inventory_repository import InventoryRepository
+from repositories.order_repository import OrderRepository
+from repositories.product_repository import ProductRepository
+from app.network.schemas.order import OrderCreate, OrderProductCreate
+from app.network.schemas.product import ProductCreate
+
+
+@pytest.fixture
+def inventory_repo(db):
+    return InventoryRepository(session=db)
+
+
+@pytest.fixture
+def stocked(db):
+    client = Client(name="Cliente Estoque", email="estoque@example.com", cpf="45645645645")
+    category = ProductCategory(name="Categoria Estoque")
+    section = ProductSection(name="Seção Estoque")
+    db.add_all([client, category, section])
+    db.commit()
+    product_repo = ProductRepository(db)
+    products = [
+        product_repo.create(ProductCreate(name=f"Produto {i}", category_id=category.id, section_id=section.id, selling_price=5.0, initial_stock=10))
+        for i in range(3)
+    ]
+    return client, products
+
+
+def _ledger(db, product_id):
+    return db.scalar(select(func.coalesce(func.sum(InventoryMovement.quantity), 0)).where(InventoryMovement.product_id == product_id))
+
+
+def test_product_creation_records_initial_stock(db, inventory_repo, stocked):
+    _, products = stocked
+
+    assert inventory_repo.get_stock(products[0].id).on_hand == 10
+    kinds = db.scalars(select(InventoryMovement.kind).where(InventoryMovement.product_id == products[0].id)).all()
+    assert kinds == ["restock"]
+
+
+def test_order_lifecycle_keeps_counter_equal_to_ledger(db, inventory_repo, stocked):
+    client, products = stocked
+    order_repo = OrderRepository(session=db)
+
+    order = order_repo.create(OrderCreate(
+        client_id=client.id,
+        products=[OrderProductCreate(product_id=products[0].id, quantity=3, unit_price=5.0)],
+    ))
+    order_repo.delete(order.id)
+    order_repo.create(OrderCreate(
+        client_id=client.id,
+        products=[OrderProductCreate(product_id=products[0].id, quantity=4, unit_price=5.0)],
+    ))
+
+    assert inventory_repo.get_stock(products[0].id).on_hand == 6
+    assert _ledger(db, products[0].id) == 6
+    kinds = db.scalars(
+        select(InventoryMovement.kind).where(InventoryMovement.product_id == products[0].id).order_by(InventoryMovement.id)
+    ).all()
+    assert kinds == ["restock", "sale", "return", "sale"]
+
+
+def test_record_restock_and_rejected_adjustment(db, inventory_repo, stocked):
+    _, products = stocked
+
+    assert inventory_repo.record(products[1].id, "restock", 5, "Nota 1").on_hand == 15
+    with pytest.raises(ValueError, match="Estoque insuficiente"):
+        inventory_repo.record(products[1].id, "adjustment", -16)
+
+    assert inventory_repo.get_stock(products[1].id).on_hand == 15
+    assert _ledger(db, products[1].id) == 15
+
+
+def test_reconcile_range_rebuilds_drifted_counters(db, inventory_repo, stocked):
+    _, products = stocked
+    db.execute(update(ProductStock).where(ProductStock.product_id == products[2].id).values(on_hand=99))
+    db.commit()
+
+    fixed = inventory_repo.reconcile_range(products[0].id, products[-1].id)
+
+    assert fixed == [(products[2].id, 10)]
+    assert inventory_repo.get_stock(products[2].id).on_hand == 10
@@ -0,0 +1,86 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from models.models import Client, Order, OrderProduct, Product, ProductCategory, ProductSection
+from repositories.loading import LoadProfile
+from repositories.order_repository import OrderRepository
+from repositories.product_repository import ProductRepository
+from utils.database import engine
+from dotenv import load_dotenv
+load_dotenv(".env.test", override=True)
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def catalog(db):
+    category = ProductCategory(name="Categoria Grande")
+    section = ProductSection(name="Seção Grande")
+    db.add_all([category, section])
+    db.flush()
+    products = [
+        Product(name=f"Produto {i}", category_id=category.id, section_id=section.id, selling_price=1.0, initial_stock=10)
+        for i in range(50)
+    ]
+    client = Client(name="Cliente Perfil", email="perfil@example.com", cpf="45645645645")
+    db.add_all(products + [client])
+    db.flush()
+    order = Order(client_id=client.id, products=[
+        OrderProduct(product_id=p.id, quantity=1, unit_price=1.0) for p in products[:10]
+    ])
+    db.add(order)
+    db.commit()
+    # ids lidos antes do expunge: depois do commit as instâncias estão expiradas e, soltas da sessão, não recarregam
+    ids = {"product_id": products[0].id, "order_id": order.id}
+    db.expunge_all()
+    return ids
+
+
+@pytest.mark.parametrize("profile, queries, loaded_rows", [
+    (LoadProfile.MINIMAL, 1, 1),
+    (LoadProfile.DETAIL, 1, 3),
+])
+def test_product_get_profiles(db, catalog, profile, queries, loaded_rows):
+    repo = ProductRepository(db)
+    with count_queries() as statements:
+        product = repo.get(catalog["product_id"], profile)
+
+    assert product is not None
+    assert len(statements) == queries
+    # produto (+ categoria e seção): os outros 49 produtos da categoria não são carregados
+    assert len(db.identity_map) == loaded_rows
+
+
+def test_product_get_rejects_unknown_profile(db, catalog):
+    with pytest.raises(ValueError):
+        ProductRepository(db).get(catalog["product_id"], LoadProfile.WITH_LINES)
+
+
+@pytest.mark.parametrize("profile, queries, loaded_rows", [
+    (LoadProfile.MINIMAL, 1, 1),
+    (LoadProfile.DETAIL, 1, 2),
+    # pedido + cliente, 10 itens, 10 produtos, categoria e seção
+    (LoadProfile.WITH_LINES, 3, 24),
+])
+def test_order_get_profiles(db, catalog, profile, queries, loaded_rows):
+    repo = OrderRepository(db)
+    with count_queries() as statements:
+        order = repo.get(catalog["order_id"], profile)
+
+    assert order is not None
+    assert len(statements) == queries
+    assert len(db.identity_map) == loaded_rows
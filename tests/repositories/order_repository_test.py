@@ -1,12 +1,17 @@
 import pytest
-from models.models import Product, ProductCategory, ProductSection
-from repositories.order_repository import OrderRepository
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy.orm import sessionmaker
+from utils.pagination import encode_cursor
+from models.models import Client, Product, ProductCategory, ProductSection
+from repositories.order_repository import OrderRepository, sort_order
 from repositories.client_repository import ClientRepository
 from repositories.product_repository import ProductRepository
 from repositories.product_category_repository import ProductCategoryRepository
 from repositories.product_section_repository import ProductSectionRepository
 from app.network.schemas.order import OrderCreate, OrderUpdate
+from app.network.schemas.order import OrderProductCreate as OrderLine
 from app.network.schemas.order_product import OrderProductCreate
+from app.network.schemas.product import ProductCreate
 from dotenv import load_dotenv
 load_dotenv(".env.test", override=True)
 
@@ -161,3 +166,212 @@ def test_order_delete(order_repo, client, product):
 
     deleted = order_repo.get(order_id)
     assert deleted is None
+
+
+def test_order_list_paginates_orders_not_lines(db, order_repo):
+    client = Client(name="Cliente Lista", email="lista@example.com", cpf="12312312312")
+    category = ProductCategory(name="Bebidas")
+    section = ProductSection(name="Corredor 1")
+    db.add_all([client, category, section])
+    db.commit()
+    product_repo = ProductRepository(db)
+    products = [
+        product_repo.create(ProductCreate(name=f"Produto {i}", category_id=category.id, section_id=section.id, selling_price=10.0 + i, initial_stock=100))
+        for i in range(5)
+    ]
+
+    for _ in range(3):
+        order_repo.create(OrderCreate(
+            client_id=client.id,
+            products=[OrderLine(product_id=p.id, quantity=1, unit_price=p.selling_price) for p in products],
+        ))
+
+    page = order_repo.list(limit=2)
+    assert len(page) == 2
+    assert len({o.id for o in page}) == 2
+    assert all(len(o.products) == 5 for o in page)
+
+    assert len(order_repo.list(category_name="Bebidas", price_min=14, available=True)) == 3
+    assert order_repo.list(price_min=100) == []
+
+
+def test_order_create_bulk_reports_invalid_items(db, order_repo):
+    client = Client(name="Cliente Bulk", email="bulk@example.com", cpf="32132132132")
+    category = ProductCategory(name="Categoria Bulk")
+    section = ProductSection(name="Seção Bulk")
+    db.add_all([client, category, section])
+    db.commit()
+    product = ProductRepository(db).create(ProductCreate(name="Produto Bulk", category_id=category.id, section_id=section.id, selling_price=10.0, initial_stock=100))
+
+    line = OrderLine(product_id=product.id, quantity=2, unit_price=10.0)
+    results = order_repo.create_bulk([
+        OrderCreate(client_id=client.id, products=[line]),
+        OrderCreate(client_id=99999, products=[line]),
+        OrderCreate(client_id=client.id, products=[OrderLine(product_id=99999, quantity=1, unit_price=1.0)]),
+        OrderCreate(client_id=client.id, status="paid", products=[line, line]),
+    ])
+
+    assert [r.get("id") is not None for r in results] == [True, False, False, True]
+    assert "Cliente" in results[1]["error"]
+    created = order_repo.get(results[3]["id"])
+    assert created.status == "paid"
+    assert len(created.products) == 2
+
+
+def _stock_product(db, name, initial_stock):
+    client = Client(name=f"Cliente {name}", email=f"{name.lower()}@example.com", cpf=name.rjust(11, "0")[:11])
+    category = ProductCategory(name=f"Categoria {name}")
+    section = ProductSection(name=f"Seção {name}")
+    db.add_all([client, category, section])
+    db.commit()
+    product = ProductRepository(db).create(ProductCreate(name=name, category_id=category.id, section_id=section.id, selling_price=10.0, initial_stock=initial_stock))
+    return client, product
+
+
+def _on_hand(db, product):
+    db.expire_all()
+    return product.stock_level.on_hand
+
+
+def test_order_create_reserves_stock(db, order_repo):
+    client, product = _stock_product(db, "Estoque", 5)
+
+    order_repo.create(OrderCreate(
+        client_id=client.id,
+        products=[
+            OrderLine(product_id=product.id, quantity=2, unit_price=10.0),
+            OrderLine(product_id=product.id, quantity=1, unit_price=10.0),
+        ],
+    ))
+
+    assert _on_hand(db, product) == 2
+
+
+def test_order_create_insufficient_stock_is_atomic(db, order_repo):
+    client, product = _stock_product(db, "Escasso", 3)
+    _, other = _stock_product(db, "Farto", 100)
+
+    with pytest.raises(ValueError, match="Estoque insuficiente"):
+        order_repo.create(OrderCreate(
+            client_id=client.id,
+            products=[
+                OrderLine(product_id=other.id, quantity=1, unit_price=10.0),
+                OrderLine(product_id=product.id, quantity=4, unit_price=10.0),
+            ],
+        ))
+
+    assert _on_hand(db, product) == 3
+    assert _on_hand(db, other) == 100
+    assert order_repo.get_all() == []
+
+
+def test_order_update_and_delete_release_stock(db, order_repo):
+    client, product = _stock_product(db, "Devolve", 10)
+    created = order_repo.create(OrderCreate(
+        client_id=client.id,
+        products=[OrderLine(product_id=product.id, quantity=4, unit_price=10.0)],
+    ))
+
+    order_repo.update_order(created.id, OrderUpdate(
+        client_id=client.id, status="pending",
+        products=[OrderLine(product_id=product.id, quantity=7, unit_price=10.0)],
+    ))
+    assert _on_hand(db, product) == 3
+
+    with pytest.raises(ValueError):
+        order_repo.update_order(created.id, OrderUpdate(
+            client_id=client.id, status="pending",
+            products=[OrderLine(product_id=product.id, quantity=11, unit_price=10.0)],
+        ))
+    assert _on_hand(db, product) == 3
+
+    order_repo.delete(created.id)
+    assert _on_hand(db, product) == 10
+
+
+def test_order_create_bulk_reports_items_without_stock(db, order_repo):
+    client, product = _stock_product(db, "Lote", 5)
+    line = OrderLine(product_id=product.id, quantity=2, unit_price=10.0)
+
+    results = order_repo.create_bulk([OrderCreate(client_id=client.id, products=[line]) for _ in range(3)])
+
+    assert [r.get("id") is not None for r in results] == [True, True, False]
+    assert "Estoque insuficiente" in results[2]["error"]
+    assert _on_hand(db, product) == 1
+
+
+def test_concurrent_orders_never_oversell(db):
+    client, product = _stock_product(db, "Disputado", 15)
+    make_session = sessionmaker(bind=db.get_bind(), autoflush=False)
+
+    def checkout(_):
+        with make_session() as session:
+            try:
+                OrderRepository(session).create(OrderCreate(
+                    client_id=client.id,
+                    products=[OrderLine(product_id=product.id, quantity=1, unit_price=10.0)],
+                ))
+                return True
+            except ValueError:
+                return False
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outcomes = list(executor.map(checkout, range(20)))
+
+    assert outcomes.count(True) == 15
+    assert _on_hand(db, product) == 0
+
+
+def test_order_totals_are_kept_on_write(db, order_repo):
+    client, product = _stock_product(db, "Totais", 50)
+
+    created = order_repo.create(OrderCreate(
+        client_id=client.id,
+        products=[OrderLine(product_id=product.id, quantity=2, unit_price=10.0), OrderLine(product_id=product.id, quantity=1, unit_price=4.5)],
+    ))
+    assert (created.total_amount, created.item_count) == (24.5, 3)
+
+    updated = order_repo.update_order(created.id, OrderUpdate(
+        client_id=client.id, status="pending",
+        products=[OrderLine(product_id=product.id, quantity=5, unit_price=3.0)],
+    ))
+    assert (updated.total_amount, updated.item_count) == (15.0, 5)
+
+
+
+def test_order_version_follows_lines_client_and_products(db, order_repo):
+    client, product = _stock_product(db, "Versao", 50)
+    created = order_repo.create(OrderCreate(
+        client_id=client.id, products=[OrderLine(product_id=product.id, quantity=1, unit_price=10.0)],
+    ))
+    versions = [order_repo.get_version(created.id)]
+
+    # mesmo total com outros itens: só o updated_at do pedido acusa a troca
+    order_repo.update_order(created.id, OrderUpdate(
+        client_id=client.id, status="pending",
+        products=[OrderLine(product_id=product.id, quantity=2, unit_price=5.0)],
+    ))
+    versions.append(order_repo.get_version(created.id))
+
+    ProductRepository(db).update(product.id, {"selling_price": 12.0})
+    versions.append(order_repo.get_version(created.id))
+
+    ClientRepository(db).update(client.id, {"name": "Cliente Versao Renomeado"})
+    versions.append(order_repo.get_version(created.id))
+
+    assert len(set(versions)) == 4
+    assert order_repo.get_version(created.id + 1000) is None
+
+
+def test_order_list_filters_and_sorts_by_total(db, order_repo):
+    client, product = _stock_product(db, "Ranking", 100)
+    for quantity in (1, 5, 3):
+        order_repo.create(OrderCreate(client_id=client.id, products=[OrderLine(product_id=product.id, quantity=quantity, unit_price=10.0)]))
+
+    assert [o.total_amount for o in order_repo.list(sort="-total_amount")] == [50.0, 30.0, 10.0]
+    assert [o.total_amount for o in order_repo.list(total_min=20, sort="total_amount")] == [30.0, 50.0]
+
+    first_page = order_repo.list(limit=2, sort="-total_amount")
+    order_by, descending = sort_order("-total_amount")
+    cursor = encode_cursor(order_by, [first_page[-1].total_amount, first_page[-1].id], descending)
+    assert [o.total_amount for o in order_repo.list(limit=2, cursor=cursor, sort="-total_amount")] == [10.0]
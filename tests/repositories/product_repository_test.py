@@ -199,3 +199,16 @@ def test_product_list_filters(product_repo, category, section):
     filtered_avail_false = product_repo.list(available=False)
     assert all(p.availability is False for p in filtered_avail_false)
     assert any(p.name == "Prod2" for p in filtered_avail_false)
+
+def test_product_search_uses_portuguese_stemming(product_repo, category, section):
+    products = [
+        ProductCreate(name="Arroz Integral", category_id=category.id, section_id=section.id, selling_price=10, initial_stock=2, description="Pacotes de arroz integral"),
+        ProductCreate(name="Feijão Preto", category_id=category.id, section_id=section.id, selling_price=8, initial_stock=2, description="Feijão selecionado"),
+        ProductCreate(name="Farinha", category_id=category.id, section_id=section.id, selling_price=5, initial_stock=2, description="Ideal para pacote de arroz doce"),
+    ]
+    for p in products:
+        product_repo.create(p)
+
+    found = product_repo.search("pacote arroz")
+    assert {p.name for p in found} == {"Arroz Integral", "Farinha"}
+    assert product_repo.search("arroz integral")[0].name == "Arroz Integral"
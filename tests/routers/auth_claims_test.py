@@ -0,0 +1,42 @@
+import pytest
+from fastapi import HTTPException
+
+from core.dependecies import admin_required, get_current_claims, get_current_user
+from core.security import create_access_token
+from utils.cache import user_cache
+
+
+@pytest.fixture
+def cached_user():
+    user_cache.clear()
+    user_cache.set(7, {"id": 7, "email": "admin@example.com", "hashed_password": "x", "is_admin": True, "token_version": 2})
+    yield
+    user_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_claims_come_from_token_and_cache(cached_user):
+    token = create_access_token({"sub": "7", "is_admin": True, "ver": 2})
+    claims = await get_current_claims(token)
+
+    assert claims.user_id == 7
+    assert (await admin_required(claims)).is_admin
+    user = await get_current_user(claims)
+    assert user.email == "admin@example.com"
+
+
+@pytest.mark.asyncio
+async def test_token_with_old_version_is_revoked(cached_user):
+    token = create_access_token({"sub": "7", "is_admin": True, "ver": 1})
+    with pytest.raises(HTTPException) as exc:
+        await get_current_claims(token)
+    assert exc.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_non_admin_claims_are_forbidden(cached_user):
+    token = create_access_token({"sub": "7", "is_admin": False, "ver": 2})
+    claims = await get_current_claims(token)
+    with pytest.raises(HTTPException) as exc:
+        await admin_required(claims)
+    assert exc.value.status_code == 403
@@ -0,0 +1,40 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from utils.database import async_engine, engine
+from utils.request_metrics import current_query_origin
+
+
+@contextmanager
+def max_queries(budget: int, engines=(engine, async_engine.sync_engine)):
+    """Falha se o bloco emitir mais de `budget` comandos SQL, listando cada um com o método de repositório de origem.
+
+    Escuta os engines diretamente (sync e async), então conta tudo o que a requisição executar,
+    inclusive lazy loads disparados na serialização da resposta.
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((current_query_origin(), statement))
+
+    for target in engines:
+        event.listen(target, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", record)
+
+    if len(statements) > budget:
+        listing = "\n".join(
+            f"  {number}. [{origin}] {' '.join(statement.split())}"
+            for number, (origin, statement) in enumerate(statements, 1)
+        )
+        pytest.fail(f"{len(statements)} consultas, orçamento de {budget}:\n{listing}", pytrace=False)
+
+
+@pytest.fixture
+def query_budget():
+    return max_queries
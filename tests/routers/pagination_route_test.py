@@ -0,0 +1,28 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from core.security import create_access_token
+from repositories import client_repository, order_repository, product_repository
+from utils.pagination import encode_cursor
+
+
+@pytest.fixture
+def api(db):
+    token = create_access_token({"sub": "1", "is_admin": False, "ver": 0})
+    return TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+
+# cursores adulterados que mantêm a chave de ordenação válida, mas com valores do tipo errado
+@pytest.mark.parametrize("path, cursor", [
+    ("/clients/", encode_cursor(client_repository.LIST_ORDER, ["Maria", "b"])),
+    ("/clients/", encode_cursor(client_repository.LIST_ORDER, ["Maria", 2 ** 40])),
+    ("/products/", encode_cursor(product_repository.LIST_ORDER, [10, 1])),
+    ("/orders/", encode_cursor(order_repository.LIST_ORDER, ["ontem", 1])),
+    ("/orders/", encode_cursor(order_repository.LIST_ORDER, [None, 1])),
+])
+def test_wrong_typed_cursor_is_bad_request(api, path, cursor):
+    response = api.get(path, params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor inválido"
@@ -0,0 +1,185 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.network.schemas.order import OrderCreate, OrderProductCreate
+from app.network.schemas.product import ProductCreate
+from core.security import create_access_token
+from models.models import Client, ProductCategory, ProductSection, SalesEvent
+from repositories.order_repository import OrderRepository
+from repositories.product_repository import ProductRepository
+from repositories.product_category_repository import ProductCategoryRepository
+from utils.cache import product_cache, user_cache
+
+CLIENTS = 30
+PRODUCTS = 20
+ORDERS = 20
+LINES_PER_ORDER = 5
+
+ADMIN = {"id": 7, "email": "admin@example.com", "hashed_password": "x", "is_admin": True, "token_version": 2}
+
+
+def order_lines(seed, start: int, count: int = LINES_PER_ORDER) -> list:
+    # só os 15 primeiros produtos entram em pedidos; os outros podem ser excluídos
+    return [
+        {"product_id": seed["products"][(start + j) % 15], "quantity": 1, "unit_price": 5.0}
+        for j in range(count)
+    ]
+
+
+def product_body(seed, name: str) -> dict:
+    return {
+        "name": name, "category_id": seed["category_id"], "section_id": seed["section_id"],
+        "selling_price": 7.5, "initial_stock": 50,
+    }
+
+
+IMPORT_CSV = (
+    "name,category,section,selling_price,initial_stock,bar_code\n"
+    "Feijão Preto,Mercearia,Corredor 1,8.90,40,7890000000001\n"
+    "Feijão Carioca,Mercearia,Corredor 1,7.90,40,7890000000002\n"
+)
+
+# (método, caminho, argumentos da requisição, orçamento): o orçamento é o número de comandos do caminho
+# atual mais uma consulta de folga; um N+1 nas listas (30 clientes, 20 produtos, 20 pedidos × 5 itens) estoura
+ROUTES = [
+    ("GET", "/clients/?limit=100", None, 2),
+    ("GET", "/clients/?search=Cliente&limit=100", None, 2),
+    ("GET", "/clients/{client_id}", None, 3),
+    ("POST", "/clients/", lambda seed: {"json": {"name": "Cliente Novo", "email": "novo@example.com", "cpf": "98765432100"}}, 5),
+    ("PUT", "/clients/{client_id}", lambda seed: {"json": {"name": "Cliente Renomeado", "email": "renomeado@example.com", "cpf": "11122233344"}}, 4),
+    ("DELETE", "/clients/{spare_client_id}", None, 4),
+    ("GET", "/products/?limit=100", None, 2),
+    ("GET", "/products/?limit=100&expand=category", None, 2),
+    ("GET", "/products/search?q=arroz&limit=100", None, 2),
+    ("GET", "/products/{product_id}", None, 3),
+    ("GET", "/products/{product_id}/stock", None, 2),
+    ("POST", "/products/{product_id}/stock/movements", lambda seed: {"json": {"kind": "restock", "quantity": 5}}, 4),
+    ("POST", "/products/", lambda seed: {"json": product_body(seed, "Arroz Parboilizado")}, 9),
+    ("PUT", "/products/{product_id}", lambda seed: {"json": product_body(seed, "Arroz Arbóreo")}, 4),
+    ("DELETE", "/products/{spare_product_id}", None, 3),
+    ("POST", "/products/import", lambda seed: {"files": {"file": ("produtos.csv", IMPORT_CSV.encode(), "text/csv")}}, 4),
+    ("GET", "/orders/?limit=100", None, 4),
+    ("GET", "/orders/?limit=100&expand=client,products.product.category,products.product.section", None, 4),
+    ("GET", "/orders/?limit=100&sort=-total_amount", None, 4),
+    ("GET", "/orders/{order_id}", None, 5),
+    ("POST", "/orders/", lambda seed: {"json": {"client_id": seed["client_id"], "products": order_lines(seed, 3)}}, 9),
+    ("POST", "/orders/bulk", lambda seed: {"json": {"orders": [
+        {"client_id": seed["client_id"], "products": order_lines(seed, i)} for i in range(3)
+    ]}}, 7),
+    ("PUT", "/orders/{order_id}", lambda seed: {"json": {
+        "client_id": seed["client_id"], "status": "paid", "products": order_lines(seed, 7, 3),
+    }}, 13),
+    ("DELETE", "/orders/{order_id}", None, 7),
+    ("GET", "/orders/export?format=ndjson", None, 2),
+    ("GET", "/analytics/sales?group_by=category", None, 2),
+]
+
+
+@pytest.fixture
+def seed(db):
+    category = ProductCategory(name="Mercearia")
+    section = ProductSection(name="Corredor 1")
+    clients = [Client(name=f"Cliente {i}", email=f"cliente{i}@example.com", cpf=f"{i:011d}") for i in range(CLIENTS)]
+    db.add_all([category, section, *clients])
+    db.flush()
+    db.commit()
+    # pelo repositório: o saldo e a entrada de estoque inicial nascem com o produto
+    product_repo = ProductRepository(db)
+    products = [
+        product_repo.create(ProductCreate(
+            name=f"Arroz Integral {i}", category_id=category.id, section_id=section.id, selling_price=5.0, initial_stock=1000,
+        ))
+        for i in range(PRODUCTS)
+    ]
+
+    data = {
+        "category_id": category.id,
+        "section_id": section.id,
+        "client_id": clients[0].id,
+        "spare_client_id": clients[-1].id,
+        "products": [product.id for product in products],
+        "product_id": products[0].id,
+        "spare_product_id": products[-1].id,
+    }
+    repo = OrderRepository(db)
+    orders = [
+        repo.create(OrderCreate(
+            client_id=clients[i % 10].id,
+            products=[OrderProductCreate(**line) for line in order_lines(data, i)],
+        ))
+        for i in range(ORDERS)
+    ]
+    data["order_id"] = orders[0].id
+
+    product_cache.clear()
+    user_cache.clear()
+    user_cache.set(ADMIN["id"], ADMIN)
+    yield data
+    product_cache.clear()
+    user_cache.clear()
+
+
+@pytest.fixture
+def api():
+    token = create_access_token({"sub": str(ADMIN["id"]), "is_admin": True, "ver": ADMIN["token_version"]})
+    return TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+
+@pytest.mark.parametrize("method, path, arguments, budget", ROUTES, ids=[f"{method} {path}" for method, path, _, _ in ROUTES])
+def test_route_stays_within_query_budget(api, seed, query_budget, method, path, arguments, budget):
+    url = path.format(**seed)
+    kwargs = arguments(seed) if arguments else {}
+
+    with query_budget(budget):
+        response = api.request(method, url, **kwargs)
+
+    assert response.status_code < 400, response.text
+
+
+def test_cached_product_is_served_without_queries(api, seed, query_budget):
+    url = f"/products/{seed['product_id']}"
+    first = api.get(url)
+
+    with query_budget(0):
+        second = api.get(url)
+        not_modified = api.get(url, headers={"If-None-Match": first.headers["etag"]})
+
+    assert second.content == first.content
+    assert not_modified.status_code == 304
+
+
+def test_conditional_get_reads_only_the_version(api, seed, query_budget):
+    url = f"/orders/{seed['order_id']}"
+    etag = api.get(url).headers["etag"]
+
+    with query_budget(1):
+        response = api.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+
+
+def test_renaming_a_category_changes_product_and_order_etags(api, seed, db):
+    product_url, order_url = f"/products/{seed['product_id']}", f"/orders/{seed['order_id']}"
+    product_etag, order_etag = api.get(product_url).headers["etag"], api.get(order_url).headers["etag"]
+    list_etag = api.get("/products/?limit=100").headers["etag"]
+
+    ProductCategoryRepository(db).update(seed["category_id"], {"name": "Hortifruti"})
+
+    product = api.get(product_url, headers={"If-None-Match": product_etag})
+    order = api.get(order_url, headers={"If-None-Match": order_etag})
+    listing = api.get("/products/?limit=100", headers={"If-None-Match": list_etag})
+    assert (product.status_code, order.status_code, listing.status_code) == (200, 200, 200)
+    assert product.json()["category"]["name"] == "Hortifruti"
+    assert order.json()["products"][0]["product"]["category"]["name"] == "Hortifruti"
+
+
+def test_sales_report_does_not_fold_pending_events(api, seed, db, query_budget):
+    pending = db.query(SalesEvent).count()
+
+    with query_budget(1) as statements:
+        response = api.get("/analytics/sales?group_by=day")
+
+    assert response.status_code == 200
+    assert all(statement.lstrip().upper().startswith("SELECT") for _, statement in statements)
+    assert db.query(SalesEvent).count() == pending > 0
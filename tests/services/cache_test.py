@@ -0,0 +1,52 @@
+from utils.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_hit_and_miss_counters():
+    cache = TTLCache(maxsize=10, ttl=60)
+    assert cache.get(1) is None
+    cache.set(1, b"{}")
+    assert cache.get(1) == b"{}"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.get(1)
+    cache.set(3, "c")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_expires_entries_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.set(1, "a")
+    clock.now = 5
+    assert cache.get(1) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_set_with_stale_token_is_ignored_after_invalidation():
+    cache = TTLCache(maxsize=10, ttl=60)
+    token = cache.token()
+    cache.invalidate(1)
+    cache.set(1, "stale", token)
+    assert cache.get(1) is None
+
+    cache.set(1, "fresh", cache.token())
+    assert cache.get(1) == "fresh"
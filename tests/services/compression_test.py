@@ -0,0 +1,111 @@
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.middlewares.compression_middleware import CompressionMiddleware, choose_encoding
+from utils.cache import TTLCache
+
+BODY = b'{"items": [' + b",".join(b'{"id": %d, "name": "Produto"}' % i for i in range(200)) + b"]}"
+
+
+def json_page(request):
+    return Response(BODY, media_type="application/json", headers={"ETag": '"v1"'})
+
+
+def small(request):
+    return Response(b'{"id": 1}', media_type="application/json")
+
+
+def image(request):
+    return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+
+def not_modified(request):
+    return Response(status_code=304, headers={"ETag": '"v1"'})
+
+
+def export(request):
+    def rows():
+        for i in range(100):
+            yield b"%d,Produto,10.0\n" % i
+    return StreamingResponse(rows(), media_type="text/csv")
+
+
+def make_client(cache=None) -> TestClient:
+    app = Starlette(routes=[
+        Route("/page", json_page), Route("/small", small), Route("/image", image),
+        Route("/not-modified", not_modified), Route("/export", export),
+    ])
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=500, encodings=("gzip",),
+        content_types=("application/json", "text/csv"), cache=cache,
+    )
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("*", "br"),
+    ("identity", None),
+    ("", None),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header, ("br", "gzip")) == expected
+
+
+def test_compresses_large_allowed_payloads():
+    response = make_client().get("/page", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.content == BODY
+
+
+@pytest.mark.parametrize("path", ["/small", "/image", "/not-modified"])
+def test_skips_small_other_types_and_bodyless_responses(path):
+    response = make_client().get(path, headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+
+
+def test_identity_when_client_does_not_accept_gzip():
+    response = make_client().get("/page", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"v1"'
+
+
+def test_strong_etag_bodies_are_compressed_once():
+    cache = TTLCache(maxsize=10, ttl=60)
+    client = make_client(cache)
+
+    first = client.get("/page", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/page", headers={"Accept-Encoding": "gzip"})
+
+    assert first.content == second.content == BODY
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["size"] == 1
+
+
+def test_streaming_responses_are_compressed_per_chunk():
+    response = make_client().get("/export", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content.splitlines()[-1] == b"99,Produto,10.0"
+
+
+def test_gzip_output_is_deterministic():
+    middleware = CompressionMiddleware(app=None, encodings=("gzip",))
+
+    payload = middleware.compress("gzip", BODY)
+    assert payload == middleware.compress("gzip", BODY)
+    assert gzip.decompress(payload) == BODY
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from utils.etag import ETAG_HEADER, collection_etag, etag_matches, make_etag, not_modified
+
+VERSION = (10, datetime(2025, 1, 1, 12, 0))
+
+
+def test_etag_depends_on_version_and_representation():
+    etag = make_etag(*VERSION, None, None)
+
+    assert etag == make_etag(*VERSION, None, None)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag != make_etag(10, datetime(2025, 1, 1, 12, 1), None, None)
+    assert etag != make_etag(*VERSION, "id,name", None)
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = make_etag(*VERSION)
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"outro", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"outro"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_collection_etag_changes_with_rows_and_query():
+    rows = [VERSION, (11, datetime(2025, 1, 2))]
+    etag = collection_etag("limit=2", rows)
+
+    assert etag == collection_etag("limit=2", iter(rows))
+    assert etag != collection_etag("limit=3", rows)
+    assert etag != collection_etag("limit=2", rows[:1])
+
+
+def test_not_modified_has_no_body():
+    response = not_modified('"abc"')
+
+    assert response.status_code == 304
+    assert response.headers[ETAG_HEADER] == '"abc"'
+    assert response.body == b""
@@ -0,0 +1,77 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.network.schemas.order import OrderRead
+from app.network.schemas.product import ProductRead
+from benchmarks.list_serialization import sample_orders
+from repositories.loading import LoadProfile, load_options
+from repositories.order_repository import EXPANSIONS, LOAD_PROFILES
+from utils.fieldsets import expansion_paths, resolve_fieldset
+from utils.serialization import dump_list, dump_one
+
+
+def make_order():
+    return sample_orders(orders=1, lines=1)[0]
+
+
+class UnloadedRelationships(SimpleNamespace):
+    """Simula um pedido do ORM cujos relacionamentos não foram carregados."""
+
+    @property
+    def client(self):
+        raise AssertionError("client não deveria ser lido")
+
+    @property
+    def products(self):
+        raise AssertionError("products não deveria ser lido")
+
+
+def test_without_parameters_keeps_full_schema():
+    fieldset = resolve_fieldset(OrderRead, None, None)
+
+    assert fieldset.model is OrderRead
+    assert fieldset.is_default
+    assert fieldset.expand == expansion_paths(OrderRead)
+
+
+def test_fields_and_empty_expand_never_touch_relationships():
+    fieldset = resolve_fieldset(OrderRead, "id,status,total_amount", "")
+    order = UnloadedRelationships(**{k: v for k, v in vars(make_order()).items() if k not in ("client", "products")})
+
+    assert fieldset.expand == frozenset()
+    assert json.loads(dump_list(fieldset.model, [order])) == [{"id": 1, "status": "pending", "total_amount": order.total_amount}]
+
+
+def test_nested_expansion_includes_parents_and_prunes_the_rest():
+    fieldset = resolve_fieldset(OrderRead, "id", "client,products.product")
+    data = json.loads(dump_one(fieldset.model, make_order()))
+
+    assert fieldset.expand == {"client", "products", "products.product"}
+    assert set(data) == {"id", "client", "products"}
+    assert "category" not in data["products"][0]["product"]
+    assert data["products"][0]["product"]["name"] == "Produto 1"
+
+
+def test_expand_without_fields_keeps_all_columns():
+    product = make_order().products[0].product
+    data = json.loads(dump_one(resolve_fieldset(ProductRead, None, "category").model, product))
+
+    assert data["category"] == {"id": 1, "name": "Bebidas"}
+    assert "section" not in data
+    assert data["selling_price"] == product.selling_price
+
+
+@pytest.mark.parametrize("fields, expand", [("id,secret", None), ("client", None), (None, "client.orders")])
+def test_invalid_fields_or_expansions(fields, expand):
+    with pytest.raises(ValueError):
+        resolve_fieldset(OrderRead, fields, expand)
+
+
+def test_every_schema_expansion_has_a_loader():
+    assert expansion_paths(OrderRead) == set(EXPANSIONS)
+    assert load_options(LOAD_PROFILES, EXPANSIONS, frozenset()) == ()
+    assert load_options(LOAD_PROFILES, EXPANSIONS, LoadProfile.DETAIL) == LOAD_PROFILES[LoadProfile.DETAIL]
+    with pytest.raises(ValueError):
+        load_options(LOAD_PROFILES, EXPANSIONS, frozenset({"orders"}))
@@ -0,0 +1,39 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from utils.order_export import EXPORT_FIELDS, to_csv, to_ndjson
+
+
+def make_row(order_id, quantity=2, unit_price=10.0):
+    row = {field: None for field in EXPORT_FIELDS}
+    row.update(
+        order_id=order_id,
+        order_status="pending",
+        order_created_at=datetime(2025, 5, 26, 15, 30),
+        client_id=1,
+        client_name="Maria",
+        quantity=quantity,
+        unit_price=unit_price,
+    )
+    return row
+
+
+def test_to_csv_flattens_rows_with_header():
+    output = "".join(to_csv([make_row(1), make_row(2, quantity=None, unit_price=None)]))
+    lines = list(csv.DictReader(io.StringIO(output)))
+
+    assert [line["order_id"] for line in lines] == ["1", "2"]
+    assert lines[0]["line_total"] == "20.0"
+    assert lines[1]["line_total"] == ""
+
+
+def test_to_ndjson_streams_in_chunks():
+    chunks = list(to_ndjson(make_row(i) for i in range(1200)))
+    assert len(chunks) == 3
+
+    records = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert len(records) == 1200
+    assert records[0]["order_created_at"] == "2025-05-26T15:30:00"
+    assert records[0]["line_total"] == 20.0
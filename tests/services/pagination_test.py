@@ -0,0 +1,67 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from models.models import Order
+from utils.pagination import decode_cursor, encode_cursor, next_cursor, paginate
+
+ORDER_BY = (Order.created_at, Order.id)
+
+
+def test_cursor_roundtrip_keeps_datetimes():
+    values = (datetime(2025, 5, 26, 15, 30), 42)
+    assert decode_cursor(encode_cursor(ORDER_BY, values), ORDER_BY) == values
+
+
+def test_decode_invalid_cursor():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", ORDER_BY)
+
+
+@pytest.mark.parametrize("payload", [[1, 2], {"k": "Order.created_at,Order.id", "v": [{"dt": 5}, 1]}, {"v": [1, 2]}])
+def test_decode_malformed_payload_is_invalid_cursor(payload):
+    cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+    with pytest.raises(ValueError, match="Cursor inválido"):
+        decode_cursor(cursor, ORDER_BY)
+
+
+def test_cursor_from_another_sort_is_rejected():
+    by_total = (Order.total_amount, Order.id)
+    with pytest.raises(ValueError, match="outra ordenação"):
+        decode_cursor(encode_cursor(by_total, (150.0, 10)), ORDER_BY)
+    with pytest.raises(ValueError, match="outra ordenação"):
+        decode_cursor(encode_cursor(by_total, (150.0, 10)), by_total, descending=True)
+
+
+def test_paginate_with_cursor_uses_seek_predicate():
+    cursor = encode_cursor(ORDER_BY, (datetime(2025, 1, 1), 10))
+    stmt = paginate(select(Order), ORDER_BY, skip=500, limit=20, cursor=cursor)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "(orders.created_at, orders.id) > (" in sql
+    assert "OFFSET" not in sql
+
+
+def test_paginate_without_cursor_keeps_offset():
+    sql = str(paginate(select(Order), ORDER_BY, skip=20, limit=10).compile(dialect=postgresql.dialect()))
+    assert "OFFSET" in sql
+    assert "ORDER BY orders.created_at, orders.id" in sql
+
+
+def test_next_cursor_only_on_full_page():
+    rows = [Order(id=1, created_at=datetime(2025, 1, 1)), Order(id=2, created_at=datetime(2025, 1, 2))]
+    assert next_cursor(rows, ORDER_BY, limit=3) is None
+    assert decode_cursor(next_cursor(rows, ORDER_BY, limit=2), ORDER_BY) == (datetime(2025, 1, 2), 2)
+
+
+def test_paginate_descending_inverts_order_and_seek():
+    cursor = encode_cursor((Order.total_amount, Order.id), (150.0, 10), descending=True)
+    stmt = paginate(select(Order), (Order.total_amount, Order.id), skip=0, limit=20, cursor=cursor, descending=True)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "ORDER BY orders.total_amount DESC, orders.id DESC" in sql
+    assert "(orders.total_amount, orders.id) < (" in sql
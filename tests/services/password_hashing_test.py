@@ -0,0 +1,66 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.security import build_password_context, hashing_pool, hash_password_async, verify_and_update_password_async
+from utils.hashing_pool import HashingPool, HashingPoolOverloaded
+
+
+def test_lower_cost_hash_is_upgraded_on_verify():
+    old_context = build_password_context(scheme="bcrypt", bcrypt_rounds=4)
+    new_context = build_password_context(scheme="bcrypt", bcrypt_rounds=5)
+    old_hash = old_context.hash("secret")
+
+    valid, new_hash = new_context.verify_and_update("secret", old_hash)
+
+    assert valid
+    assert new_hash is not None and "$05$" in new_hash
+    assert new_context.verify_and_update("secret", new_hash) == (True, None)
+
+
+def test_bcrypt_hash_is_migrated_to_argon2():
+    bcrypt_hash = build_password_context(scheme="bcrypt", bcrypt_rounds=4).hash("secret")
+    argon2_context = build_password_context(scheme="argon2", argon2_time_cost=1, argon2_memory_cost=8192)
+
+    valid, new_hash = argon2_context.verify_and_update("secret", bcrypt_hash)
+
+    assert valid
+    assert new_hash.startswith("$argon2")
+
+
+def test_wrong_password_is_not_rehashed():
+    context = build_password_context(scheme="bcrypt", bcrypt_rounds=5)
+    old_hash = build_password_context(scheme="bcrypt", bcrypt_rounds=4).hash("secret")
+
+    assert context.verify_and_update("wrong", old_hash) == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_pool_rejects_when_queue_is_full():
+    release = threading.Event()
+    pool = HashingPool(workers=1, max_queue=1, executor_factory=lambda workers: ThreadPoolExecutor(workers))
+
+    running = [asyncio.create_task(pool.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(HashingPoolOverloaded):
+        await pool.run(release.wait)
+
+    release.set()
+    await asyncio.gather(*running)
+    stats = pool.stats()
+    assert stats["completed"] == 2
+    assert stats["rejected"] == 1
+    assert stats["queued"] == 0
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_async_helpers_run_in_process_pool():
+    hashed = await hash_password_async("secret")
+
+    assert await verify_and_update_password_async("secret", hashed) == (True, None)
+    assert (await verify_and_update_password_async("wrong", hashed))[0] is False
+    hashing_pool.shutdown()
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.util import await_only, greenlet_spawn
+
+from utils.pool_metrics import PoolMetrics, instrumented_pool
+
+
+class FakeConnection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_observe_wait_fills_histogram_buckets():
+    metrics = PoolMetrics()
+    metrics.observe_wait(0.0005)
+    metrics.observe_wait(0.2)
+    metrics.observe_wait(60)
+
+    assert metrics.wait_count == 3
+    assert metrics.wait_buckets[0] == 1
+    assert metrics.wait_buckets[-1] == 1
+    assert metrics.wait_max == 60
+
+
+def test_instrumented_pool_records_checkout_and_timeout():
+    metrics = PoolMetrics()
+    pool = instrumented_pool(QueuePool, metrics)(FakeConnection, pool_size=1, max_overflow=0, timeout=0.01)
+
+    connection = pool.connect()
+    snapshot = metrics.snapshot(pool)
+    assert snapshot["checked_out"] == 1
+    assert snapshot["checkout_wait"]["count"] == 1
+
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    assert metrics.timeouts == 1
+
+    connection.close()
+    assert metrics.snapshot(pool)["checked_out"] == 0
+
+
+def test_only_checkouts_beyond_pool_size_count_as_overflow():
+    metrics = PoolMetrics()
+    pool = instrumented_pool(QueuePool, metrics)(FakeConnection, pool_size=2, max_overflow=2, timeout=0.01)
+
+    first, second, extra = pool.connect(), pool.connect(), pool.connect()
+    assert metrics.overflow_checkouts == 1
+
+    # com a conexão extra ainda aberta, reaproveitar uma conexão devolvida ao pool não é overflow
+    second.close()
+    second = pool.connect()
+    assert pool.overflow() > 0
+    assert metrics.overflow_checkouts == 1
+
+    fourth = pool.connect()
+    assert metrics.overflow_checkouts == 2
+
+    for connection in (first, second, extra, fourth):
+        connection.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_async_checkouts_count_each_overflow_connection():
+    def connect():
+        # como o asyncpg, abrir a conexão cede o event loop para os outros checkouts
+        await_only(asyncio.sleep(0.01))
+        return FakeConnection()
+
+    metrics = PoolMetrics()
+    pool = instrumented_pool(AsyncAdaptedQueuePool, metrics)(connect, pool_size=1, max_overflow=3, timeout=1)
+
+    connections = await asyncio.gather(*(greenlet_spawn(pool.connect) for _ in range(4)))
+    assert metrics.wait_count == 4
+    assert metrics.overflow_checkouts == 3
+
+    for connection in connections:
+        await greenlet_spawn(connection.close)
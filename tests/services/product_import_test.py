@@ -0,0 +1,50 @@
+import io
+
+import pytest
+
+from utils.product_import import import_products_csv
+
+
+class FakeProductRepository:
+    def __init__(self):
+        self.lookups = 0
+        self.batches = []
+
+    def resolve_category_section_ids(self, category_names, section_names):
+        self.lookups += 1
+        categories = {name: 1 for name in category_names if name == "Bebidas"}
+        sections = {name: 2 for name in section_names if name == "Corredor 1"}
+        return categories, sections
+
+    def upsert_copy(self, products):
+        self.batches.append(products)
+        return len(products), 0
+
+
+CSV = (
+    "name,category,section,selling_price,initial_stock,bar_code,description\n"
+    "Suco de Uva,Bebidas,Corredor 1,7.5,10,789001,\n"
+    "Refrigerante,Bebidas,Corredor 1,5,20,789002,Lata 350ml\n"
+    "Sem Categoria,Limpeza,Corredor 1,3,5,789003,\n"
+    "Preco Invalido,Bebidas,Corredor 1,dez,5,789004,\n"
+    "Agua,Bebidas,Corredor 1,2,50,,\n"
+)
+
+
+def test_import_validates_rows_and_loads_in_chunks():
+    repo = FakeProductRepository()
+    result = import_products_csv(io.BytesIO(CSV.encode()), repo, chunk_size=2)
+
+    assert result["inserted"] == 3
+    assert result["failed"] == 2
+    assert [e["line"] for e in result["errors"]] == [4, 5]
+    assert [len(batch) for batch in repo.batches] == [2, 1]
+    # nomes já resolvidos não são consultados de novo
+    assert repo.lookups == 2
+    assert repo.batches[0][1].description == "Lata 350ml"
+    assert repo.batches[1][0].bar_code is None
+
+
+def test_import_requires_columns():
+    with pytest.raises(ValueError):
+        import_products_csv(io.BytesIO(b"name,selling_price\nX,1\n"), FakeProductRepository())
@@ -0,0 +1,87 @@
+import json
+import logging
+
+from sqlalchemy import create_engine, text
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.middlewares.timing_middleware import ServerTimingMiddleware
+from app.network.schemas.client import ClientRead
+from utils.request_metrics import RequestMetrics, collect_metrics, instrument_engine, query_origin
+from utils.serialization import JSONBytesResponse, dump_one
+
+engine = create_engine("sqlite://")
+instrument_engine(engine)
+
+
+def list_numbers(limit: int) -> list:
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT value FROM (SELECT 1 AS value UNION ALL SELECT 2 UNION ALL SELECT 3) LIMIT :limit"), {"limit": limit}).all()
+
+
+async def numbers(request):
+    # mesmo caminho do `run_db` síncrono: origem no contexto e consulta no thread pool
+    with query_origin("NumberRepository.list"):
+        rows = await run_in_threadpool(list_numbers, 2)
+    client = {"id": rows[0][0], "name": "Cliente", "email": "cliente@example.com", "cpf": "12345678909"}
+    return JSONBytesResponse(dump_one(ClientRead, client))
+
+
+def make_client() -> TestClient:
+    app = Starlette(routes=[Route("/numbers", numbers)])
+    app.add_middleware(ServerTimingMiddleware)
+    return TestClient(app)
+
+
+def test_queries_are_counted_per_origin():
+    with collect_metrics() as metrics:
+        with query_origin("NumberRepository.list"):
+            list_numbers(3)
+        list_numbers(1)
+
+    assert metrics.queries == 2
+    assert metrics.by_origin["NumberRepository.list"]["queries"] == 1
+    assert metrics.by_origin["-"]["queries"] == 1
+
+
+def test_rows_and_times_are_summed_per_origin():
+    metrics = RequestMetrics()
+    metrics.observe_query("OrderRepository.list", 0.002, 100)
+    metrics.observe_query("OrderRepository.list", 0.001, 250)
+    metrics.observe_query("OrderRepository.get_version", 0.0005, 1)
+    metrics.observe_pool_wait(0.004)
+
+    summary = metrics.as_dict()
+    assert summary["queries"] == 3
+    assert summary["rows"] == 351
+    assert summary["db_ms"] == 3.5
+    assert summary["pool_wait_ms"] == 4.0
+    assert summary["by_origin"]["OrderRepository.list"] == {"queries": 2, "db_ms": 3.0, "rows": 350}
+    assert metrics.server_timing(0.01).startswith('db;dur=3.50;desc="3 queries, 351 rows", pool;dur=4.00')
+
+
+def test_queries_outside_a_request_are_ignored():
+    with collect_metrics() as metrics:
+        pass
+    list_numbers(3)
+
+    assert metrics.queries == 0
+
+
+def test_server_timing_header_and_log_line(caplog):
+    with caplog.at_level(logging.INFO, logger="app.requests"):
+        response = make_client().get("/numbers")
+
+    timing = response.headers["server-timing"]
+    assert timing.startswith('db;dur=')
+    # o sqlite não informa rowcount em SELECT; psycopg2 e asyncpg informam
+    assert 'desc="1 queries, 0 rows"' in timing
+    assert "pool;dur=" in timing and "ser;dur=" in timing and "total;dur=" in timing
+
+    line = json.loads(caplog.records[-1].getMessage())
+    assert line["method"] == "GET" and line["path"] == "/numbers" and line["status"] == 200
+    assert line["queries"] == 1
+    assert line["by_origin"] == {"NumberRepository.list": {"queries": 1, "db_ms": line["db_ms"], "rows": 0}}
+    assert line["serialization_ms"] > 0
@@ -0,0 +1,49 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.network.schemas.client import ClientRead
+from app.network.schemas.order import OrderRead
+from utils.serialization import JSONBytesResponse, dump_list, list_adapter, list_response
+
+
+def make_order(order_id: int) -> SimpleNamespace:
+    category = SimpleNamespace(id=1, name="Bebidas")
+    section = SimpleNamespace(id=2, name="Mercearia")
+    product = SimpleNamespace(
+        id=10, name="Leite", category_id=1, section_id=2, selling_price=5.99, initial_stock=100, cost=None,
+        availability=True, description=None, bar_code=None, expiration_date=None, images=None,
+        category=category, section=section,
+    )
+    line = SimpleNamespace(id=order_id, order_id=order_id, product_id=10, quantity=2, unit_price=5.99, product=product)
+    client = SimpleNamespace(id=3, name="Maria", email="maria@example.com", cpf="12345678901")
+    created_at = datetime(2025, 1, 1, 12, 30)
+    return SimpleNamespace(
+        id=order_id, client_id=3, status="pending", created_at=created_at, updated_at=created_at,
+        total_amount=11.98, item_count=2, client=client, products=[line],
+    )
+
+
+def test_dump_list_matches_response_model_output():
+    orders = [make_order(1), make_order(2)]
+    expected = [OrderRead.model_validate(order).model_dump(mode="json") for order in orders]
+
+    assert json.loads(dump_list(OrderRead, orders)) == expected
+
+
+def test_list_adapter_is_built_once_per_model():
+    assert list_adapter(ClientRead) is list_adapter(ClientRead)
+    assert list_adapter(ClientRead) is not list_adapter(OrderRead)
+
+
+def test_list_response_keeps_headers_and_bytes():
+    clients = [SimpleNamespace(id=1, name="Maria", email="maria@example.com", cpf="12345678901")]
+    response = list_response(ClientRead, clients, {"X-Next-Cursor": "abc"})
+
+    assert response.headers["X-Next-Cursor"] == "abc"
+    assert response.headers["content-type"] == "application/json"
+    assert json.loads(response.body) == [{"id": 1, "name": "Maria", "email": "maria@example.com", "cpf": "12345678901"}]
+
+
+def test_json_bytes_response_encodes_plain_content():
+    assert json.loads(JSONBytesResponse({"when": datetime(2025, 1, 1)}).body) == {"when": "2025-01-01T00:00:00"}
@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from utils.config import Config
+
+
+class TTLCache:
+    """Cache em memória com limite de tamanho (LRU) e expiração por TTL."""
+
+    def __init__(self, maxsize: int, ttl: float, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data: OrderedDict = OrderedDict()
+        # incrementado a cada invalidação: leituras que começaram antes dela não gravam no cache
+        self._generation = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def token(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, token: Optional[int] = None) -> None:
+        with self._lock:
+            if token is not None and token != self._generation:
+                return
+            self._data[key] = (value, self._clock() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                if self._data.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+# (ETag, payload JSON de ProductRead já serializado), por id do produto
+product_cache = TTLCache(maxsize=Config.product_cache_size, ttl=Config.product_cache_ttl)
+
+# corpos já comprimidos por (caminho, query string, ETag, codificação); um ETag novo é outra chave
+compressed_cache = TTLCache(maxsize=Config.compression_cache_size, ttl=Config.compression_cache_ttl)
+
+# snapshot das colunas de `users` por id; o TTL limita quanto tempo uma mudança de permissão leva para valer
+user_cache = TTLCache(maxsize=Config.user_cache_size, ttl=Config.user_cache_ttl)
@@ -9,4 +9,37 @@ class Config:
     port = os.getenv("POSTGRES_PORT")
     db = os.getenv("POSTGRES_DB_NAME")
     url = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{db}"
+    async_url = f"postgresql+asyncpg://{user}:{password}@{host}:{port}/{db}"
+    # "true" serve as rotas CRUD com AsyncSession/asyncpg; "false" mantém a sessão síncrona (psycopg2)
+    db_async = os.getenv("DB_ASYNC", "false").lower() == "true"
+    pool_size = int(os.getenv("DB_POOL_SIZE", 5))
+    max_overflow = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    pool_timeout = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    pool_recycle = int(os.getenv("DB_POOL_RECYCLE", -1))
+    pool_pre_ping = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+    product_cache_size = int(os.getenv("PRODUCT_CACHE_SIZE", 10000))
+    product_cache_ttl = float(os.getenv("PRODUCT_CACHE_TTL", 60))
+    user_cache_size = int(os.getenv("USER_CACHE_SIZE", 10000))
+    user_cache_ttl = float(os.getenv("USER_CACHE_TTL", 5))
+    # hashing de senha: esquema padrão (bcrypt|argon2) e custos; hashes com custo menor são refeitos no login
+    password_scheme = os.getenv("PASSWORD_SCHEME", "bcrypt")
+    bcrypt_rounds = int(os.getenv("BCRYPT_ROUNDS", 12))
+    argon2_time_cost = int(os.getenv("ARGON2_TIME_COST", 3))
+    argon2_memory_cost = int(os.getenv("ARGON2_MEMORY_COST", 65536))
+    argon2_parallelism = int(os.getenv("ARGON2_PARALLELISM", 1))
+    hash_workers = int(os.getenv("HASH_WORKERS", 2))
+    hash_max_queue = int(os.getenv("HASH_MAX_QUEUE", 100))
+    # compressão das respostas: codificações em ordem de preferência, tamanho mínimo e content-types comprimidos
+    compression_encodings = os.getenv("COMPRESSION_ENCODINGS", "br,gzip").split(",")
+    compression_minimum_size = int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1024))
+    compression_gzip_level = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+    compression_brotli_quality = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+    compression_content_types = os.getenv(
+        "COMPRESSION_CONTENT_TYPES", "application/json,application/x-ndjson,text/csv,text/plain"
+    ).split(",")
+    compression_cache_size = int(os.getenv("COMPRESSION_CACHE_SIZE", 500))
+    compression_cache_ttl = float(os.getenv("COMPRESSION_CACHE_TTL", 300))
+    # Server-Timing e uma linha de log JSON por requisição (consultas, tempo de banco, pool, serialização)
+    server_timing = os.getenv("SERVER_TIMING", "true").lower() == "true"
+    log_level = os.getenv("LOG_LEVEL", "INFO")
     api_port = os.getenv("API_PORT", 8080)
@@ -1,23 +1,79 @@
+import inspect
+
 from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from starlette.concurrency import run_in_threadpool
 from utils.config import Config
+from utils.pool_metrics import PoolMetrics, instrumented_pool
+from utils.request_metrics import instrument_engine, query_origin
+
+pool_options = dict(
+    pool_size=Config.pool_size,
+    max_overflow=Config.max_overflow,
+    pool_timeout=Config.pool_timeout,
+    pool_recycle=Config.pool_recycle,
+    pool_pre_ping=Config.pool_pre_ping,
+)
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
 
 # for attempt in range(1, MAX_RETRIES + 1):
 try:
-    engine = create_engine(Config.url, echo=False)
+    engine = create_engine(
+        Config.url,
+        echo=False,
+        poolclass=instrumented_pool(QueuePool, pool_metrics),
+        **pool_options,
+    )
     with engine.connect() as connection:
         connection.execute(text("SELECT 1"))
-    SessionLocal = scoped_session(sessionmaker(bind=engine, autoflush=False, autocommit=False))
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
     print("[DB] Connected successfully.")
 except Exception as e:
     raise RuntimeError(f"[UNEXPECTED ERROR] {e}")
 # else:
 #     raise RuntimeError("[DB ERROR] Could not connect to the database after several attempts.")
 
+async_engine = create_async_engine(
+    Config.async_url,
+    echo=False,
+    poolclass=instrumented_pool(AsyncAdaptedQueuePool, async_pool_metrics),
+    **pool_options,
+)
+# tempo, quantidade e linhas de cada consulta vão para as métricas da requisição (Server-Timing)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+# expire_on_commit=False: em modo async não há lazy load implícito depois do commit
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+get_session = get_async_db if Config.db_async else get_db
+
+async def run_db(func, *args, **kwargs):
+    """Executa um método de repositório: aguarda os assíncronos e manda os síncronos para o thread pool.
+
+    As consultas emitidas durante a chamada são atribuídas a `func` (ex.: "OrderRepository.list").
+    """
+    with query_origin(getattr(func, "__qualname__", repr(func))):
+        if inspect.iscoroutinefunction(func):
+            return await func(*args, **kwargs)
+        return await run_in_threadpool(func, *args, **kwargs)
+
+def pool_status() -> dict:
+    return {
+        "sync": pool_metrics.snapshot(engine.pool),
+        "async": async_pool_metrics.snapshot(async_engine.sync_engine.pool),
+    }
@@ -0,0 +1,29 @@
+import hashlib
+from typing import Iterable, Optional
+
+from fastapi.responses import Response
+
+ETAG_HEADER = "ETag"
+
+
+def make_etag(*parts) -> str:
+    """ETag forte a partir das versões das linhas e da representação pedida (query string, fields, expand)."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def collection_etag(query: str, versions: Iterable) -> str:
+    """ETag de uma página: a mesma query string sobre as mesmas linhas nas mesmas versões gera o mesmo corpo."""
+    return make_etag(query, tuple(versions))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparação fraca do If-None-Match (RFC 9110): aceita lista, `*` e o prefixo W/."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={ETAG_HEADER: etag})
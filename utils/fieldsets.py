@@ -0,0 +1,98 @@
+from functools import lru_cache
+from typing import FrozenSet, List, NamedTuple, Optional, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel, ConfigDict, create_model
+
+
+class Fieldset(NamedTuple):
+    """Schema de resposta montado a partir de `?fields=` e `?expand=`, e os caminhos que o repositório deve carregar."""
+    model: Type[BaseModel]
+    expand: FrozenSet[str]
+    is_default: bool
+
+
+def _nested_model(annotation) -> Optional[Type[BaseModel]]:
+    if get_origin(annotation) in (list, List, Union):
+        models = [_nested_model(arg) for arg in get_args(annotation)]
+        return next((model for model in models if model is not None), None)
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    return None
+
+
+def _replace_model(annotation, nested: Type[BaseModel], sparse: Type[BaseModel]):
+    if annotation is nested:
+        return sparse
+    origin = get_origin(annotation)
+    if origin in (list, List):
+        return List[_replace_model(get_args(annotation)[0], nested, sparse)]
+    if origin is Union:
+        return Union[tuple(_replace_model(arg, nested, sparse) for arg in get_args(annotation))]
+    return annotation
+
+
+@lru_cache(maxsize=None)
+def expansion_paths(model: Type[BaseModel]) -> FrozenSet[str]:
+    """Todos os caminhos expansíveis do schema: cada campo que é outro schema, e os caminhos dentro dele."""
+    paths = set()
+    for name, field in model.model_fields.items():
+        nested = _nested_model(field.annotation)
+        if nested is not None:
+            paths.add(name)
+            paths.update(f"{name}.{path}" for path in expansion_paths(nested))
+    return frozenset(paths)
+
+
+@lru_cache(maxsize=256)
+def sparse_model(model: Type[BaseModel], fields: Optional[FrozenSet[str]], expand: FrozenSet[str]) -> Type[BaseModel]:
+    """Cópia do schema só com os campos simples de `fields` (todos se None) e os relacionamentos de `expand`.
+
+    Os relacionamentos fora de `expand` nem existem no schema gerado, então nunca são lidos do objeto do ORM.
+    """
+    definitions = {}
+    for name, field in model.model_fields.items():
+        nested = _nested_model(field.annotation)
+        if nested is None:
+            if fields is None or name in fields:
+                definitions[name] = (field.annotation, field)
+        elif name in expand:
+            prefix = f"{name}."
+            inner = frozenset(path[len(prefix):] for path in expand if path.startswith(prefix))
+            annotation = _replace_model(field.annotation, nested, sparse_model(nested, None, inner))
+            definitions[name] = (annotation, field)
+    return create_model(f"{model.__name__}Fields", __config__=ConfigDict(from_attributes=True), **definitions)
+
+
+def parse_list(value: Optional[str]) -> Optional[FrozenSet[str]]:
+    if value is None:
+        return None
+    return frozenset(item.strip() for item in value.split(",") if item.strip())
+
+
+def resolve_fieldset(model: Type[BaseModel], fields: Optional[str], expand: Optional[str]) -> Fieldset:
+    """Valida `?fields=` e `?expand=` contra o schema; sem os dois parâmetros a resposta é o schema completo.
+
+    Sem `expand` todos os relacionamentos do schema vêm expandidos, como antes; `expand=` vazio não expande nenhum.
+    Expandir um caminho aninhado (`products.product`) expande também os pais (`products`).
+    """
+    field_names = parse_list(fields)
+    paths = parse_list(expand)
+    if field_names is None and paths is None:
+        return Fieldset(model, expansion_paths(model), True)
+
+    if field_names is not None:
+        simple = {name for name, field in model.model_fields.items() if _nested_model(field.annotation) is None}
+        unknown = sorted(field_names - simple)
+        if unknown:
+            raise ValueError(f"Campo inválido em fields: {', '.join(unknown)}")
+
+    if paths is None:
+        paths = expansion_paths(model)
+    else:
+        unknown = sorted(paths - expansion_paths(model))
+        if unknown:
+            raise ValueError(f"Expansão inválida em expand: {', '.join(unknown)}")
+        parts = [path.split(".") for path in paths]
+        paths = {".".join(names[:depth]) for names in parts for depth in range(1, len(names) + 1)}
+
+    return Fieldset(sparse_model(model, field_names, frozenset(paths)), frozenset(paths), False)
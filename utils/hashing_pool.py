@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Callable, Optional
+
+
+class HashingPoolOverloaded(Exception):
+    """A fila de hashing está cheia; a rota responde 503 com Retry-After."""
+
+
+def _timed_call(func, args):
+    # roda no processo do pool: devolve também o instante em que o trabalho começou de fato
+    started = time.time()
+    return func(*args), started
+
+
+class HashingPool:
+    """Executa funções CPU-bound (bcrypt/argon2) fora do event loop com fila limitada.
+
+    No máximo `workers` hashes rodam ao mesmo tempo e até `max_queue` aguardam; acima disso
+    `run` levanta `HashingPoolOverloaded` em vez de acumular logins pendentes.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_queue: int,
+        executor_factory: Optional[Callable[[int], Executor]] = None,
+    ):
+        self.workers = max(workers, 1)
+        self.max_queue = max_queue
+        self._executor_factory = executor_factory or self._process_executor
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    @staticmethod
+    def _process_executor(workers: int) -> Executor:
+        # spawn: o processo filho não herda conexões do engine nem threads do servidor
+        return ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._executor_factory(self.workers)
+            return self._executor
+
+    def reset(self) -> None:
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    async def run(self, func, *args):
+        if self.pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise HashingPoolOverloaded()
+
+        self.pending += 1
+        submitted = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+            result, started = await loop.run_in_executor(self._get_executor(), _timed_call, func, args)
+        finally:
+            self.pending -= 1
+
+        wait = max(started - submitted, 0.0)
+        self.completed += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": min(self.pending, self.workers),
+            "queued": max(self.pending - self.workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.wait_total / self.completed * 1000, 3) if self.completed else 0.0,
+            "max_wait_ms": round(self.wait_max * 1000, 3),
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,49 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from repositories.order_repository import EXPORT_COLUMNS
+
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+# linhas agrupadas por pedaço enviado, para não fazer um write por linha
+ROWS_PER_CHUNK = 500
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+def _line_total(row) -> float | None:
+    if row["quantity"] is None:
+        return None
+    return row["quantity"] * row["unit_price"]
+
+
+def to_csv(rows: Iterable) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS + ["line_total"])
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([row[field] for field in EXPORT_FIELDS] + [_line_total(row)])
+        if count % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def to_ndjson(rows: Iterable) -> Iterator[str]:
+    chunk = []
+    for row in rows:
+        record = {field: row[field] for field in EXPORT_FIELDS}
+        record["line_total"] = _line_total(row)
+        chunk.append(json.dumps(record, default=_json_default, ensure_ascii=False))
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk) + "\n"
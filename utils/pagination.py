@@ -0,0 +1,89 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional, Sequence
+
+from sqlalchemy import BigInteger, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def _matches_column(value, column) -> bool:
+    try:
+        expected = column.type.python_type
+    except NotImplementedError:
+        return value is not None
+    # bool é subclasse de int; colunas numéricas aceitam qualquer número do JSON
+    if isinstance(value, bool):
+        return expected is bool
+    if expected in (float, Decimal):
+        return isinstance(value, (int, float))
+    if expected is int and isinstance(value, int):
+        # fora da faixa da coluna o Postgres também recusa a comparação
+        bits = 63 if isinstance(column.type, BigInteger) else 31
+        return -2 ** bits <= value < 2 ** bits
+    return isinstance(value, expected)
+
+
+def sort_key(order_by: Sequence, descending: bool = False) -> str:
+    """Identifica a ordenação (colunas e direção) que o cursor percorre, ex.: "-Order.total_amount,-Order.id"."""
+    return ",".join(f"{'-' if descending else ''}{column}" for column in order_by)
+
+
+def encode_cursor(order_by: Sequence, values: Sequence, descending: bool = False) -> str:
+    """Gera o cursor opaco (base64 de JSON) com a ordenação e os valores da chave de ordenação."""
+    payload = json.dumps(
+        {"k": sort_key(order_by, descending), "v": [_encode_value(v) for v in values]},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: Sequence, descending: bool = False) -> tuple:
+    """Valores do cursor; ValueError se ele não decodifica ou foi gerado para outra ordenação."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key, values = payload["k"], tuple(_decode_value(v) for v in payload["v"])
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError):
+        raise ValueError("Cursor inválido")
+    if key != sort_key(order_by, descending):
+        raise ValueError("Cursor gerado para outra ordenação")
+    # valor do tipo errado chegaria ao Postgres na comparação do seek e viraria DataError (500)
+    if len(values) != len(order_by) or not all(map(_matches_column, values, order_by)):
+        raise ValueError("Cursor inválido")
+    return values
+
+
+def paginate(query, order_by: Sequence, skip: int, limit: int, cursor: Optional[str] = None, descending: bool = False):
+    """Ordena por `order_by` (chave, id) e pagina por seek quando há cursor, ou por offset caso contrário.
+
+    `descending` inverte todas as colunas da chave, e assim a comparação do seek continua sendo por tupla.
+    """
+    query = query.order_by(*(column.desc() if descending else column for column in order_by))
+    if cursor:
+        after = decode_cursor(cursor, order_by, descending)
+        key, position = tuple_(*order_by), tuple_(*after)
+        return query.where(key < position if descending else key > position).limit(limit)
+    return query.offset(skip).limit(limit)
+
+
+def next_cursor(rows: Sequence, order_by: Sequence, limit: int, descending: bool = False) -> Optional[str]:
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(order_by, [getattr(last, column.key) for column in order_by], descending)
@@ -0,0 +1,95 @@
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from utils.request_metrics import observe_pool_wait
+
+# limites superiores (em segundos) dos buckets do histograma de espera no checkout
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolMetrics:
+    """Contadores de um pool de conexões: tempo de espera no checkout, timeouts e uso de overflow."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+            self.wait_count = 0
+            self.wait_sum = 0.0
+            self.wait_max = 0.0
+            self.timeouts = 0
+            self.overflow_checkouts = 0
+
+    def observe_wait(self, seconds: float):
+        with self._lock:
+            index = len(WAIT_BUCKETS)
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    index = i
+                    break
+            self.wait_buckets[index] += 1
+            self.wait_count += 1
+            self.wait_sum += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_overflow(self):
+        with self._lock:
+            self.overflow_checkouts += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            histogram = {f"le_{bound}": count for bound, count in zip(WAIT_BUCKETS, self.wait_buckets)}
+            histogram["le_inf"] = self.wait_buckets[-1]
+            return {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "overflow_checkouts": self.overflow_checkouts,
+                "timeouts": self.timeouts,
+                "checkout_wait": {
+                    "count": self.wait_count,
+                    "sum_seconds": self.wait_sum,
+                    "max_seconds": self.wait_max,
+                    "histogram": histogram,
+                },
+            }
+
+
+def instrumented_pool(pool_class, metrics: PoolMetrics):
+    """Subclasse de `pool_class` que mede o tempo de cada checkout em `metrics` (e na requisição corrente)."""
+
+    class InstrumentedPool(pool_class):
+        def _create_connection(self):
+            # o QueuePool só abre conexão depois de incrementar _overflow: acima de zero, esta passa do pool_size.
+            # Lido antes de conectar, porque no pool async outros checkouts rodam enquanto a conexão é aberta
+            overflow = self._overflow > 0
+            connection = super()._create_connection()
+            if overflow:
+                metrics.record_overflow()
+            return connection
+
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                metrics.record_timeout()
+                raise
+            elapsed = time.perf_counter() - start
+            metrics.observe_wait(elapsed)
+            observe_pool_wait(elapsed)
+            return connection
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
@@ -0,0 +1,73 @@
+import csv
+import io
+from typing import BinaryIO
+
+from pydantic import ValidationError
+
+from app.network.schemas.product import ProductCreate
+
+IMPORT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+REQUIRED_COLUMNS = {"name", "category", "section", "selling_price", "initial_stock"}
+
+
+def _chunks(reader, size: int):
+    chunk = []
+    for row in reader:
+        chunk.append((reader.line_num, row))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_products_csv(file: BinaryIO, repo, chunk_size: int = IMPORT_CHUNK_SIZE) -> dict:
+    """Importa um CSV de produtos em blocos: valida, resolve categoria/seção e carrega via COPY.
+
+    O arquivo é lido linha a linha, então a memória fica limitada ao tamanho do bloco.
+    Categorias e seções são referenciadas pelo nome nas colunas `category` e `section`.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    missing = REQUIRED_COLUMNS - set(reader.fieldnames or [])
+    if missing:
+        raise ValueError(f"Colunas obrigatórias ausentes: {sorted(missing)}")
+
+    result = {"inserted": 0, "updated": 0, "failed": 0, "errors": []}
+    known_categories, known_sections = {}, {}
+
+    def fail(line: int, error: str):
+        result["failed"] += 1
+        if len(result["errors"]) < MAX_REPORTED_ERRORS:
+            result["errors"].append({"line": line, "error": error})
+
+    for chunk in _chunks(reader, chunk_size):
+        rows = [(line, {key: (value.strip() or None) if value is not None else None for key, value in row.items()}) for line, row in chunk]
+
+        # uma consulta por bloco, só para os nomes que ainda não foram vistos
+        new_categories = {row["category"] for _, row in rows if row["category"]} - known_categories.keys()
+        new_sections = {row["section"] for _, row in rows if row["section"]} - known_sections.keys()
+        if new_categories or new_sections:
+            categories, sections = repo.resolve_category_section_ids(new_categories, new_sections)
+            known_categories.update(categories)
+            known_sections.update(sections)
+
+        products = []
+        for line, row in rows:
+            category_id = known_categories.get(row.pop("category"))
+            section_id = known_sections.get(row.pop("section"))
+            if category_id is None or section_id is None:
+                fail(line, "Categoria ou Seção não encontrados")
+                continue
+            fields = {key: value for key, value in row.items() if key in ProductCreate.model_fields and value is not None}
+            try:
+                products.append(ProductCreate(**fields, category_id=category_id, section_id=section_id))
+            except ValidationError as e:
+                fail(line, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+
+        if products:
+            inserted, updated = repo.upsert_copy(products)
+            result["inserted"] += inserted
+            result["updated"] += updated
+
+    return result
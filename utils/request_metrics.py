@@ -0,0 +1,138 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+# origem das consultas fora de `run_db` (dependências, scripts, jobs)
+UNKNOWN_ORIGIN = "-"
+
+
+class RequestMetrics:
+    """Custos de uma requisição: consultas, tempo de banco, linhas, espera no pool e serialização.
+
+    As consultas também são agrupadas pelo método de repositório que as emitiu (`run_db` define a origem).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.rows = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.serialization_seconds = 0.0
+        self.by_origin = {}
+
+    def observe_query(self, origin: str, seconds: float, rows: int) -> None:
+        with self._lock:
+            self.queries += 1
+            self.rows += rows
+            self.db_seconds += seconds
+            stats = self.by_origin.setdefault(origin, {"queries": 0, "db_ms": 0.0, "rows": 0})
+            stats["queries"] += 1
+            stats["db_ms"] += seconds * 1000
+            stats["rows"] += rows
+
+    def observe_pool_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.pool_wait_seconds += seconds
+
+    def observe_serialization(self, seconds: float) -> None:
+        with self._lock:
+            self.serialization_seconds += seconds
+
+    def server_timing(self, total_seconds: float) -> str:
+        return ", ".join([
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.queries} queries, {self.rows} rows"',
+            f"pool;dur={self.pool_wait_seconds * 1000:.2f}",
+            f"ser;dur={self.serialization_seconds * 1000:.2f}",
+            f"total;dur={total_seconds * 1000:.2f}",
+        ])
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "queries": self.queries,
+                "rows": self.rows,
+                "db_ms": round(self.db_seconds * 1000, 3),
+                "pool_wait_ms": round(self.pool_wait_seconds * 1000, 3),
+                "serialization_ms": round(self.serialization_seconds * 1000, 3),
+                "by_origin": {
+                    origin: {**stats, "db_ms": round(stats["db_ms"], 3)} for origin, stats in self.by_origin.items()
+                },
+            }
+
+
+# o objeto é compartilhado por referência: o thread pool do `run_db` recebe uma cópia do contexto,
+# mas registra no mesmo RequestMetrics da requisição
+_current_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+_query_origin: ContextVar[str] = ContextVar("query_origin", default=UNKNOWN_ORIGIN)
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    return _current_metrics.get()
+
+
+@contextmanager
+def collect_metrics(metrics: Optional[RequestMetrics] = None):
+    metrics = metrics if metrics is not None else RequestMetrics()
+    token = _current_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_metrics.reset(token)
+
+
+def current_query_origin() -> str:
+    return _query_origin.get()
+
+
+@contextmanager
+def query_origin(origin: str):
+    token = _query_origin.set(origin)
+    try:
+        yield
+    finally:
+        _query_origin.reset(token)
+
+
+@contextmanager
+def measure_serialization():
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.observe_serialization(time.perf_counter() - start)
+
+
+def observe_pool_wait(seconds: float) -> None:
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.observe_pool_wait(seconds)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_metrics.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = _current_metrics.get()
+    if metrics is None or not conn.info.get("query_start"):
+        return
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    # rowcount do driver: linhas devolvidas pelo SELECT/RETURNING (cursores no servidor informam -1)
+    rows = max(cursor.rowcount, 0) if cursor.description is not None else 0
+    metrics.observe_query(current_query_origin(), elapsed, rows)
+
+
+def instrument_engine(engine) -> None:
+    """Liga os hooks de consulta no engine síncrono (para o assíncrono, passe `async_engine.sync_engine`)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,46 @@
+from functools import lru_cache
+from typing import Any, List, Mapping, Optional, Sequence, Type
+
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+from utils.request_metrics import measure_serialization
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """TypeAdapter de `List[model]`, montado uma vez por schema (o schema de validação é compilado na criação)."""
+    return TypeAdapter(List[model])
+
+
+def dump_list(model: Type[BaseModel], rows: Sequence[Any]) -> bytes:
+    """Converte objetos do ORM direto em bytes JSON.
+
+    A validação (`from_attributes`) e a serialização rodam no pydantic-core, sem passar por dicts
+    intermediários nem pelo `json` da stdlib como no caminho padrão do `response_model`.
+    """
+    adapter = list_adapter(model)
+    with measure_serialization():
+        return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def dump_one(model: Type[BaseModel], obj: Any) -> bytes:
+    with measure_serialization():
+        return model.__pydantic_serializer__.to_json(model.model_validate(obj, from_attributes=True))
+
+
+class JSONBytesResponse(Response):
+    """Resposta JSON que envia bytes já serializados como estão e codifica o resto com o pydantic-core."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return to_json(content)
+
+
+def list_response(model: Type[BaseModel], rows: Sequence[Any], headers: Optional[Mapping[str, str]] = None) -> JSONBytesResponse:
+    # uma Response devolvida pela rota não herda os cabeçalhos do parâmetro `response`, por isso vêm aqui
+    return JSONBytesResponse(dump_list(model, rows), headers=headers)